@@ -81,6 +81,81 @@ class DataSharingConsentQuerySet(models.query.QuerySet):
         except DataSharingConsent.DoesNotExist:
             return ProxyDataSharingConsent(**original_kwargs)
 
+    def bulk_granted(self, enterprise_customer, username_course_pairs):
+        """
+        Resolve whether consent is granted for many (username, course_id) pairs of an enterprise customer at once.
+
+        The pairs are resolved with the same rules as ``proxied_get``: a course run without a consent record of its
+        own falls back to the record for its course, and a pair without any record is not granted. The records are
+        fetched with one query for the given course IDs and one for the course keys they fall back to, and the
+        course key of each course run is looked up only once.
+
+        Arguments:
+            enterprise_customer (EnterpriseCustomer): The enterprise customer the consent is granted to.
+            username_course_pairs (iterable): (username, course_id) tuples, where course_id is either a
+                course run ID or a course key.
+
+        Returns:
+            dict: ``{(username, course_id): granted}`` for each of the given pairs, with ``granted`` a boolean.
+        """
+        pairs = set(username_course_pairs)
+        consent_records = self._get_granted_by_pair(enterprise_customer, pairs)
+        consents = {pair: bool(consent_records.get(pair)) for pair in pairs}
+
+        # Collect the course runs whose consent has to be looked up on the course instead.
+        fallback_usernames = {}
+        for username, course_id in pairs:
+            if (username, course_id) in consent_records:
+                continue
+            try:
+                CourseKey.from_string(course_id)
+            except InvalidKeyError:
+                continue
+            fallback_usernames.setdefault(course_id, set()).add(username)
+
+        if fallback_usernames:
+            course_keys = self._get_course_keys(enterprise_customer, fallback_usernames)
+            fallback_records = self._get_granted_by_pair(enterprise_customer, {
+                (username, course_keys[course_run_id])
+                for course_run_id, usernames in fallback_usernames.items() if course_keys.get(course_run_id)
+                for username in usernames
+            })
+            for course_run_id, usernames in fallback_usernames.items():
+                for username in usernames:
+                    consents[(username, course_run_id)] = bool(
+                        fallback_records.get((username, course_keys.get(course_run_id)))
+                    )
+
+        return consents
+
+    def _get_granted_by_pair(self, enterprise_customer, pairs):
+        """
+        Return ``{(username, course_id): granted}`` for the consent records that exist for the given pairs.
+        """
+        if not pairs:
+            return {}
+        consent_records = self.filter(
+            enterprise_customer=enterprise_customer,
+            course_id__in={course_id for __, course_id in pairs},
+        ).values_list('username', 'course_id', 'granted')
+        return {
+            (username, course_id): granted
+            for username, course_id, granted in consent_records.iterator()
+            if (username, course_id) in pairs
+        }
+
+    @staticmethod
+    def _get_course_keys(enterprise_customer, course_run_ids):
+        """
+        Return ``{course_run_id: course_key}`` for the given course runs, as found in the course catalog.
+        """
+        try:
+            catalog_client = get_course_catalog_api_service_client(site=enterprise_customer.site)
+            return catalog_client.get_course_ids(course_run_ids)
+        except ImproperlyConfigured:
+            LOGGER.warning('CourseCatalogApiServiceClient is improperly configured.')
+            return {}
+
 
 class DataSharingConsentManager(models.Manager.from_queryset(DataSharingConsentQuerySet)):  # pylint: disable=no-member
     """
@@ -5,6 +5,7 @@ Serializers for enterprise api version 1.
 from __future__ import absolute_import, unicode_literals
 
 import copy
+from collections import OrderedDict
 from logging import getLogger
 
 from edx_rest_api_client.exceptions import HttpClientError
@@ -274,6 +275,19 @@ class EnterpriseCustomerCatalogDetailSerializer(EnterpriseCustomerCatalogSeriali
         return representation
 
 
+# pylint: disable=abstract-method
+class CatalogContentItemSerializer(serializers.Serializer):
+    """
+    Serializes a catalog and a content item whose membership of the catalog is checked.
+
+    The content ID may be a course key, a course run key or a program UUID.
+    """
+
+    catalog_uuid = serializers.UUIDField()
+    content_id = serializers.CharField()
+    contains_content_item = serializers.BooleanField(read_only=True)
+
+
 class EnterpriseCustomerUserReadOnlySerializer(serializers.ModelSerializer):
     """
     Serializer for EnterpriseCustomerUser model.
@@ -497,6 +511,7 @@ class EnterpriseCustomerCourseEnrollmentsListSerializer(serializers.ListSerializ
 
         ret = []
 
+        self.child.prefetch([item for item in data if isinstance(item, dict)])
         for item in data:
             try:
                 validated = self.child.run_validation(item)
@@ -510,13 +525,31 @@ class EnterpriseCustomerCourseEnrollmentsListSerializer(serializers.ListSerializ
     def create(self, validated_data):
         """
         This selectively calls the child create method based on whether or not validation failed for each payload.
+
+        Enrollments of existing EnterpriseCustomerUsers are made in bulk, with the child create_enrollments method.
+        Payloads are still handled in order: the pending enrollments are made before a payload for the same learner
+        and course run is handled.
         """
         ret = []
+        enrollments = []
+        enrollment_keys = set()
         for attrs in validated_data:
             if 'non_field_errors' not in attrs and not any(isinstance(attrs[field], list) for field in attrs):
-                ret.append(self.child.create(attrs))
+                enterprise_customer_user = self.child.get_enterprise_customer_user(attrs)
+                key = (enterprise_customer_user.pk, attrs.get('course_run_id')) if enterprise_customer_user else None
+                if key in enrollment_keys:
+                    self.child.create_enrollments(enrollments)
+                    enrollments = []
+                    enrollment_keys = set()
+                if enterprise_customer_user and attrs.get('is_active'):
+                    enrollments.append(attrs)
+                    enrollment_keys.add(key)
+                    ret.append(attrs)
+                else:
+                    ret.append(self.child.create(attrs))
             else:
                 ret.append(attrs)
+        self.child.create_enrollments(enrollments)
 
         return ret
 
@@ -557,13 +590,56 @@ class EnterpriseCustomerCourseEnrollmentsSerializer(serializers.Serializer):
     detail = serializers.CharField(read_only=True)
     is_active = serializers.BooleanField(required=False, default=True, write_only=True)
 
+    def __init__(self, *args, **kwargs):
+        super(EnterpriseCustomerCourseEnrollmentsSerializer, self).__init__(*args, **kwargs)
+        # Lookups shared by all of the payloads of a list, filled in by ``prefetch``.
+        self._users_by_email = {}
+        self._enterprise_customer_users = {}
+        self._course_runs_in_catalog = {}
+        self._tpa_client = None
+
+    def prefetch(self, data):
+        """
+        Look up the users and EnterpriseCustomerUsers referred to by a list of payloads in bulk.
+
+        The field validation methods then use them, rather than querying for each payload. Values which cannot be
+        matched to the validated ones are left out, and still looked up one at a time.
+        """
+        enterprise_customer = self.context.get('enterprise_customer')
+        emails = {item['user_email'] for item in data if isinstance(item.get('user_email'), str)}
+        user_ids = {int(item['lms_user_id']) for item in data if str(item.get('lms_user_id', '')).isdecimal()}
+
+        self._users_by_email = {email.lower(): [] for email in emails}
+        for user in User.objects.filter(email__in=emails):
+            self._users_by_email.setdefault(user.email.lower(), []).append(user)
+            user_ids.add(user.id)
+
+        self._enterprise_customer_users = dict.fromkeys(user_ids)
+        if user_ids:
+            self._enterprise_customer_users.update(
+                (enterprise_customer_user.user_id, enterprise_customer_user)
+                for enterprise_customer_user in models.EnterpriseCustomerUser.objects.filter(
+                    user_id__in=user_ids,
+                    enterprise_customer=enterprise_customer,
+                ).select_related('enterprise_customer')
+            )
+
+    def get_enterprise_customer_user(self, validated_data):
+        """
+        Return the EnterpriseCustomerUser a validated payload refers to, or None if the learner is not registered.
+        """
+        enterprise_customer_user = (
+            validated_data.get('lms_user_id') or validated_data.get('tpa_user_id') or validated_data.get('user_email')
+        )
+        if isinstance(enterprise_customer_user, models.EnterpriseCustomerUser):
+            return enterprise_customer_user
+        return None
+
     def create(self, validated_data):
         """
         Perform the enrollment for existing enterprise customer users, or create the pending objects for new users.
         """
         enterprise_customer = self.context.get('enterprise_customer')
-        lms_user = validated_data.get('lms_user_id')
-        tpa_user = validated_data.get('tpa_user_id')
         user_email = validated_data.get('user_email')
         course_run_id = validated_data.get('course_run_id')
         course_mode = validated_data.get('course_mode')
@@ -571,7 +647,7 @@ class EnterpriseCustomerCourseEnrollmentsSerializer(serializers.Serializer):
         email_students = validated_data.get('email_students')
         is_active = validated_data.get('is_active')
 
-        enterprise_customer_user = lms_user or tpa_user or user_email
+        enterprise_customer_user = self.get_enterprise_customer_user(validated_data) or user_email
 
         if isinstance(enterprise_customer_user, models.EnterpriseCustomerUser):
             validated_data['enterprise_customer_user'] = enterprise_customer_user
@@ -586,20 +662,7 @@ class EnterpriseCustomerCourseEnrollmentsSerializer(serializers.Serializer):
                 else:
                     enterprise_customer_user.unenroll(course_run_id)
             except (CourseEnrollmentDowngradeError, CourseEnrollmentPermissionError, HttpClientError) as exc:
-                error_message = (
-                    '[Enterprise API] An exception occurred while enrolling the user.'
-                    ' EnterpriseCustomer: {enterprise_customer}, LmsUser: {lms_user}, TpaUser: {tpa_user},'
-                    ' UserEmail: {user_email}, CourseRun: {course_run_id}, CourseMode {course_mode}, Message: {exc}.'
-                ).format(
-                    enterprise_customer=enterprise_customer,
-                    lms_user=lms_user,
-                    tpa_user=tpa_user,
-                    user_email=user_email,
-                    course_run_id=course_run_id,
-                    course_mode=course_mode,
-                    exc=str(exc)
-                )
-                LOGGER.error(error_message)
+                self._log_enrollment_error(validated_data, exc)
                 validated_data['detail'] = str(exc)
                 return validated_data
 
@@ -630,12 +693,76 @@ class EnterpriseCustomerCourseEnrollmentsSerializer(serializers.Serializer):
 
         return validated_data
 
+    def create_enrollments(self, validated_data):
+        """
+        Perform the enrollments of existing enterprise customer users in bulk, as ``create`` does for each of them.
+
+        Each learner may only be enrolled into a given course run once. The learners to email are notified together
+        for each course run.
+        """
+        if not validated_data:
+            return
+
+        enterprise_customer = self.context.get('enterprise_customer')
+        for attrs in validated_data:
+            attrs['enterprise_customer_user'] = self.get_enterprise_customer_user(attrs)
+        errors = models.EnterpriseCustomerUser.enroll_in_bulk(
+            [
+                (attrs['enterprise_customer_user'], attrs['course_run_id'], attrs['course_mode'], attrs.get('cohort'))
+                for attrs in validated_data
+            ],
+            source_slug=models.EnterpriseEnrollmentSource.API,
+        )
+
+        learners_to_notify = OrderedDict()
+        for attrs, error in zip(validated_data, errors):
+            enterprise_customer_user = attrs['enterprise_customer_user']
+            if error is not None:
+                self._log_enrollment_error(attrs, error)
+                attrs['detail'] = str(error)
+                continue
+
+            course_run_id = attrs['course_run_id']
+            track_enrollment('enterprise-customer-enrollment-api', enterprise_customer_user.user_id, course_run_id)
+            if attrs.get('email_students'):
+                learners_to_notify.setdefault(course_run_id, []).append(enterprise_customer_user)
+            attrs['detail'] = 'success'
+
+        for course_run_id, enterprise_customer_users in learners_to_notify.items():
+            enterprise_customer.notify_enrolled_learners(
+                self.context.get('request_user'),
+                course_run_id,
+                enterprise_customer_users
+            )
+
+    def _log_enrollment_error(self, validated_data, exc):
+        """
+        Log an error raised while enrolling the learner a validated payload refers to.
+        """
+        error_message = (
+            '[Enterprise API] An exception occurred while enrolling the user.'
+            ' EnterpriseCustomer: {enterprise_customer}, LmsUser: {lms_user}, TpaUser: {tpa_user},'
+            ' UserEmail: {user_email}, CourseRun: {course_run_id}, CourseMode {course_mode}, Message: {exc}.'
+        ).format(
+            enterprise_customer=self.context.get('enterprise_customer'),
+            lms_user=validated_data.get('lms_user_id'),
+            tpa_user=validated_data.get('tpa_user_id'),
+            user_email=validated_data.get('user_email'),
+            course_run_id=validated_data.get('course_run_id'),
+            course_mode=validated_data.get('course_mode'),
+            exc=str(exc)
+        )
+        LOGGER.error(error_message)
+
     def validate_lms_user_id(self, value):
         """
         Validates the lms_user_id, if is given, to see if there is an existing EnterpriseCustomerUser for it.
         """
         enterprise_customer = self.context.get('enterprise_customer')
 
+        if value.isdecimal() and int(value) in self._enterprise_customer_users:
+            return self._enterprise_customer_users[int(value)]
+
         try:
             # Ensure the given user is associated with the enterprise.
             return models.EnterpriseCustomerUser.objects.get(
@@ -656,8 +783,9 @@ class EnterpriseCustomerCourseEnrollmentsSerializer(serializers.Serializer):
         enterprise_customer = self.context.get('enterprise_customer')
 
         try:
-            tpa_client = ThirdPartyAuthApiClient(self.context['request_user'])
-            username = tpa_client.get_username_from_remote_id(
+            if self._tpa_client is None:
+                self._tpa_client = ThirdPartyAuthApiClient(self.context['request_user'])
+            username = self._tpa_client.get_username_from_remote_id(
                 enterprise_customer.identity_provider, value
             )
             user = User.objects.get(username=username)
@@ -678,6 +806,13 @@ class EnterpriseCustomerCourseEnrollmentsSerializer(serializers.Serializer):
         """
         enterprise_customer = self.context.get('enterprise_customer')
 
+        # Prefetched users are only used when their email matches exactly, as the database may ignore its case.
+        users = self._users_by_email.get(value.lower())
+        if users is not None and all(user.email == value for user in users) and len(users) <= 1:
+            if not users:
+                return value
+            return self._enterprise_customer_users.get(users[0].id) or value
+
         try:
             user = User.objects.get(email=value)
             return models.EnterpriseCustomerUser.objects.get(
@@ -692,10 +827,14 @@ class EnterpriseCustomerCourseEnrollmentsSerializer(serializers.Serializer):
     def validate_course_run_id(self, value):
         """
         Validates that the course run id is part of the Enterprise Customer's catalog.
+
+        The catalog is only checked once for each course run.
         """
         enterprise_customer = self.context.get('enterprise_customer')
 
-        if not enterprise_customer.catalog_contains_course(value):
+        if value not in self._course_runs_in_catalog:
+            self._course_runs_in_catalog[value] = enterprise_customer.catalog_contains_course(value)
+        if not self._course_runs_in_catalog[value]:
             error_message = ('[Enterprise API] The course run id is not in the catalog for the Enterprise Customer.'
                              ' EnterpriseCustomer: {enterprise_uuid}, EnterpriseName: {enterprise_name},'
                              ' CourseRun: {course_run_id}').format(
@@ -733,3 +872,18 @@ class EnterpriseCustomerCourseEnrollmentsSerializer(serializers.Serializer):
             )
 
         return data
+
+
+class EnterpriseCustomerCourseEnrollmentsJobSerializer(serializers.ModelSerializer):
+    """
+    Serializes the status, progress and per-item outcomes of a course enrollments job.
+    """
+
+    class Meta:
+        model = models.EnterpriseCustomerCourseEnrollmentsJob
+        fields = (
+            'uuid', 'status', 'total_count', 'processed_count', 'succeeded_count', 'failed_count', 'results',
+            'created', 'modified',
+        )
+
+    results = serializers.JSONField(read_only=True)
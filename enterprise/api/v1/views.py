@@ -4,6 +4,7 @@ Views for enterprise api version 1 endpoint.
 """
 from __future__ import absolute_import, unicode_literals
 
+from collections import defaultdict
 from logging import getLogger
 from smtplib import SMTPException
 
@@ -16,7 +17,7 @@ from rest_framework.decorators import detail_route, list_route
 from rest_framework.exceptions import NotFound
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_500_INTERNAL_SERVER_ERROR
+from rest_framework.status import HTTP_200_OK, HTTP_202_ACCEPTED, HTTP_400_BAD_REQUEST, HTTP_500_INTERNAL_SERVER_ERROR
 from rest_framework.views import APIView
 from rest_framework_xml.renderers import XMLRenderer
 from six.moves.urllib.parse import quote_plus, unquote  # pylint: disable=import-error,ungrouped-imports
@@ -24,6 +25,8 @@ from six.moves.urllib.parse import quote_plus, unquote  # pylint: disable=import
 from django.apps import apps
 from django.conf import settings
 from django.core import mail
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.http import Http404
 from django.utils.decorators import method_decorator
 from django.utils.translation import ugettext as _
@@ -40,8 +43,10 @@ from enterprise.api.utils import (
 from enterprise.api.v1 import serializers
 from enterprise.api.v1.decorators import require_at_least_one_query_parameter
 from enterprise.api.v1.permissions import IsInEnterpriseGroup
+from enterprise.api_client.discovery import get_course_catalog_api_service_client
 from enterprise.constants import COURSE_KEY_URL_PATTERN
 from enterprise.errors import CodesAPIRequestError
+from enterprise.tasks import process_course_enrollments_job
 from enterprise.utils import get_request_value
 
 LOGGER = getLogger(__name__)
@@ -150,8 +155,13 @@ class EnterpriseCustomerViewSet(EnterpriseReadWriteModelViewSet):
         course_run_ids = [unquote(quote_plus(course_run_id)) for course_run_id in course_run_ids]
 
         contains_content_items = False
-        for catalog in enterprise_customer.enterprise_customer_catalogs.all():
-            contains_course_runs = not course_run_ids or catalog.contains_courses(course_run_ids)
+        course_ids = None
+        catalogs = list(enterprise_customer.enterprise_customer_catalogs.all())
+        if catalogs and course_run_ids:
+            # Look up the course keys of the course runs once for all of the catalogs.
+            course_ids = get_course_catalog_api_service_client(enterprise_customer.site).get_course_ids(course_run_ids)
+        for catalog in catalogs:
+            contains_course_runs = not course_run_ids or catalog.contains_courses(course_run_ids, course_ids=course_ids)
             contains_program_uuids = not program_uuids or catalog.contains_programs(program_uuids)
             if contains_course_runs and contains_program_uuids:
                 contains_content_items = True
@@ -165,8 +175,30 @@ class EnterpriseCustomerViewSet(EnterpriseReadWriteModelViewSet):
     def course_enrollments(self, request, pk):
         """
         Creates a course enrollment for an EnterpriseCustomerUser.
+
+        When the ``async`` query parameter is ``true``, the list of enrollment requests is instead stored as a job and
+        processed in the background. The job is returned right away, and can be followed with the
+        ``course_enrollments_jobs`` endpoint.
         """
         enterprise_customer = self.get_object()
+        if request.query_params.get('async', '').lower() == 'true':
+            if not isinstance(request.data, list):
+                return Response(
+                    {'error': _('A list of course enrollments is expected in async mode.')},
+                    status=HTTP_400_BAD_REQUEST,
+                )
+            job = models.EnterpriseCustomerCourseEnrollmentsJob.objects.create(
+                enterprise_customer=enterprise_customer,
+                requester_id=request.user.id,
+                payload=request.data,
+                total_count=len(request.data),
+            )
+            transaction.on_commit(lambda: process_course_enrollments_job.delay(str(job.uuid)))
+            return Response(
+                serializers.EnterpriseCustomerCourseEnrollmentsJobSerializer(job).data,
+                status=HTTP_202_ACCEPTED,
+            )
+
         serializer = serializers.EnterpriseCustomerCourseEnrollmentsSerializer(
             data=request.data,
             many=True,
@@ -181,6 +213,25 @@ class EnterpriseCustomerViewSet(EnterpriseReadWriteModelViewSet):
 
         return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
 
+    @detail_route(
+        url_path=r'course_enrollments_jobs/(?P<job_uuid>[0-9a-f-]+)',
+        url_name='course-enrollments-job',
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    @permission_required('enterprise.can_enroll_learners', fn=lambda request, pk, job_uuid: pk)
+    # pylint: disable=invalid-name,unused-argument
+    def course_enrollments_job(self, request, pk, job_uuid):
+        """
+        Returns the status, progress counters and per-item outcomes of a course enrollments job.
+        """
+        enterprise_customer = self.get_object()
+        try:
+            job = enterprise_customer.course_enrollments_jobs.get(uuid=job_uuid)
+        except (models.EnterpriseCustomerCourseEnrollmentsJob.DoesNotExist, ValidationError):
+            raise NotFound(_('No course enrollments job {job_uuid} was found.').format(job_uuid=job_uuid))
+
+        return Response(serializers.EnterpriseCustomerCourseEnrollmentsJobSerializer(job).data, status=HTTP_200_OK)
+
     @method_decorator(require_at_least_one_query_parameter('permissions'))
     @list_route(permission_classes=[permissions.IsAuthenticated, IsInEnterpriseGroup])
     def with_access_to(self, request, *args, **kwargs):  # pylint: disable=invalid-name,unused-argument
@@ -340,6 +391,37 @@ class EnterpriseCustomerCatalogViewSet(EnterpriseReadOnlyModelViewSet):
 
         return Response({'contains_content_items': contains_content_items})
 
+    @list_route(methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    @permission_required('enterprise.can_view_catalog', fn=lambda request, *args, **kwargs: None)
+    def bulk_contains_content_items(self, request):
+        """
+        Return whether or not each of the specified catalogs contains the content item specified with it.
+
+        The request body is a list of objects with a ``catalog_uuid`` and a ``content_id``, which may be a course key,
+        a course run key or a program UUID. The response lists the same objects, in the same order, each with a
+        ``contains_content_item`` flag. Catalogs which do not exist, or which the requesting user cannot view, do not
+        contain any content.
+        """
+        serializer = serializers.CatalogContentItemSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data
+
+        content_ids_by_catalog = defaultdict(set)
+        for item in items:
+            content_ids_by_catalog[item['catalog_uuid']].add(item['content_id'])
+
+        catalogs = self.filter_queryset(self.get_queryset()).filter(
+            uuid__in=list(content_ids_by_catalog)
+        ).select_related('enterprise_customer__site', 'enterprise_catalog_query').distinct()
+        members_by_catalog = {
+            catalog.uuid: catalog.get_content_members(content_ids_by_catalog[catalog.uuid])
+            for catalog in catalogs
+        }
+
+        for item in items:
+            item['contains_content_item'] = item['content_id'] in members_by_catalog.get(item['catalog_uuid'], set())
+        return Response(serializers.CatalogContentItemSerializer(items, many=True).data)
+
     @detail_route(url_path='courses/{}'.format(COURSE_KEY_URL_PATTERN))
     @permission_required(
         'enterprise.can_view_catalog',
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Caches for the responses of the API clients.
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+import copy
+import json
+import math
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+# The longest a caller may hold the lock on rebuilding a cached value, in seconds, before others may rebuild it too.
+CACHE_LOCK_TIMEOUT = getattr(settings, 'ENTERPRISE_API_CACHE_LOCK_TIMEOUT', 60)
+# How long a stale copy of each cached value is kept after the value itself expires, in seconds.
+CACHE_STALE_TIMEOUT = getattr(settings, 'ENTERPRISE_API_CACHE_STALE_TIMEOUT', 3600)
+# How often a caller waiting for another to rebuild a cached value checks whether it is done, in seconds.
+CACHE_LOCK_POLL_INTERVAL = 0.1
+# The longest a caller waits for another to rebuild a cached value, in seconds, before rebuilding it itself.
+CACHE_LOCK_WAIT_TIMEOUT = getattr(settings, 'ENTERPRISE_API_CACHE_LOCK_WAIT_TIMEOUT', 5)
+# The longest a falsy value, such as an empty response, is cached for, in seconds, so that resources which are
+# missing when the value is computed are picked up soon after they are created.
+CACHE_EMPTY_TIMEOUT = getattr(settings, 'ENTERPRISE_API_CACHE_EMPTY_TIMEOUT', 60)
+# The largest compressed value stored under a single cache key, in bytes; larger values are split across several
+# keys, so that they stay below the item size limit of the cache backend (1MB for memcached, by default).
+CACHE_CHUNK_SIZE = getattr(settings, 'ENTERPRISE_API_CACHE_CHUNK_SIZE', 512 * 1024)
+
+# Passed to ``get_cached_value`` as the default for missing values, to tell them apart from cached falsy values.
+_CACHE_MISS = object()
+
+
+class LocalCache:
+    """
+    A bounded, thread-safe cache held in the memory of the current process.
+
+    Once the cache is full, the least recently used entry is evicted to make room for a new one. Entries also
+    expire once they are older than the cache's timeout.
+
+    Values are copied when they are cached and when they are returned, so that callers which modify a value they
+    got from the cache do not change it for the other callers. Frozensets are immutable, so they are not copied.
+    """
+
+    def __init__(self, max_size, timeout):
+        """
+        Arguments:
+            max_size (int): The most entries to hold at once. A cache with a size of 0 holds nothing.
+            timeout (int): The number of seconds after which an entry expires.
+        """
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Return the value cached for the given key, or the default if the key is missing or expired.
+        """
+        with self._lock:
+            try:
+                expires_at, value = self._entries[key]
+            except KeyError:
+                return default
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+        return self._copy(value)
+
+    def set(self, key, value, timeout=None):
+        """
+        Cache the given value for the given key, evicting the least recently used entries if the cache is full.
+
+        The entry expires after the cache's timeout, or after the given timeout if that is shorter.
+        """
+        if self.max_size <= 0:
+            return
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        value = self._copy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _copy(value):
+        """
+        Return a copy of the given value which shares no mutable state with it.
+        """
+        if isinstance(value, frozenset):
+            return value
+        return copy.deepcopy(value)
+
+
+class TwoTierCache:
+    """
+    A process-local ``LocalCache`` in front of the shared Django cache.
+
+    Values are looked up in the local cache first, then in the shared cache, which also refills the local cache.
+    The outcome of each lookup is counted, so that callers can tell how much work the caches save them.
+    """
+
+    def __init__(self, local_cache, timeout):
+        """
+        Arguments:
+            local_cache (LocalCache): The process-local cache to look values up in first.
+            timeout (int): The number of seconds for which values are held in the shared cache.
+        """
+        self.local_cache = local_cache
+        self.timeout = timeout
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+        self.reset_stats()
+
+    def get(self, key):
+        """
+        Return the value cached for the given key, or ``None`` if neither cache holds it.
+        """
+        value = self.local_cache.get(key)
+        if value is not None:
+            self._count('local_hits')
+            return value
+        value = cache.get(key)
+        if value is not None:
+            self._count('shared_hits')
+            self.local_cache.set(key, value)
+            return value
+        self._count('misses')
+        return None
+
+    def set(self, key, value, timeout=None):
+        """
+        Cache the given value for the given key in both caches, for the given number of seconds if one is given.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        self.local_cache.set(key, value, timeout)
+        cache.set(key, value, timeout)
+
+    def clear(self):
+        """
+        Remove every entry from the process-local cache; the shared cache is left alone.
+        """
+        self.local_cache.clear()
+
+    def get_stats(self):
+        """
+        Return the number of lookups answered by each cache, and the number answered by neither, since the last reset.
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        """
+        Reset the lookup counters to zero.
+        """
+        with self._stats_lock:
+            self._stats = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+
+    def _count(self, outcome):
+        """
+        Count a lookup with the given outcome.
+        """
+        with self._stats_lock:
+            self._stats[outcome] += 1
+
+
+class ChunkedCacheValue:
+    """
+    Stands in the cache for a compressed value which was split across several keys.
+
+    The chunks are stored under keys unique to each write, so that a reader never mixes the chunks of two writes.
+    """
+
+    def __init__(self, token, count):
+        """
+        Arguments:
+            token (str): Identifies the write which stored the chunks.
+            count (int): The number of chunks.
+        """
+        self.token = token
+        self.count = count
+
+    def get_chunk_keys(self, key):
+        """
+        Return the cache keys of the chunks of the value cached for the given key, in order.
+        """
+        return ['{}.{}.{}'.format(key, self.token, index) for index in range(self.count)]
+
+
+def encode_cache_value(value):
+    """
+    Serialize the given JSON-serializable value as compact JSON, compressed with zlib.
+    """
+    return zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_cache_value(data):
+    """
+    Deserialize a value serialized by ``encode_cache_value``.
+    """
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+
+def get_cached_value(key, default=None):
+    """
+    Return the value cached for the given key by ``set_cached_value``, or the default if it, or any of its chunks,
+    is missing.
+
+    Values cached as-is, without ``set_cached_value``, are returned as they are.
+    """
+    value = cache.get(key)
+    if value is None:
+        return default
+    if isinstance(value, ChunkedCacheValue):
+        chunk_keys = value.get_chunk_keys(key)
+        chunks = cache.get_many(chunk_keys)
+        if len(chunks) != len(chunk_keys):
+            return default
+        value = b''.join(chunks[chunk_key] for chunk_key in chunk_keys)
+    if isinstance(value, bytes):
+        return decode_cache_value(value)
+    return value
+
+
+def set_cached_value(key, value, timeout, data=None):
+    """
+    Cache the given JSON-serializable value for the given key, compressed, and split into chunks of at most
+    ``CACHE_CHUNK_SIZE`` bytes if it is larger than that.
+
+    The value may be given already encoded with ``encode_cache_value``, as ``data``, to cache it under several keys
+    without encoding it each time.
+    """
+    if data is None:
+        data = encode_cache_value(value)
+    if len(data) <= CACHE_CHUNK_SIZE:
+        cache.set(key, data, timeout)
+        return
+    chunked_value = ChunkedCacheValue(uuid4().hex, int(math.ceil(len(data) / CACHE_CHUNK_SIZE)))
+    chunk_keys = chunked_value.get_chunk_keys(key)
+    cache.set_many(
+        {
+            chunk_key: data[index * CACHE_CHUNK_SIZE:(index + 1) * CACHE_CHUNK_SIZE]
+            for index, chunk_key in enumerate(chunk_keys)
+        },
+        timeout,
+    )
+    # The chunks are only looked up once they are all cached.
+    cache.set(key, chunked_value, timeout)
+
+
+def get_or_set_single_flight(key, compute, timeout):
+    """
+    Return the value cached in the shared cache for the given key, computing and caching it if it is missing.
+
+    Only one caller, across every process sharing the cache, computes a missing value at a time. While it does,
+    the others return a stale copy of the value, kept for ``CACHE_STALE_TIMEOUT`` seconds after the value expires,
+    or wait for the value if there is no stale copy. A caller which waits for longer than ``CACHE_LOCK_WAIT_TIMEOUT``
+    seconds computes the value itself. Falsy values are cached too, for at most ``CACHE_EMPTY_TIMEOUT`` seconds, so
+    that the callers waiting for them don't compute them over again.
+
+    Values are cached with ``set_cached_value``, so they must be JSON-serializable, and are read back with
+    ``get_cached_value``.
+
+    Arguments:
+        key (str): The cache key of the value.
+        compute (callable): Computes the value.
+        timeout (int): The number of seconds for which the computed value is cached.
+    """
+    lock_key = key + '.lock'
+    stale_key = key + '.stale'
+    wait_until = time.monotonic() + CACHE_LOCK_WAIT_TIMEOUT
+    while True:
+        value = get_cached_value(key, default=_CACHE_MISS)
+        if value is not _CACHE_MISS:
+            return value
+
+        # The lock holds a token unique to this caller, so that it only releases the lock if it still holds it: a
+        # computation may outlast the lock, which another caller may then have taken.
+        lock_token = uuid4().hex
+        if cache.add(lock_key, lock_token, CACHE_LOCK_TIMEOUT):
+            try:
+                # Another caller may have cached the value since this one found it missing.
+                value = get_cached_value(key, default=_CACHE_MISS)
+                if value is _CACHE_MISS:
+                    value = _compute_and_cache_value(key, compute, timeout)
+                return value
+            finally:
+                if cache.get(lock_key) == lock_token:
+                    cache.delete(lock_key)
+
+        value = get_cached_value(stale_key, default=_CACHE_MISS)
+        if value is not _CACHE_MISS:
+            return value
+        if time.monotonic() >= wait_until:
+            return _compute_and_cache_value(key, compute, timeout)
+        time.sleep(CACHE_LOCK_POLL_INTERVAL)
+
+
+def _compute_and_cache_value(key, compute, timeout):
+    """
+    Compute the value for the given key, and cache it along with its stale copy.
+    """
+    value = compute()
+    if not value:
+        timeout = min(timeout, CACHE_EMPTY_TIMEOUT)
+    data = encode_cache_value(value)
+    set_cached_value(key, value, timeout, data=data)
+    set_cached_value(key + '.stale', value, timeout + CACHE_STALE_TIMEOUT, data=data)
+    return value
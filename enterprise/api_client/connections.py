@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Connections shared by the API clients: pooled HTTP sessions and cached JWTs.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from time import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from django.conf import settings
+
+from enterprise.api_client.caching import LocalCache
+
+# Every session returned by ``get_pooled_session`` sends its requests through this adapter, so that connections
+# to each host are kept alive and reused across API client instances. Each session still has its own headers and
+# authentication, which is why the sessions themselves are not shared.
+POOLED_ADAPTER = HTTPAdapter(
+    pool_connections=getattr(settings, 'ENTERPRISE_API_CLIENT_CONNECTION_POOLS', 10),
+    pool_maxsize=getattr(settings, 'ENTERPRISE_API_CLIENT_CONNECTION_POOL_SIZE', 10),
+)
+
+# JWTs minted for each user, along with the time until which they may be used.
+JWT_CACHE = LocalCache(
+    max_size=getattr(settings, 'ENTERPRISE_API_CLIENT_JWT_CACHE_SIZE', 1000),
+    timeout=settings.OAUTH_ID_TOKEN_EXPIRATION,
+)
+# How long before it expires a JWT stops being used, in seconds, so that a request made with a JWT just before
+# it is replaced still reaches the API before the JWT expires. At most half of a JWT's lifetime is cut off.
+JWT_EXPIRY_MARGIN = getattr(settings, 'ENTERPRISE_API_CLIENT_JWT_EXPIRY_MARGIN', 60)
+
+
+def get_pooled_session():
+    """
+    Return a new requests session whose connections are drawn from the process-wide connection pools.
+    """
+    session = requests.Session()
+    session.mount('http://', POOLED_ADAPTER)
+    session.mount('https://', POOLED_ADAPTER)
+    return session
+
+
+def get_cached_jwt(user, create_jwt, expires_in):
+    """
+    Return a JWT for the given user, and the time until which the JWT may be used.
+
+    A JWT previously minted for the user is reused until ``JWT_EXPIRY_MARGIN`` seconds before it expires; otherwise
+    a new one is minted. The claims of a JWT only depend on the user it is minted for, so that is all it is cached
+    by.
+
+    Arguments:
+        user (User): The user to authenticate as.
+        create_jwt (callable): Mints a new JWT for the given user.
+        expires_in (int): The number of seconds for which a newly minted JWT is valid.
+
+    Returns:
+        tuple: The JWT, and the time until which it may be used, in seconds since the epoch.
+    """
+    cache_key = getattr(user, 'username', user)
+    now = int(time())
+    cached_jwt = JWT_CACHE.get(cache_key)
+    if cached_jwt is not None and cached_jwt[1] >= now:
+        return cached_jwt
+    jwt = create_jwt(user)
+    cached_jwt = (jwt, now + expires_in - min(JWT_EXPIRY_MARGIN, expires_in // 2))
+    JWT_CACHE.set(cache_key, cached_jwt)
+    return cached_jwt
@@ -2,8 +2,10 @@
 """
 Utilities to get details from the course catalog API.
 """
-from __future__ import absolute_import, unicode_literals
+from __future__ import absolute_import, division, unicode_literals
 
+import math
+from functools import partial
 from logging import getLogger
 
 from edx_rest_api_client.client import EdxRestApiClient
@@ -12,19 +14,22 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 from requests.exceptions import ConnectionError, Timeout  # pylint: disable=redefined-builtin
 
+from django.apps import apps
 from django.conf import settings
-from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
 from django.utils.translation import ugettext_lazy as _
 
 from enterprise import utils
+from enterprise.api_client.caching import (
+    LocalCache,
+    TwoTierCache,
+    encode_cache_value,
+    get_cached_value,
+    get_or_set_single_flight,
+)
+from enterprise.api_client.connections import get_pooled_session
 from enterprise.utils import NotConnectedToOpenEdX, get_configuration_value_for_site
 
-try:
-    import cPickle as pickle
-except ImportError:
-    import pickle
-
 try:
     from openedx.core.djangoapps.oauth_dispatch import jwt as JwtBuilder
 except ImportError:
@@ -55,7 +60,7 @@ def course_discovery_api_client(user, catalog_url):
         )
 
     jwt = JwtBuilder.create_jwt_for_user(user)
-    return EdxRestApiClient(catalog_url, jwt=jwt)
+    return EdxRestApiClient(catalog_url, jwt=jwt, session=get_pooled_session())
 
 
 class CourseCatalogApiClient:
@@ -70,8 +75,24 @@ class CourseCatalogApiClient:
     PROGRAMS_ENDPOINT = 'programs'
     PROGRAM_TYPES_ENDPOINT = 'program_types'
 
+    # The most course runs looked up with a single query by their keys, which keeps the query string short.
+    COURSE_RUN_KEYS_PER_QUERY = 50
+    # The most courses looked up with a single query by their keys, for the same reason.
+    COURSE_KEYS_PER_QUERY = 50
+
     DEFAULT_VALUE_SAFEGUARD = object()
 
+    # Responses for single resources, such as a course run or a program, are looked up repeatedly while exporting
+    # and enrolling learners, so they are cached in memory for a short while as well as in the shared cache, for as
+    # long as the CatalogIntegration allows.
+    response_cache = TwoTierCache(
+        LocalCache(
+            max_size=getattr(settings, 'ENTERPRISE_CATALOG_API_LOCAL_CACHE_SIZE', 1000),
+            timeout=getattr(settings, 'ENTERPRISE_CATALOG_API_LOCAL_CACHE_TIMEOUT', 300),
+        ),
+        timeout=getattr(settings, 'ENTERPRISE_API_CACHE_TIMEOUT', 3600),
+    )
+
     def __init__(self, user, site=None):
         """
         Create an Course Catalog API client setup with authentication for the specified user.
@@ -100,15 +121,20 @@ class CourseCatalogApiClient:
         self.client = course_discovery_api_client(user, self.catalog_url)
 
     @staticmethod
-    def traverse_pagination(response, endpoint, content_filter_query, query_params):
+    def traverse_pagination(response, endpoint, content_filter_query, query_params, workers=1):
         """
         Traverse a paginated API response and extracts and concatenates "results" returned by API.
 
+        When several workers are asked for and the response reports the total ``count`` of results, the remaining
+        pages are fetched concurrently and reassembled in order.
+
         Arguments:
             response (dict): API response object.
             endpoint (Slumber.Resource): API endpoint object.
             content_filter_query (dict): query parameters used to filter catalog results.
             query_params (dict): query parameters used to paginate results.
+            workers (int): The most pages to fetch at once; pass ``get_pagination_workers()`` to fetch them
+                concurrently.
 
         Returns:
             list: all the results returned by the API.
@@ -116,6 +142,21 @@ class CourseCatalogApiClient:
         results = response.get('results', [])
 
         page = 1
+        page_size = len(results)
+        if workers > 1 and response.get('next') and isinstance(response.get('count'), int) and page_size:
+            last_page = int(math.ceil(response['count'] / page_size))
+            if last_page > page:
+                responses = utils.fetch_pages(
+                    lambda page: endpoint().post(content_filter_query, **dict(query_params, page=page)),
+                    list(range(page + 1, last_page + 1)),
+                    workers,
+                )
+                for page_response in responses:
+                    results += page_response.get('results', [])
+                response = responses[-1]
+                page = last_page
+
+        # Carry on from the last page fetched, in case more results were added since the first page was fetched.
         while response.get('next'):
             page += 1
             response = endpoint().post(content_filter_query, **dict(query_params, page=page))
@@ -123,14 +164,19 @@ class CourseCatalogApiClient:
 
         return results
 
-    def get_catalog_results_from_discovery(self, content_filter_query, query_params=None, traverse_pagination=False):
+    def get_catalog_results_from_discovery(
+            self, content_filter_query, query_params=None, traverse_pagination=False, workers=1,
+    ):
+        """
+            Return results from the discovery service's search/all endpoint, fetching at most ``workers`` pages at once.
         """
-            Return results from the discovery service's search/all endpoint."""
 
         endpoint = getattr(self.client, self.SEARCH_ALL_ENDPOINT)
         response = endpoint().post(data=content_filter_query, **query_params)
         if traverse_pagination:
-            response['results'] = self.traverse_pagination(response, endpoint, content_filter_query, query_params)
+            response['results'] = self.traverse_pagination(
+                response, endpoint, content_filter_query, query_params, workers=workers,
+            )
             response['next'] = response['previous'] = None
         return response
 
@@ -156,27 +202,16 @@ class CourseCatalogApiClient:
                 traverse_pagination=traverse_pagination,
                 **query_params
             )
-            response = cache.get(cache_key)
+            response = get_cached_value(cache_key)
             if not response:
-                LOGGER.info(
-                    'ENT-2390-1 | Calling discovery service for search/all/ '
-                    'data with content_filter_query %s and query_params %s',
-                    content_filter_query,
-                    query_params,
-                )
-                # Response is not cached, so make a call.
-                response = self.get_catalog_results_from_discovery(
-                    content_filter_query,
-                    query_params,
-                    traverse_pagination
+                # Response is not cached, so make a call, unless another caller is already making it.
+                response = get_or_set_single_flight(
+                    cache_key,
+                    partial(
+                        self._get_catalog_results_to_cache, content_filter_query, query_params, traverse_pagination,
+                    ),
+                    settings.ENTERPRISE_API_CACHE_TIMEOUT,
                 )
-                response_as_string = pickle.dumps(response)
-                LOGGER.info(
-                    'ENT-2489 | Response from content_filter_query %s is %d bytes long.',
-                    content_filter_query,
-                    len(response_as_string)
-                )
-                cache.set(cache_key, response, settings.ENTERPRISE_API_CACHE_TIMEOUT)
             else:
                 LOGGER.info(
                     'ENT-2390-2 | Got search/all/ data from the cache with '
@@ -199,6 +234,28 @@ class CourseCatalogApiClient:
 
         return response
 
+    def _get_catalog_results_to_cache(self, content_filter_query, query_params, traverse_pagination):
+        """
+        Return results from the discovery service's search/all endpoint, logging their size for the cache.
+        """
+        LOGGER.info(
+            'ENT-2390-1 | Calling discovery service for search/all/ '
+            'data with content_filter_query %s and query_params %s',
+            content_filter_query,
+            query_params,
+        )
+        response = self.get_catalog_results_from_discovery(
+            content_filter_query,
+            query_params,
+            traverse_pagination
+        )
+        LOGGER.info(
+            'ENT-2489 | Response from content_filter_query %s is %d bytes long once compressed.',
+            content_filter_query,
+            len(encode_cache_value(response))
+        )
+        return response
+
     def get_course_id(self, course_identifier):
         """
         Return the course id for the given course identifier.  The `course_identifier` may be a course id or a course
@@ -213,26 +270,57 @@ class CourseCatalogApiClient:
         Returns:
             (str): course id
         """
+        return self.get_course_ids([course_identifier]).get(course_identifier)
 
-        try:
-            CourseKey.from_string(course_identifier)
-        except InvalidKeyError:
-            # An `InvalidKeyError` is thrown if `course_identifier` is not in the proper format for a course run id.
-            # Since `course_identifier` is not a course run id we assume `course_identifier` is the  course id.
-            return course_identifier
+    def get_course_ids(self, course_identifiers):
+        """
+        Return the course ids for the given course identifiers, which may be course ids or course run ids.
+
+        The course ids of course runs are looked up in the stored ``CourseRunKeyMapping`` records first, and only
+        the remaining course runs are looked up in the catalog; the course ids found there are stored for next time.
+
+        Arguments:
+            course_identifiers (iterable): The course ids or course run ids
+
+        Returns:
+            (dict): course ids keyed by course identifier; course runs whose course could not be found are left out
+        """
+        # pylint: disable=invalid-name
+        CourseRunKeyMapping = apps.get_model('enterprise', 'CourseRunKeyMapping')
+        course_ids = {}
+        course_run_ids = set()
+        for course_identifier in course_identifiers:
+            try:
+                CourseKey.from_string(course_identifier)
+            except InvalidKeyError:
+                # An `InvalidKeyError` is thrown if `course_identifier` is not in the proper format for a course run
+                # id. Since `course_identifier` is not a course run id we assume `course_identifier` is the course id.
+                course_ids[course_identifier] = course_identifier
+            else:
+                course_run_ids.add(course_identifier)
+
+        if not course_run_ids:
+            return course_ids
 
-        # If here, `course_identifier` must be a course run id.
         # We cannot use `CourseKey.from_string` to find the course id because that method assumes the course id is
         # always a substring of the course run id and this is not always the case.  The only reliable way to determine
         # which courses are associated with a given course run id is by by calling the discovery service.
-        course_run_data = self.get_course_run(course_identifier)
-        if 'course' in course_run_data:
-            return course_run_data['course']
-
-        LOGGER.info(
-            "Could not find course_key for course identifier [%s].", course_identifier
-        )
-        return None
+        stored_course_ids = CourseRunKeyMapping.objects.get_course_keys(course_run_ids)
+        course_ids.update(stored_course_ids)
+        missing_course_run_ids = course_run_ids.difference(stored_course_ids)
+        new_course_ids = {
+            course_run['key']: course_run['course']
+            for course_run in self.get_course_runs(missing_course_run_ids)
+            if course_run.get('key') in missing_course_run_ids and 'course' in course_run
+        }
+        for course_run_id in missing_course_run_ids.difference(new_course_ids):
+            LOGGER.info(
+                "Could not find course_key for course identifier [%s].", course_run_id
+            )
+        if new_course_ids:
+            CourseRunKeyMapping.objects.add_course_keys(new_course_ids)
+            course_ids.update(new_course_ids)
+        return course_ids
 
     def get_course_and_course_run(self, course_run_id):
         """
@@ -258,6 +346,35 @@ class CourseCatalogApiClient:
 
         return course, course_run
 
+    def get_courses_and_course_runs(self, course_run_ids):
+        """
+        Return the course and course run metadata for several course run IDs, looked up in bulk.
+
+        Arguments:
+            course_run_ids (iterable): The course run IDs.
+
+        Returns:
+            dict: The course metadata and the course run metadata of each course run, as returned by
+                  ``get_course_and_course_run``, keyed by course run ID.
+        """
+        course_run_ids = set(course_run_ids)
+        course_ids = self.get_course_ids(course_run_ids)
+        courses = self.get_courses(course_ids.values())
+
+        courses_and_course_runs = {}
+        for course_run_id in course_run_ids:
+            course = courses.get(course_ids.get(course_run_id), {})
+            course_run = None
+            if course:
+                # Find the specified course run.
+                course_runs = [
+                    course_run for course_run in course['course_runs'] if course_run['key'] == course_run_id
+                ]
+                if course_runs:
+                    course_run = course_runs[0]
+            courses_and_course_runs[course_run_id] = (course, course_run)
+        return courses_and_course_runs
+
     def get_course_details(self, course_id):
         """
         Return the details of a single course by id - not a course run id.
@@ -275,6 +392,41 @@ class CourseCatalogApiClient:
             many=False
         )
 
+    def get_courses(self, course_ids):
+        """
+        Return the details of several courses by id, looked up with one query per ``COURSE_KEYS_PER_QUERY`` courses.
+
+        Args:
+            course_ids (iterable): The unique ids of the courses in question.
+
+        Returns:
+            dict: Details of the courses which were found, keyed by course id.
+
+        """
+        courses = {}
+        missing_course_ids = []
+        for course_id in sorted(set(course_ids)):
+            # Courses looked up on their own with ``get_course_details`` are cached under these keys too.
+            course = self.response_cache.get(
+                self._get_cache_key(self.COURSES_ENDPOINT, resource_id=course_id, many=False)
+            )
+            if course is None:
+                missing_course_ids.append(course_id)
+            else:
+                courses[course_id] = course
+
+        cache_timeout = self._get_cache_timeout() if missing_course_ids else 0
+        for index in range(0, len(missing_course_ids), self.COURSE_KEYS_PER_QUERY):
+            keys = missing_course_ids[index:index + self.COURSE_KEYS_PER_QUERY]
+            querystring = {'keys': ','.join(keys)}
+            for course in self._load_data(self.COURSES_ENDPOINT, default=[], querystring=querystring):
+                if course.get('key'):
+                    if cache_timeout:
+                        cache_key = self._get_cache_key(self.COURSES_ENDPOINT, resource_id=course['key'], many=False)
+                        self.response_cache.set(cache_key, course, cache_timeout)
+                    courses[course['key']] = course
+        return courses
+
     def get_course_run(self, course_run_id):
         """
         Return course_run data, including name, ID and seats.
@@ -292,6 +444,56 @@ class CourseCatalogApiClient:
             long_term_cache=True
         )
 
+    def get_course_runs(self, course_run_ids):
+        """
+        Return the data of several course runs, looked up with one query per ``COURSE_RUN_KEYS_PER_QUERY`` course runs.
+
+        Args:
+            course_run_ids (iterable): Course run IDs (aka Course Keys) in string format.
+
+        Returns:
+            list: List of dicts containing the data of the course runs which were found, in no particular order.
+
+        """
+        course_runs = []
+        missing_course_run_ids = []
+        for course_run_id in sorted(set(course_run_ids)):
+            # Course runs looked up on their own with ``get_course_run`` are cached under these keys too.
+            course_run = self.response_cache.get(
+                self._get_cache_key(self.COURSE_RUNS_ENDPOINT, resource_id=course_run_id, long_term_cache=True)
+            )
+            if course_run is None:
+                missing_course_run_ids.append(course_run_id)
+            else:
+                course_runs.append(course_run)
+
+        cache_timeout = self._get_cache_timeout(long_term_cache=True) if missing_course_run_ids else 0
+        for index in range(0, len(missing_course_run_ids), self.COURSE_RUN_KEYS_PER_QUERY):
+            keys = missing_course_run_ids[index:index + self.COURSE_RUN_KEYS_PER_QUERY]
+            querystring = {'keys': ','.join(keys)}
+            for course_run in self._load_data(self.COURSE_RUNS_ENDPOINT, default=[], querystring=querystring):
+                if course_run.get('key') and cache_timeout:
+                    cache_key = self._get_cache_key(
+                        self.COURSE_RUNS_ENDPOINT, resource_id=course_run['key'], long_term_cache=True
+                    )
+                    self.response_cache.set(cache_key, course_run, cache_timeout)
+                course_runs.append(course_run)
+        return course_runs
+
+    def get_course_run_pages(self, page_size=100):
+        """
+        Yield every course run in the catalog, one page at a time.
+
+        Args:
+            page_size (int): The number of course runs to fetch per page.
+
+        Yields:
+            list: List of dicts containing the data of a page of course runs.
+
+        """
+        endpoint = getattr(self.client, self.COURSE_RUNS_ENDPOINT)
+        return utils.traverse_pagination_pages(partial(endpoint.get, page_size=page_size))
+
     def get_program_by_uuid(self, program_uuid):
         """
         Return single program by UUID, or None if not found.
@@ -342,6 +544,29 @@ class CourseCatalogApiClient:
             default=None,
         )
 
+    def _get_cache_key(self, resource, **kwargs):
+        """
+        Return the cache key of the response for the given resource, loaded with the given arguments.
+        """
+        return utils.get_cache_key(
+            service='discovery',
+            catalog_url=self.catalog_url,
+            resource=resource,
+            **kwargs
+        )
+
+    @staticmethod
+    def _get_cache_timeout(long_term_cache=False):
+        """
+        Return the number of seconds for which to cache responses, as configured by the current CatalogIntegration.
+
+        Responses are not cached at all when the CatalogIntegration disables caching, i.e. when 0 is returned.
+        """
+        api_config = CatalogIntegration.current()
+        if not api_config.is_cache_enabled:
+            return 0
+        return api_config.long_term_cache_ttl if long_term_cache else api_config.cache_ttl
+
     def _load_data(self, resource, default=DEFAULT_VALUE_SAFEGUARD, **kwargs):
         """
         Load data from API client.
@@ -355,19 +580,30 @@ class CourseCatalogApiClient:
 
         """
         default_val = default if default != self.DEFAULT_VALUE_SAFEGUARD else {}
+        cache_key = None
+        cache_timeout = self._get_cache_timeout(kwargs.get('long_term_cache', False))
+        if kwargs.get('resource_id') and cache_timeout:
+            cache_key = self._get_cache_key(resource, **kwargs)
+            response = self.response_cache.get(cache_key)
+            if response is not None:
+                return response
         try:
-            return get_edx_api_data(
+            response = get_edx_api_data(
                 api_config=CatalogIntegration.current(),
                 resource=resource,
                 api=self.client,
                 **kwargs
-            ) or default_val
+            )
         except (SlumberBaseException, ConnectionError, Timeout) as exc:
             LOGGER.exception(
                 'Failed to load data from resource [%s] with kwargs [%s] due to: [%s]',
                 resource, kwargs, str(exc)
             )
             return default_val
+        if response and cache_key:
+            # Empty responses are not cached, so that missing resources are picked up as soon as they are created.
+            self.response_cache.set(cache_key, response, cache_timeout)
+        return response or default_val
 
 
 def get_course_catalog_api_service_client(site=None):
@@ -11,7 +11,7 @@ from slumber.exceptions import SlumberBaseException
 
 from django.utils.translation import ugettext as _
 
-from enterprise.utils import NotConnectedToOpenEdX, format_price
+from enterprise.utils import ConcurrentFetcher, NotConnectedToOpenEdX, format_price, get_request_fetch_workers
 
 try:
     from openedx.core.djangoapps.commerce.utils import ecommerce_api_client
@@ -66,6 +66,35 @@ class EcommerceApiClient:
             return format_price(price, currency)
         return mode['original_price']
 
+    def get_course_final_prices(self, modes, currency='$', enterprise_catalog_uuid=None, fetcher=None):
+        """
+        Get the discounted prices of the SKUs of several course modes, after applying any available entitlement.
+
+        Only the entitlements available for this user are applied. The basket calculation endpoint prices a whole
+        basket at once, so each SKU is still priced with its own request; they are made concurrently, over this
+        client's connection.
+
+        Arguments:
+            modes (list): The course modes to price.
+            currency (str): The currency symbol to format the prices with.
+            enterprise_catalog_uuid (str): The enterprise catalog to apply the entitlements of, if any.
+            fetcher (ConcurrentFetcher): The fetcher to make the requests with; by default, one is made for them.
+
+        Returns:
+            list: The discounted price of each course mode, in the given order.
+
+        """
+        def get_final_price(mode):
+            """
+            Get the discounted price of a single course mode.
+            """
+            return self.get_course_final_price(mode, currency=currency, enterprise_catalog_uuid=enterprise_catalog_uuid)
+
+        if fetcher is not None:
+            return fetcher.map(get_final_price, modes)
+        with ConcurrentFetcher(workers=min(len(modes), get_request_fetch_workers())) as mode_fetcher:
+            return mode_fetcher.map(get_final_price, modes)
+
     def create_manual_enrollment_orders(self, enrollments):
         """
         Calls ecommerce to create orders for the manual enrollments passed in.
@@ -6,12 +6,13 @@ Client for communicating with the Enterprise API.
 from __future__ import absolute_import, unicode_literals
 
 from collections import OrderedDict
+from functools import partial
 from logging import getLogger
 
 from django.conf import settings
-from django.core.cache import cache
 
 from enterprise import utils
+from enterprise.api_client.caching import get_cached_value, get_or_set_single_flight
 from enterprise.api_client.lms import JwtLmsApiClient
 
 LOGGER = getLogger(__name__)
@@ -57,6 +58,33 @@ class EnterpriseApiClient(JwtLmsApiClient):
 
         return list(content_metadata.values())
 
+    def get_content_metadata_pages(self, enterprise_customer, enterprise_catalogs=None):
+        """
+        Yield the content metadata contained in the catalogs associated with the EnterpriseCustomer, page by page.
+
+        Pages are fetched as they are needed and are not cached. Items are not de-duplicated, so an item
+        contained in several catalogs is yielded once for each of them.
+
+        Arguments:
+            enterprise_customer (EnterpriseCustomer): The EnterpriseCustomer to return content metadata for.
+            enterprise_catalogs (EnterpriseCustomerCatalog): Optional list of EnterpriseCustomerCatalog objects.
+
+        Yields:
+            list: List of dicts containing the content metadata of a single page.
+        """
+        enterprise_customer_catalogs = enterprise_catalogs or enterprise_customer.enterprise_customer_catalogs.all()
+        for enterprise_customer_catalog in enterprise_customer_catalogs:
+            get_page = partial(self._get_catalog_page, str(enterprise_customer_catalog.uuid), page_size=1000)
+            for page in utils.traverse_pagination_pages(get_page):
+                yield page
+
+    @JwtLmsApiClient.refresh_token
+    def _get_catalog_page(self, catalog_uuid, **querystring):
+        """
+        Return a single page of the content metadata contained in the given enterprise catalog.
+        """
+        return getattr(self.client, self.ENTERPRISE_CUSTOMER_CATALOGS_ENDPOINT)(catalog_uuid).get(**querystring)
+
     @JwtLmsApiClient.refresh_token
     def _load_data(
             self,
@@ -87,21 +115,29 @@ class EnterpriseApiClient(JwtLmsApiClient):
             traverse_pagination=traverse_pagination,
             resource_id=resource_id
         )
-        response = cache.get(cache_key)
+        response = get_cached_value(cache_key)
         if not response:
-            # Response is not cached, so make a call.
-            endpoint = getattr(self.client, resource)(resource_id)
-            endpoint = getattr(endpoint, detail_resource) if detail_resource else endpoint
-            response = endpoint.get(**querystring)
-            if traverse_pagination:
-                results = utils.traverse_pagination(response, endpoint)
-                response = {
-                    'count': len(results),
-                    'next': 'None',
-                    'previous': 'None',
-                    'results': results,
-                }
-            if response:
-                # Now that we've got a response, cache it.
-                cache.set(cache_key, response, settings.ENTERPRISE_API_CACHE_TIMEOUT)
+            # Response is not cached, so make a call, unless another caller is already making it.
+            response = get_or_set_single_flight(
+                cache_key,
+                partial(self._get_data, resource, detail_resource, resource_id, querystring, traverse_pagination),
+                settings.ENTERPRISE_API_CACHE_TIMEOUT,
+            )
         return response or default_val
+
+    def _get_data(self, resource, detail_resource, resource_id, querystring, traverse_pagination):
+        """
+        Get a response from a call to one of the Enterprise endpoints, bypassing the cache.
+        """
+        endpoint = getattr(self.client, resource)(resource_id)
+        endpoint = getattr(endpoint, detail_resource) if detail_resource else endpoint
+        response = endpoint.get(**querystring)
+        if traverse_pagination:
+            results = utils.traverse_pagination(response, endpoint)
+            response = {
+                'count': len(results),
+                'next': 'None',
+                'previous': 'None',
+                'results': results,
+            }
+        return response
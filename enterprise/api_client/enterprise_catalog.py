@@ -7,6 +7,7 @@ from __future__ import absolute_import, unicode_literals
 
 import json
 from collections import OrderedDict
+from functools import partial
 from logging import getLogger
 
 from requests.exceptions import ConnectionError, Timeout  # pylint: disable=redefined-builtin
@@ -159,7 +160,8 @@ class EnterpriseCatalogApiClient(JwtLmsApiClient):
             endpoint = getattr(self.client, self.GET_CONTENT_METADATA_ENDPOINT.format(catalog_uuid))
             try:
                 response = endpoint.get()
-                for item in utils.traverse_pagination(response, endpoint):
+                # Content metadata is exported in the background, so the pages are fetched concurrently.
+                for item in utils.traverse_pagination(response, endpoint, workers=utils.get_pagination_workers()):
                     content_id = utils.get_content_metadata_item_id(item)
                     content_metadata[content_id] = item
             except (SlumberBaseException, ConnectionError, Timeout) as exc:
@@ -170,6 +172,40 @@ class EnterpriseCatalogApiClient(JwtLmsApiClient):
 
         return list(content_metadata.values())
 
+    def get_content_metadata_pages(self, enterprise_customer, enterprise_catalogs=None):
+        """
+        Yield the content metadata contained in the catalogs associated with the EnterpriseCustomer, page by page.
+
+        Items are not de-duplicated, so an item contained in several catalogs is yielded once for each of them.
+
+        Arguments:
+            enterprise_customer (EnterpriseCustomer): The EnterpriseCustomer to return content metadata for.
+            enterprise_catalogs (EnterpriseCustomerCatalog): Optional list of EnterpriseCustomerCatalog objects.
+
+        Yields:
+            list: List of dicts containing the content metadata of a single page.
+        """
+        enterprise_customer_catalogs = enterprise_catalogs or enterprise_customer.enterprise_customer_catalogs.all()
+
+        for enterprise_customer_catalog in enterprise_customer_catalogs:
+            catalog_uuid = enterprise_customer_catalog.uuid
+            try:
+                for page in utils.traverse_pagination_pages(partial(self._get_content_metadata_page, catalog_uuid)):
+                    yield page
+            except (SlumberBaseException, ConnectionError, Timeout) as exc:
+                LOGGER.exception(
+                    'Failed to get content metadata for Catalog [%s] in enterprise-catalog due to: [%s]',
+                    catalog_uuid, str(exc)
+                )
+
+    @JwtLmsApiClient.refresh_token
+    def _get_content_metadata_page(self, catalog_uuid, **querystring):
+        """
+        Return a single page of the content metadata contained in the given enterprise catalog.
+        """
+        endpoint = getattr(self.client, self.GET_CONTENT_METADATA_ENDPOINT.format(catalog_uuid))
+        return endpoint.get(**querystring)
+
     @JwtLmsApiClient.refresh_token
     def contains_content_items(self, catalog_uuid, content_ids):
         """
@@ -17,8 +17,14 @@ from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 from django.conf import settings
 from django.utils import timezone
 
+from enterprise.api_client.connections import get_cached_jwt, get_pooled_session
 from enterprise.constants import COURSE_MODE_SORT_ORDER, EXCLUDED_COURSE_MODES
-from enterprise.utils import NotConnectedToOpenEdX, get_enterprise_worker_user
+from enterprise.utils import (
+    NotConnectedToOpenEdX,
+    get_enterprise_worker_user,
+    get_pagination_workers,
+    traverse_pagination,
+)
 
 try:
     from openedx.core.djangoapps.embargo import api as embargo_api
@@ -50,7 +56,9 @@ class NoAuthenticationLmsApiClient:
         """
         Create an LMS API client.
         """
-        self.client = EdxRestApiClient(self.API_BASE_URL, append_slash=self.APPEND_SLASH)
+        self.client = EdxRestApiClient(
+            self.API_BASE_URL, append_slash=self.APPEND_SLASH, session=get_pooled_session(),
+        )
 
 
 class JwtLmsApiClient:
@@ -73,16 +81,16 @@ class JwtLmsApiClient:
     def connect(self):
         """
         Connect to the REST API, authenticating with a JWT for the current user.
+
+        JWTs are shared with the other clients connecting as the same user, until shortly before they expire.
         """
         if JwtBuilder is None:
             raise NotConnectedToOpenEdX("This package must be installed in an OpenEdX environment.")
 
-        now = int(time())
-        jwt = JwtBuilder.create_jwt_for_user(self.user)
+        jwt, self.expires_at = get_cached_jwt(self.user, JwtBuilder.create_jwt_for_user, self.expires_in)
         self.client = EdxRestApiClient(
-            self.API_BASE_URL, append_slash=self.APPEND_SLASH, jwt=jwt,
+            self.API_BASE_URL, append_slash=self.APPEND_SLASH, jwt=jwt, session=get_pooled_session(),
         )
-        self.expires_at = now + self.expires_in
 
     def token_expired(self):
         """
@@ -355,6 +363,8 @@ class ThirdPartyAuthApiClient(JwtLmsApiClient):
     """
 
     API_BASE_URL = settings.LMS_INTERNAL_ROOT_URL + '/api/third_party_auth/v0/'
+    # The most usernames whose remote ids are looked up with a single request, which keeps the query string short.
+    USERNAMES_PER_REQUEST = 100
 
     @JwtLmsApiClient.refresh_token
     def get_remote_id(self, identity_provider, username):
@@ -384,6 +394,38 @@ class ThirdPartyAuthApiClient(JwtLmsApiClient):
         """
         return self._get_results(identity_provider, 'remote_id', remote_id, 'username')
 
+    @JwtLmsApiClient.refresh_token
+    def get_remote_ids(self, identity_provider, usernames):
+        """
+        Retrieve the remote identifiers for the given usernames, ``USERNAMES_PER_REQUEST`` usernames at a time.
+
+        Args:
+        * ``identity_provider`` (str): identifier slug for the third-party authentication service used during SSO.
+        * ``usernames`` (iterable): The usernames identifying the users for which to retrieve the remote names.
+
+        Returns:
+            dict: the remote names of the given users, keyed by username. Users without one are left out.
+        """
+        usernames = sorted(set(usernames))
+        remote_ids = {}
+        endpoint = self.client.providers(identity_provider).users
+        for index in range(0, len(usernames), self.USERNAMES_PER_REQUEST):
+            batch = usernames[index:index + self.USERNAMES_PER_REQUEST]
+            try:
+                results = traverse_pagination(endpoint.get(username=batch), endpoint)
+            except HttpNotFoundError:
+                LOGGER.error(
+                    'usernames not found for third party provider={provider}, {count} usernames'.format(
+                        provider=identity_provider,
+                        count=len(batch),
+                    )
+                )
+                results = []
+            for row in results:
+                if row.get('username') in batch and row.get('remote_id'):
+                    remote_ids[row['username']] = row['remote_id']
+        return remote_ids
+
     def _get_results(self, identity_provider, param_name, param_value, result_field_name):
         """
         Calls the third party auth api endpoint to get the mapping between usernames and remote ids.
@@ -449,6 +491,30 @@ class GradesApiClient(JwtLmsApiClient):
 
         raise HttpNotFoundError('No grade record found for course={}, username={}'.format(course_id, username))
 
+    @JwtLmsApiClient.refresh_token
+    def get_course_grades(self, course_id):
+        """
+        Retrieve the grades of every learner enrolled in the given course_id, following the pagination of the results.
+
+        Args:
+        * ``course_id`` (str): The string value of the course's unique identifier
+
+        Raises:
+
+        HttpNotFoundError if the course is not found.
+
+        Returns:
+
+        a list of dicts, with the same keys as the dict returned by ``get_course_grade``.
+
+        """
+        endpoint = self.client.courses(course_id)
+        response = endpoint.get()
+        if isinstance(response, list):
+            return response
+        # This is only done by learner data exports, in the background, so the pages are fetched concurrently.
+        return traverse_pagination(response, endpoint, workers=get_pagination_workers())
+
 
 class CertificatesApiClient(JwtLmsApiClient):
     """
@@ -44,6 +44,9 @@ COURSE_MODE_SORT_ORDER = ['verified', 'professional', 'no-id-professional', 'aud
 # Course modes that should not be displayed to users.
 EXCLUDED_COURSE_MODES = ['credit']
 
+# Course modes for which an E-Commerce order is created when learners are enrolled in them.
+PAID_COURSE_MODES = ['verified', 'professional']
+
 # Number of records to display in each paginated set.
 PAGE_SIZE = 25
 
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Django management command for storing the course keys of course runs.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import logging
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import ugettext as _
+
+from enterprise.api_client.discovery import get_course_catalog_api_service_client
+from enterprise.models import CourseRunKeyMapping, EnterpriseCourseEnrollment
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Store the course keys of course runs as ``CourseRunKeyMapping`` records, so that they need not be looked up in
+    the course catalog again.
+    """
+    help = 'Store the course keys of the course runs enrolled in by enterprise learners, or of every course run.'
+
+    ENROLLMENTS = 'enrollments'
+    DISCOVERY = 'discovery'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            dest='source',
+            choices=[self.ENROLLMENTS, self.DISCOVERY],
+            default=self.ENROLLMENTS,
+            help=_('Map the course runs of existing enterprise course enrollments, or every course run listed by the '
+                   'course catalog.'),
+        )
+        parser.add_argument(
+            '--batch_size',
+            dest='batch_size',
+            type=int,
+            default=100,
+            help=_('The number of course runs to look up and store at a time.'),
+        )
+        super(Command, self).add_arguments(parser)
+
+    def handle(self, *args, **options):
+        try:
+            catalog_client = get_course_catalog_api_service_client()
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+
+        mapped_before = CourseRunKeyMapping.objects.count()
+        if options['source'] == self.DISCOVERY:
+            self._map_catalog_course_runs(catalog_client, options['batch_size'])
+        else:
+            self._map_enrolled_course_runs(catalog_client, options['batch_size'])
+        LOGGER.info(
+            'Stored the course keys of [%s] course runs.',
+            CourseRunKeyMapping.objects.count() - mapped_before,
+        )
+
+    @staticmethod
+    def _map_enrolled_course_runs(catalog_client, batch_size):
+        """
+        Look up and store the course keys of the enrolled course runs which have not been mapped yet.
+        """
+        course_run_ids = list(
+            EnterpriseCourseEnrollment.objects.exclude(
+                course_id__in=CourseRunKeyMapping.objects.values('course_run_id'),
+            ).order_by().values_list('course_id', flat=True).distinct()
+        )
+        LOGGER.info('Looking up the course keys of [%s] enrolled course runs.', len(course_run_ids))
+        for start in range(0, len(course_run_ids), batch_size):
+            catalog_client.get_course_ids(course_run_ids[start:start + batch_size])
+
+    @staticmethod
+    def _map_catalog_course_runs(catalog_client, batch_size):
+        """
+        Store the course keys of every course run listed by the course catalog.
+        """
+        for course_runs in catalog_client.get_course_run_pages(page_size=batch_size):
+            CourseRunKeyMapping.objects.add_course_keys({
+                course_run['key']: course_run['course']
+                for course_run in course_runs if course_run.get('key') and course_run.get('course')
+            })
@@ -5,10 +5,13 @@ Django management command for creating EnterpriseCourseEnrollment records.
 from __future__ import absolute_import, unicode_literals
 
 import logging
+from collections import defaultdict
+from uuid import UUID
 
 from django.core.management import BaseCommand
 from django.db import connection
 
+from enterprise.api_client.discovery import get_course_catalog_api_service_client
 from enterprise.models import (
     EnterpriseCourseEnrollment,
     EnterpriseCustomer,
@@ -46,6 +49,7 @@ class Command(BaseCommand):
             enterprise_customer_uuid_filter
         )
         LOGGER.info('System has %s missing enrollments', len(missing_enrollment_data))
+        self._store_course_keys(missing_enrollment_data)
         for item in missing_enrollment_data:
             course_exist_in_catalog = False
             user_id = item['user_id']
@@ -130,6 +134,27 @@ class Command(BaseCommand):
         LOGGER.info('Created %s missing EnterpriseCourseEnrollments.', records_created)
         LOGGER.info('Exception raised for %s records.', records_failed)
 
+    def _store_course_keys(self, enrollment_data):
+        """
+        Look up the course keys of the course runs of all the given enrollments up front, with one catalog API call
+        per enterprise customer site, so that checking each enrollment against the catalogs finds them stored.
+        """
+        course_run_ids_by_customer = defaultdict(set)
+        for item in enrollment_data:
+            course_run_ids_by_customer[UUID(str(item['enterprise_customer_uuid']))].add(item['course_run_id'])
+
+        for enterprise_customer in EnterpriseCustomer.objects.filter(uuid__in=list(course_run_ids_by_customer)):
+            try:
+                get_course_catalog_api_service_client(enterprise_customer.site).get_course_ids(
+                    course_run_ids_by_customer[enterprise_customer.uuid]
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning(
+                    'Could not look up the course keys of the course runs of EnterpriseCustomer [%s]: [%s]',
+                    enterprise_customer.uuid,
+                    str(exc)
+                )
+
     def _fetch_course_enrollment_data(self, enterprise_customer_uuid):
         """
         Return enterprise customer UUID/user_id/course_run_id triples which represent CourseEnrollment records
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.28 on 2026-10-18 22:18
+
+import django.utils.timezone
+from django.db import migrations, models
+
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enterprise', '0096_enterprise_catalog_admin_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseRunKeyMapping',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('course_run_id', models.CharField(help_text='The course run ID, such as course-v1:edX+DemoX+Demo_Course.', max_length=255, unique=True)),
+                ('course_key', models.CharField(help_text='The key of the course that the course run belongs to, such as edX+DemoX.', max_length=255)),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-18 23:41
+
+import uuid
+
+import jsonfield.fields
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enterprise', '0097_courserunkeymapping'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnterpriseCustomerCourseEnrollmentsJob',
+            fields=[
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('requester_id', models.PositiveIntegerField(help_text='The LMS user id of the user who requested the enrollments.')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=32)),
+                ('payload', jsonfield.fields.JSONField(default=list, help_text='The course enrollment requests to process, cleared once the job is completed or has failed.')),
+                ('results', jsonfield.fields.JSONField(default=list, help_text='The outcome of each of the course enrollment requests processed so far, in order.')),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('processed_count', models.PositiveIntegerField(default=0)),
+                ('succeeded_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('enterprise_customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_enrollments_jobs', to='enterprise.EnterpriseCustomer')),
+            ],
+            options={
+                'ordering': ['created'],
+            },
+        ),
+    ]
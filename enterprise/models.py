@@ -7,6 +7,7 @@ from __future__ import absolute_import, unicode_literals
 import collections
 import json
 import os
+import time
 from decimal import Decimal
 from logging import getLogger
 from uuid import uuid4
@@ -19,14 +20,17 @@ from fernet_fields import EncryptedCharField
 from jsonfield.encoder import JSONEncoder
 from jsonfield.fields import JSONField
 from multi_email_field.fields import MultiEmailField
+from requests.exceptions import ConnectionError, Timeout  # pylint: disable=redefined-builtin
 from simple_history.models import HistoricalRecords
 from six.moves.urllib.parse import urljoin  # pylint: disable=import-error,ungrouped-imports
+from slumber.exceptions import SlumberBaseException
 
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.sites.models import Site
 from django.core import mail
+from django.core.cache import cache
 from django.core.exceptions import NON_FIELD_ERRORS, ObjectDoesNotExist, ValidationError
 from django.core.files.storage import default_storage
 from django.core.validators import MaxValueValidator, MinValueValidator
@@ -34,7 +38,7 @@ from django.db import IntegrityError, models
 from django.template import Context, Template
 from django.urls import reverse
 from django.utils.encoding import force_bytes, force_text, python_2_unicode_compatible
-from django.utils.functional import cached_property, lazy
+from django.utils.functional import SimpleLazyObject, cached_property, lazy
 from django.utils.http import urlquote
 from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext
@@ -43,11 +47,17 @@ from django.utils.translation import ugettext_lazy as _
 from model_utils.models import TimeStampedModel
 
 from enterprise import utils
+from enterprise.api_client.caching import LocalCache, get_cached_value, set_cached_value
 from enterprise.api_client.discovery import CourseCatalogApiClient, get_course_catalog_api_service_client
 from enterprise.api_client.ecommerce import EcommerceApiClient
 from enterprise.api_client.enterprise_catalog import EnterpriseCatalogApiClient
 from enterprise.api_client.lms import EnrollmentApiClient, ThirdPartyAuthApiClient, parse_lms_api_datetime
-from enterprise.constants import ALL_ACCESS_CONTEXT, ENTERPRISE_OPERATOR_ROLE, json_serialized_course_modes
+from enterprise.constants import (
+    ALL_ACCESS_CONTEXT,
+    ENTERPRISE_OPERATOR_ROLE,
+    PAID_COURSE_MODES,
+    json_serialized_course_modes,
+)
 from enterprise.utils import (
     CourseEnrollmentDowngradeError,
     CourseEnrollmentPermissionError,
@@ -67,6 +77,13 @@ LOGGER = getLogger(__name__)
 
 mark_safe_lazy = lazy(mark_safe, six.text_type)  # pylint: disable=invalid-name
 
+# Catalog membership indexes recently read from the shared cache, so that they need not be read and decompressed
+# again on every membership check.
+CATALOG_MEMBERSHIP_INDEX_LOCAL_CACHE = LocalCache(
+    max_size=getattr(settings, 'ENTERPRISE_CATALOG_MEMBERSHIP_INDEX_LOCAL_CACHE_SIZE', 100),
+    timeout=getattr(settings, 'ENTERPRISE_CATALOG_MEMBERSHIP_INDEX_LOCAL_CACHE_TIMEOUT', 60),
+)
+
 
 class EnterpriseCustomerManager(models.Manager):
     """
@@ -421,6 +438,53 @@ class EnterpriseCustomer(TimeStampedModel):
         )
         return utils.update_query_parameters(url, utils.get_enterprise_utm_context(self))
 
+    def get_remote_ids(self, usernames):
+        """
+        Retrieve the SSO provider's identifiers for the given learners from the LMS Third Party API, in bulk.
+
+        When the ENTERPRISE_REMOTE_ID_CACHE_TIMEOUT setting is set, the identifiers found are cached for that many
+        seconds, and only the learners missing from the cache are looked up.
+
+        Arguments:
+            usernames (iterable): The usernames of the learners.
+
+        Returns:
+            dict: The remote identifiers of the learners, keyed by username. Learners without one are left out, as
+                  are all learners if the EnterpriseCustomer has no identity_provider.
+        """
+        identity_provider = self.identity_provider
+        usernames = set(usernames).difference({None})
+        if not identity_provider or not usernames:
+            return {}
+
+        cache_timeout = getattr(settings, 'ENTERPRISE_REMOTE_ID_CACHE_TIMEOUT', None)
+        cache_keys = {}
+        remote_ids = {}
+        if cache_timeout:
+            cache_keys = {
+                username: utils.get_cache_key(
+                    resource='remote-id', identity_provider=identity_provider, username=username,
+                )
+                for username in usernames
+            }
+            cached_remote_ids = cache.get_many(list(cache_keys.values()))
+            remote_ids = {
+                username: cached_remote_ids[cache_key]
+                for username, cache_key in cache_keys.items() if cache_key in cached_remote_ids
+            }
+            usernames = usernames.difference(remote_ids)
+
+        if usernames:
+            client = ThirdPartyAuthApiClient(get_enterprise_worker_user())
+            new_remote_ids = client.get_remote_ids(identity_provider, usernames)
+            if cache_timeout and new_remote_ids:
+                cache.set_many(
+                    {cache_keys[username]: remote_id for username, remote_id in new_remote_ids.items()},
+                    cache_timeout,
+                )
+            remote_ids.update(new_remote_ids)
+        return remote_ids
+
     def catalog_contains_course(self, course_run_id):
         """
         Determine if the specified course run is contained in enterprise customer catalogs.
@@ -436,8 +500,12 @@ class EnterpriseCustomer(TimeStampedModel):
             if EnterpriseCatalogApiClient().enterprise_contains_content_items(self.uuid, [course_run_id]):
                 return True
         else:
+            # Look up the course key once for all of the catalogs, and only when a catalog needs it.
+            course_ids = SimpleLazyObject(
+                lambda: get_course_catalog_api_service_client(self.site).get_course_ids([course_run_id])
+            )
             for catalog in self.enterprise_customer_catalogs.all():
-                if catalog.contains_courses([course_run_id]):
+                if catalog.contains_courses([course_run_id], course_ids=course_ids):
                     return True
 
         return False
@@ -810,11 +878,48 @@ class EnterpriseCustomerUser(TimeStampedModel):
         enrollment_api_client = EnrollmentApiClient()
         # Check to see if the user's already enrolled and we have an enterprise course enrollment to track it.
         course_enrollment = enrollment_api_client.get_course_enrollment(self.username, course_run_id) or {}
+        needs_enrollment, is_upgrading = self.start_enrollment(
+            course_run_id, mode, course_enrollment, cohort=cohort, source_slug=source_slug
+        )
+        if not needs_enrollment:
+            return
+
+        # Directly enroll into the specified track.
+        # This should happen after we create the EnterpriseCourseEnrollment
+        error = None
+        try:
+            enrollment_api_client.enroll_user_in_course(self.username, course_run_id, mode, cohort=cohort)
+        except HttpClientError as exc:
+            error = exc
+        succeeded = self.complete_enrollment(course_run_id, mode, cohort=cohort, is_upgrading=is_upgrading, error=error)
+        if succeeded and mode in PAID_COURSE_MODES:
+            # create an ecommerce order for the course enrollment
+            self.create_order_for_enrollment(course_run_id, discount_percentage, sales_force_id)
+
+    def start_enrollment(self, course_run_id, mode, course_enrollment, cohort=None, source_slug=None):
+        """
+        Register an enterprise course enrollment, if the user needs to be enrolled into the course track.
+
+        Arguments:
+            course_run_id (str): The course run to enroll the user into.
+            mode (str): The course track to enroll the user into.
+            course_enrollment (dict): The user's current enrollment in the course run, from the Enrollment API; empty
+                if there is none.
+            cohort (str): The cohort to add the user to.
+            source_slug (str): The slug of the EnterpriseEnrollmentSource of the enrollment.
+
+        Returns:
+            tuple: Whether the user needs to be enrolled into the course track, and whether that is an upgrade from
+                an audit track.
+
+        Raises:
+            CourseEnrollmentPermissionError: If a cohort is given but the enterprise customer does not allow it.
+            CourseEnrollmentDowngradeError: If the user is already enrolled in a paid track of the course run.
+        """
         enrolled_in_course = course_enrollment and course_enrollment.get('is_active', False)
 
         audit_modes = getattr(settings, 'ENTERPRISE_COURSE_ENROLLMENT_AUDIT_MODES', ['audit', 'honor'])
-        paid_modes = ['verified', 'professional']
-        is_upgrading = mode in paid_modes and course_enrollment.get('mode') in audit_modes
+        is_upgrading = mode in PAID_COURSE_MODES and course_enrollment.get('mode') in audit_modes
 
         if not enrolled_in_course or is_upgrading:
             if cohort and not self.enterprise_customer.enable_autocohorting:
@@ -840,36 +945,9 @@ class EnterpriseCustomerUser(TimeStampedModel):
                 # Catching will allow us to continue and ensure we can still create an order for this enrollment.
                 LOGGER.exception("IntegrityError on attempt at EnterpriseCourseEnrollment for user with id [%s] "
                                  "and course id [%s]", self.user_id, course_run_id)
-            # Directly enroll into the specified track.
-            # This should happen after we create the EnterpriseCourseEnrollment
-            succeeded = True
-            try:
-                enrollment_api_client.enroll_user_in_course(self.username, course_run_id, mode, cohort=cohort)
-            except HttpClientError as exc:
-                succeeded = False
-                default_message = 'No error message provided'
-                try:
-                    error_message = json.loads(exc.content.decode()).get('message', default_message)
-                except ValueError:
-                    error_message = default_message
-                LOGGER.exception(
-                    'Error while enrolling user %(user)s: %(message)s',
-                    dict(user=self.user_id, message=error_message)
-                )
-            if succeeded:
-                utils.track_event(self.user_id, 'edx.bi.user.enterprise.enrollment.course', {
-                    'category': 'enterprise',
-                    'label': course_run_id,
-                    'enterprise_customer_uuid': str(self.enterprise_customer.uuid),
-                    'enterprise_customer_name': self.enterprise_customer.name,
-                    'mode': mode,
-                    'cohort': cohort,
-                    'is_upgrading': is_upgrading,
-                })
-                if mode in paid_modes:
-                    # create an ecommerce order for the course enrollment
-                    self.create_order_for_enrollment(course_run_id, discount_percentage, sales_force_id)
-        elif enrolled_in_course and course_enrollment.get('mode') in paid_modes and mode in audit_modes:
+            return True, is_upgrading
+
+        if enrolled_in_course and course_enrollment.get('mode') in PAID_COURSE_MODES and mode in audit_modes:
             # This enrollment is attempting to "downgrade" the user from a paid track they are already in.
             raise CourseEnrollmentDowngradeError(
                 'The user is already enrolled in the course {course_run_id} in {current_mode} mode '
@@ -879,6 +957,146 @@ class EnterpriseCustomerUser(TimeStampedModel):
                     given_mode=mode,
                 )
             )
+        return False, is_upgrading
+
+    def complete_enrollment(self, course_run_id, mode, cohort=None, is_upgrading=False, error=None):
+        """
+        Record the outcome of enrolling the user into a course track through the Enrollment API.
+
+        Arguments:
+            course_run_id (str): The course run the user was enrolled into.
+            mode (str): The course track the user was enrolled into.
+            cohort (str): The cohort the user was added to.
+            is_upgrading (bool): Whether the enrollment is an upgrade from an audit track.
+            error (HttpClientError): The error the Enrollment API responded with, if the enrollment failed.
+
+        Returns:
+            bool: Whether the enrollment succeeded.
+        """
+        if error is not None:
+            default_message = 'No error message provided'
+            try:
+                error_message = json.loads(error.content.decode()).get('message', default_message)
+            except ValueError:
+                error_message = default_message
+            LOGGER.exception(
+                'Error while enrolling user %(user)s: %(message)s',
+                dict(user=self.user_id, message=error_message),
+                exc_info=error,
+            )
+            return False
+
+        utils.track_event(self.user_id, 'edx.bi.user.enterprise.enrollment.course', {
+            'category': 'enterprise',
+            'label': course_run_id,
+            'enterprise_customer_uuid': str(self.enterprise_customer.uuid),
+            'enterprise_customer_name': self.enterprise_customer.name,
+            'mode': mode,
+            'cohort': cohort,
+            'is_upgrading': is_upgrading,
+        })
+        return True
+
+    @classmethod
+    def enroll_in_bulk(cls, enrollments, source_slug=None, discount_percentage=0.0, sales_force_id=None):
+        """
+        Enroll users into course tracks, as ``enroll`` does for each of them, but making the remote calls in bulk.
+
+        The learners are looked up in a single query, and the Enrollment API calls are made concurrently, at most
+        ENTERPRISE_BULK_ENROLLMENT_WORKERS of them at once. The database is only written to from the calling thread.
+        A single E-Commerce order is then created for all of the successful enrollments into paid course tracks.
+
+        Arguments:
+            enrollments (list): (EnterpriseCustomerUser, course run id, mode, cohort) tuples for the enrollments to
+                make. Each user may only be enrolled into a given course run once.
+            source_slug (str): The slug of the EnterpriseEnrollmentSource of the enrollments.
+            discount_percentage (float): The discount of the E-Commerce orders of paid enrollments.
+            sales_force_id (str): The Salesforce Opportunity ID of the E-Commerce orders of paid enrollments.
+
+        Returns:
+            list: For each enrollment in turn, the CourseEnrollmentDowngradeError, CourseEnrollmentPermissionError
+                or HttpClientError raised while looking up or checking the user's current enrollment, the Slumber or
+                requests error raised when the Enrollment API could not be reached, or None.
+        """
+        if not enrollments:
+            return []
+
+        users = User.objects.in_bulk({enrollment[0].user_id for enrollment in enrollments})
+        usernames = [
+            users[enrollment[0].user_id].username if enrollment[0].user_id in users else None
+            for enrollment in enrollments
+        ]
+        errors = [None] * len(enrollments)
+        order_enrollments = []
+
+        enrollment_api_client = EnrollmentApiClient()
+        # Authenticate before the calls are started, so that the worker threads need not.
+        enrollment_api_client.connect()
+        workers = min(len(enrollments), getattr(settings, 'ENTERPRISE_BULK_ENROLLMENT_WORKERS', 8))
+        with utils.ConcurrentFetcher(workers=workers) as fetcher:
+            course_enrollment_results = [
+                fetcher.start(enrollment_api_client.get_course_enrollment, username, enrollment[1])
+                for username, enrollment in zip(usernames, enrollments)
+            ]
+
+            enrollment_results = {}
+            for index, (enterprise_customer_user, course_run_id, mode, cohort) in enumerate(enrollments):
+                try:
+                    course_enrollment = course_enrollment_results[index].result() or {}
+                    needs_enrollment, is_upgrading = enterprise_customer_user.start_enrollment(
+                        course_run_id, mode, course_enrollment, cohort=cohort, source_slug=source_slug
+                    )
+                except (
+                        CourseEnrollmentDowngradeError,
+                        CourseEnrollmentPermissionError,
+                        HttpClientError,
+                        SlumberBaseException,
+                        ConnectionError,
+                        Timeout,
+                ) as exc:
+                    errors[index] = exc
+                    continue
+                if needs_enrollment:
+                    enrollment_results[index] = (
+                        fetcher.start(
+                            enrollment_api_client.enroll_user_in_course,
+                            usernames[index],
+                            course_run_id,
+                            mode,
+                            cohort=cohort,
+                        ),
+                        is_upgrading,
+                    )
+
+        for index, (enrollment_result, is_upgrading) in sorted(enrollment_results.items()):
+            enterprise_customer_user, course_run_id, mode, cohort = enrollments[index]
+            error = None
+            try:
+                enrollment_result.result()
+            except HttpClientError as exc:
+                error = exc
+            except (SlumberBaseException, ConnectionError, Timeout) as exc:
+                errors[index] = exc
+                continue
+            succeeded = enterprise_customer_user.complete_enrollment(
+                course_run_id, mode, cohort=cohort, is_upgrading=is_upgrading, error=error
+            )
+            if succeeded and mode in PAID_COURSE_MODES:
+                user = users.get(enterprise_customer_user.user_id)
+                order_enrollments.append({
+                    'lms_user_id': enterprise_customer_user.user_id,
+                    'username': user.username if user else None,
+                    'email': user.email if user else None,
+                    'course_run_key': course_run_id,
+                    'enterprise_customer_name': enterprise_customer_user.enterprise_customer.name,
+                    'enterprise_customer_uuid': str(enterprise_customer_user.enterprise_customer.uuid),
+                    'discount_percentage': float(discount_percentage),
+                    'sales_force_id': sales_force_id,
+                })
+
+        if order_enrollments:
+            cls.create_orders_for_enrollments(order_enrollments)
+        return errors
 
     def unenroll(self, course_run_id):
         """
@@ -931,6 +1149,28 @@ class EnterpriseCustomerUser(TimeStampedModel):
         else:
             LOGGER.warning(failure_log_msg, self.user_id, course_run_id, 'Failed to retrieve a valid ecommerce worker.')
 
+    @staticmethod
+    def create_orders_for_enrollments(enrollments):
+        """
+        Create a single order on the Ecommerce side for tracking the course enrollments of enterprise customer users.
+
+        Arguments:
+            enrollments (list): The enrollments, in the format expected by
+                ``EcommerceApiClient.create_manual_enrollment_orders``.
+        """
+        LOGGER.info("Creating orders for %s enrollments of enterprise learners", len(enrollments))
+        ecommerce_service_worker = get_ecommerce_worker_user()
+        failure_log_msg = 'Could not create orders for the enrollments of enterprise learners: %s. Reason: [%s]'
+        if ecommerce_service_worker is not None:
+            try:
+                ecommerce_api_client = EcommerceApiClient(ecommerce_service_worker)
+            except NotConnectedToOpenEdX as exc:
+                LOGGER.exception(failure_log_msg, enrollments, str(exc))
+            else:
+                ecommerce_api_client.create_manual_enrollment_orders(enrollments)
+        else:
+            LOGGER.warning(failure_log_msg, enrollments, 'Failed to retrieve a valid ecommerce worker.')
+
     @classmethod
     def inactivate_other_customers(cls, user_id, enterprise_customer):
         """
@@ -1308,6 +1548,16 @@ class EnterpriseCourseEnrollment(TimeStampedModel):
             self.enterprise_customer_user.username,
             self.course_id
         )
+        return self.is_audit_course_enrollment(course_enrollment)
+
+    @staticmethod
+    def is_audit_course_enrollment(course_enrollment):
+        """
+        Specify whether the given course enrollment, as returned by the Enrollment API, is in audit mode.
+
+        :param course_enrollment: The course enrollment dictionary, or None if no enrollment was found.
+        :return: Whether the course enrollment mode is of an audit type.
+        """
         audit_modes = getattr(settings, 'ENTERPRISE_COURSE_ENROLLMENT_AUDIT_MODES', ['audit', 'honor'])
         return course_enrollment and course_enrollment.get('mode') in audit_modes
 
@@ -1352,6 +1602,159 @@ class EnterpriseCourseEnrollment(TimeStampedModel):
         return self.__str__()
 
 
+class CourseRunKeyMappingManager(models.Manager):
+    """
+    Model manager for :class:`.CourseRunKeyMapping` model.
+    """
+
+    def get_course_keys(self, course_run_ids):
+        """
+        Return the known course keys of the given course runs, as a dict keyed by course run id.
+
+        Course runs which have not been mapped yet are left out.
+        """
+        return dict(self.filter(course_run_id__in=course_run_ids).values_list('course_run_id', 'course_key'))
+
+    def add_course_keys(self, course_keys):
+        """
+        Store the course keys of the given ``{course_run_id: course_key}`` dict, skipping mapped course runs.
+        """
+        self.bulk_create(
+            [
+                self.model(course_run_id=course_run_id, course_key=course_key)
+                for course_run_id, course_key in course_keys.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+
+@python_2_unicode_compatible
+class CourseRunKeyMapping(TimeStampedModel):
+    """
+    Store the key of the course that a course run belongs to, as found in the course catalog.
+
+    A course run never moves to another course, so the mapping is kept for good once it has been looked up.
+
+    .. no_pii:
+    """
+
+    class Meta:
+        app_label = 'enterprise'
+
+    objects = CourseRunKeyMappingManager()
+
+    course_run_id = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text=_('The course run ID, such as course-v1:edX+DemoX+Demo_Course.'),
+    )
+    course_key = models.CharField(
+        max_length=255,
+        help_text=_('The key of the course that the course run belongs to, such as edX+DemoX.'),
+    )
+
+    def __str__(self):
+        """
+        Return human-readable string representation.
+        """
+        return '<CourseRunKeyMapping {} -> {}>'.format(self.course_run_id, self.course_key)
+
+    def __repr__(self):
+        """
+        Return uniquely identifying string representation.
+        """
+        return self.__str__()
+
+
+@python_2_unicode_compatible
+class EnterpriseCustomerCourseEnrollmentsJob(TimeStampedModel):
+    """
+    Store a list of course enrollment requests for an enterprise customer, to be processed by a celery task.
+
+    The per-item outcomes are added to the job as the requests are processed, in chunks.
+
+    .. pii: The payload field contains the email addresses of the learners to enroll, until the job is completed or
+       has failed.
+    .. pii_types: email_address
+    .. pii_retirement: retained
+    """
+
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (PROCESSING, _('Processing')),
+        (COMPLETED, _('Completed')),
+        (FAILED, _('Failed')),
+    )
+
+    class Meta:
+        app_label = 'enterprise'
+        ordering = ['created']
+
+    uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    enterprise_customer = models.ForeignKey(
+        EnterpriseCustomer,
+        related_name='course_enrollments_jobs',
+        on_delete=models.deletion.CASCADE,
+    )
+    requester_id = models.PositiveIntegerField(
+        help_text=_('The LMS user id of the user who requested the enrollments.'),
+    )
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default=PENDING)
+    payload = JSONField(
+        default=list,
+        help_text=_('The course enrollment requests to process, cleared once the job is completed or has failed.'),
+    )
+    results = JSONField(
+        default=list,
+        help_text=_('The outcome of each of the course enrollment requests processed so far, in order.'),
+    )
+    total_count = models.PositiveIntegerField(default=0)
+    processed_count = models.PositiveIntegerField(default=0)
+    succeeded_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+
+    def add_results(self, results):
+        """
+        Record the outcomes of the next course enrollment requests of the payload, and update the progress counters.
+        """
+        self.results.extend(results)
+        succeeded_count = sum(1 for result in results if result.get('detail') == 'success')
+        self.succeeded_count += succeeded_count
+        self.failed_count += len(results) - succeeded_count
+        self.processed_count += len(results)
+        if self.processed_count >= self.total_count:
+            self.status = self.COMPLETED
+            self.payload = []
+        self.save()
+
+    def mark_failed(self):
+        """
+        Record that processing the job failed, and clear the course enrollment requests which are left.
+        """
+        self.status = self.FAILED
+        self.payload = []
+        self.save()
+
+    def __str__(self):
+        """
+        Return human-readable string representation.
+        """
+        return '<EnterpriseCustomerCourseEnrollmentsJob {} {}: {}/{}>'.format(
+            self.uuid, self.status, self.processed_count, self.total_count
+        )
+
+    def __repr__(self):
+        """
+        Return uniquely identifying string representation.
+        """
+        return self.__str__()
+
+
 @python_2_unicode_compatible
 class EnterpriseCatalogQuery(TimeStampedModel):
     """
@@ -1498,6 +1901,137 @@ class EnterpriseCustomerCatalog(TimeStampedModel):
         content_filter = self.get_content_filter()
         return set(content_filter.get('key', []) + content_filter.get('uuid', []))
 
+    @property
+    def membership_index_cache_key(self):
+        """
+        Return the cache key of the catalog's membership index.
+
+        The key depends on the catalog's content filter, so changing the filter invalidates the index.
+        """
+        return utils.get_cache_key(
+            resource='catalog-membership-index',
+            catalog_uuid=str(self.uuid),
+            content_filter=json.dumps(self.get_content_filter(), sort_keys=True),
+        )
+
+    def get_membership_index(self):
+        """
+        Return the content IDs of every course, course run and program in the catalog, from the cache.
+
+        ``None`` is returned if the index is disabled by the ENTERPRISE_CATALOG_MEMBERSHIP_INDEX_ENABLED setting or
+        has not been built yet. A missing or outdated index is rebuilt in the background, with
+        ``refresh_catalog_membership_index``.
+        """
+        if not getattr(settings, 'ENTERPRISE_CATALOG_MEMBERSHIP_INDEX_ENABLED', False):
+            return None
+
+        cache_key = self.membership_index_cache_key
+        content_ids = CATALOG_MEMBERSHIP_INDEX_LOCAL_CACHE.get(cache_key)
+        if content_ids is not None:
+            return content_ids
+
+        index = get_cached_value(cache_key)
+        refresh_interval = getattr(settings, 'ENTERPRISE_CATALOG_MEMBERSHIP_INDEX_REFRESH_INTERVAL', 3600)
+        is_outdated = not index or index['built_at'] + refresh_interval < time.time()
+        # The marker only outlives a refresh that is never picked up for a short while; it is extended once the
+        # refresh starts, and removed when it ends.
+        refresh_queue_timeout = getattr(settings, 'ENTERPRISE_CATALOG_MEMBERSHIP_INDEX_REFRESH_QUEUE_TIMEOUT', 300)
+        if is_outdated and cache.add(cache_key + '.refresh', True, min(refresh_queue_timeout, refresh_interval)):
+            # Imported here because the tasks import this module.
+            from enterprise.tasks import refresh_catalog_membership_index
+            try:
+                refresh_catalog_membership_index.delay(str(self.uuid))
+            except Exception:
+                cache.delete(cache_key + '.refresh')
+                raise
+        if not index:
+            return None
+
+        content_ids = frozenset(index['content_ids'])
+        CATALOG_MEMBERSHIP_INDEX_LOCAL_CACHE.set(cache_key, content_ids)
+        return content_ids
+
+    def refresh_membership_index(self):
+        """
+        Build the catalog's membership index from the catalog's content in the discovery service, and cache it.
+
+        Returns:
+            list: The content IDs of every course, course run and program in the catalog.
+        """
+        cache_key = self.membership_index_cache_key
+        # Hold off other refreshes while this one runs; whether it succeeds or fails, the next outdated read may
+        # start another one.
+        cache.set(
+            cache_key + '.refresh',
+            True,
+            getattr(settings, 'ENTERPRISE_CATALOG_MEMBERSHIP_INDEX_REFRESH_INTERVAL', 3600),
+        )
+        try:
+            response = get_course_catalog_api_service_client(
+                self.enterprise_customer.site
+            ).get_catalog_results_from_discovery(
+                self.get_content_filter(), {}, traverse_pagination=True, workers=utils.get_pagination_workers(),
+            )
+            content_ids = sorted({
+                item.get('uuid') if item.get('content_type') == 'program' else item.get('key')
+                for item in response.get('results', [])
+            }.difference({None}))
+            set_cached_value(
+                cache_key,
+                {'built_at': time.time(), 'content_ids': content_ids},
+                getattr(settings, 'ENTERPRISE_CATALOG_MEMBERSHIP_INDEX_TIMEOUT', 86400),
+            )
+        finally:
+            cache.delete(cache_key + '.refresh')
+        return content_ids
+
+    def _get_known_content_ids(self):
+        """
+        Return the content IDs of the catalog that are known without searching the discovery service, if any.
+
+        They are known when the catalog's content filter lists them, or from the catalog's membership index.
+        """
+        return self.content_filter_ids or self.get_membership_index()
+
+    def get_content_members(self, content_ids):
+        """
+        Return those of the given content IDs that are members of the catalog.
+
+        Arguments:
+            content_ids (iterable): Course keys, course run keys and/or program UUIDs. A course run is a member of the
+                                    catalog if either it or its course is.
+
+        Returns:
+            set: The content IDs that are members of the catalog.
+        """
+        content_ids = set(content_ids)
+        members = self._find_members(content_ids)
+        remaining_content_ids = content_ids.difference(members)
+        if remaining_content_ids:
+            catalog_client = get_course_catalog_api_service_client(self.enterprise_customer.site)
+            course_keys = {
+                content_id: course_key
+                for content_id, course_key in catalog_client.get_course_ids(remaining_content_ids).items()
+                if course_key != content_id
+            }
+            if course_keys:
+                course_members = self._find_members(set(course_keys.values()))
+                members.update(
+                    content_id for content_id, course_key in course_keys.items() if course_key in course_members
+                )
+        return members
+
+    def _find_members(self, content_ids):
+        """
+        Return those of the given content IDs that are members of the catalog themselves.
+        """
+        if not content_ids:
+            return set()
+        content_ids_in_catalog = self._get_known_content_ids()
+        if content_ids_in_catalog is not None:
+            return content_ids.intersection(content_ids_in_catalog)
+        return self._filter_members('key', list(content_ids)) | self._filter_members('uuid', list(content_ids))
+
     def get_paginated_content(self, query_parameters):
         """
         Return paginated discovery service search results without expired course runs.
@@ -1555,22 +2089,27 @@ class EnterpriseCustomerCatalog(TimeStampedModel):
         results = response.get('results', [])
         return {x[content_id_field_name] for x in results}
 
-    def contains_courses(self, content_ids):
+    def contains_courses(self, content_ids, course_ids=None):
         """
         Return True if this catalog contains the given courses else False.
 
         The content_ids parameter should be a list containing course keys
-        and/or course run ids.
+        and/or course run ids. The course keys of the course runs are looked
+        up with one call to the catalog API, unless they are given in course_ids,
+        as returned by ``CourseCatalogApiClient.get_course_ids``, so that callers
+        checking several catalogs only look them up once.
         """
         # Translate any provided course run IDs to course keys.
-        catalog_client = get_course_catalog_api_service_client(self.enterprise_customer.site)
-        course_keys = {catalog_client.get_course_id(k) for k in content_ids}
+        if course_ids is None:
+            catalog_client = get_course_catalog_api_service_client(self.enterprise_customer.site)
+            course_ids = catalog_client.get_course_ids(content_ids)
+        course_keys = {course_ids.get(k) for k in content_ids}
 
         # Remove `None` from set of course_keys if present
         course_keys = course_keys.difference({None})
 
-        content_ids_in_catalog = self.content_filter_ids
-        if not content_ids_in_catalog:
+        content_ids_in_catalog = self._get_known_content_ids()
+        if content_ids_in_catalog is None:
             content_ids_in_catalog = self._filter_members('key', list(course_keys)) if course_keys else set()
 
         return bool(
@@ -1582,8 +2121,8 @@ class EnterpriseCustomerCatalog(TimeStampedModel):
         """
         Return true if this catalog contains the given programs.
         """
-        content_ids_in_catalog = self.content_filter_ids
-        if not content_ids_in_catalog:
+        content_ids_in_catalog = self._get_known_content_ids()
+        if content_ids_in_catalog is None:
             content_ids_in_catalog = self._filter_members('uuid', program_uuids)
 
         return bool(program_uuids and set(program_uuids).issubset(content_ids_in_catalog))
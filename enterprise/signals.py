@@ -11,10 +11,13 @@ from django.db import transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from consent.models import DataSharingConsentTextOverrides
 from enterprise.api_client.enterprise_catalog import EnterpriseCatalogApiClient
 from enterprise.constants import ENTERPRISE_LEARNER_ROLE
 from enterprise.decorators import disable_for_loaddata
 from enterprise.models import (
+    EnterpriseCustomer,
+    EnterpriseCustomerBrandingConfiguration,
     EnterpriseCustomerCatalog,
     EnterpriseCustomerUser,
     PendingEnterpriseCustomerUser,
@@ -22,7 +25,12 @@ from enterprise.models import (
     SystemWideEnterpriseUserRoleAssignment,
 )
 from enterprise.tasks import create_enterprise_enrollment
-from enterprise.utils import NotConnectedToOpenEdX, get_default_catalog_content_filter, track_enrollment
+from enterprise.utils import (
+    NotConnectedToOpenEdX,
+    get_default_catalog_content_filter,
+    invalidate_consent_page_cache,
+    track_enrollment,
+)
 
 try:
     from student.models import CourseEnrollment
@@ -211,6 +219,27 @@ def delete_enterprise_catalog_data(sender, instance, **kwargs):     # pylint: di
         logger.exception('Unable to delete Enterprise Catalog {}'.format(str(catalog_uuid)), exc)
 
 
+@receiver(post_save, sender=EnterpriseCustomer)
+def invalidate_customer_consent_page_cache(sender, instance, **kwargs):     # pylint: disable=unused-argument
+    """
+    Drop the cached data sharing consent page contexts of an Enterprise Customer when it changes.
+    """
+    invalidate_consent_page_cache(instance.uuid)
+
+
+@receiver(post_save, sender=EnterpriseCustomerBrandingConfiguration)
+@receiver(post_delete, sender=EnterpriseCustomerBrandingConfiguration)
+@receiver(post_save, sender=DataSharingConsentTextOverrides)
+@receiver(post_delete, sender=DataSharingConsentTextOverrides)
+def invalidate_consent_page_cache_receiver(sender, instance, **kwargs):     # pylint: disable=unused-argument
+    """
+    Drop the cached data sharing consent page contexts of an Enterprise Customer when its consent page changes.
+
+    That is, when its branding or its consent page text overrides change.
+    """
+    invalidate_consent_page_cache(instance.enterprise_customer_id)
+
+
 def create_enterprise_enrollment_receiver(sender, instance, **kwargs):     # pylint: disable=unused-argument
     """
     Watches for post_save signal for creates on the CourseEnrollment table.
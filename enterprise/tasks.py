@@ -8,7 +8,16 @@ from logging import getLogger
 
 from celery import shared_task
 
-from enterprise.models import EnterpriseCourseEnrollment, EnterpriseCustomerUser, EnterpriseEnrollmentSource
+from django.conf import settings
+from django.contrib.auth.models import User
+
+from enterprise.models import (
+    EnterpriseCourseEnrollment,
+    EnterpriseCustomerCatalog,
+    EnterpriseCustomerCourseEnrollmentsJob,
+    EnterpriseCustomerUser,
+    EnterpriseEnrollmentSource,
+)
 
 LOGGER = getLogger(__name__)
 
@@ -53,3 +62,73 @@ def create_enterprise_enrollment(course_id, enterprise_customer_user_id):
             enterprise_customer_user=enterprise_customer_user,
             source=EnterpriseEnrollmentSource.get_source(EnterpriseEnrollmentSource.ENROLLMENT_TASK)
         )
+
+
+@shared_task
+def refresh_catalog_membership_index(catalog_uuid):
+    """
+    Rebuild the membership index of the given enterprise customer catalog.
+    """
+    try:
+        enterprise_customer_catalog = EnterpriseCustomerCatalog.objects.get(uuid=catalog_uuid)
+    except EnterpriseCustomerCatalog.DoesNotExist:
+        LOGGER.info("EnterpriseCustomerCatalog %s no longer exists. Exiting task.", catalog_uuid)
+        return
+
+    content_ids = enterprise_customer_catalog.refresh_membership_index()
+    LOGGER.info(
+        "Indexed %s content items of EnterpriseCustomerCatalog %s.",
+        len(content_ids),
+        catalog_uuid,
+    )
+
+
+@shared_task
+def process_course_enrollments_job(job_uuid):
+    """
+    Process the course enrollment requests of an enterprise customer course enrollments job, in chunks.
+
+    The outcomes of each chunk are saved to the job as soon as it is processed, so its progress can be followed. When
+    the task is run again for a job which is still being processed, the requests processed already are skipped;
+    completed and failed jobs are left as they are.
+    """
+    # Imported here, since the serializers depend on the models, which queue tasks of this module.
+    from enterprise.api.v1.serializers import EnterpriseCustomerCourseEnrollmentsSerializer
+
+    try:
+        job = EnterpriseCustomerCourseEnrollmentsJob.objects.select_related('enterprise_customer').get(uuid=job_uuid)
+    except EnterpriseCustomerCourseEnrollmentsJob.DoesNotExist:
+        LOGGER.info("EnterpriseCustomerCourseEnrollmentsJob %s no longer exists. Exiting task.", job_uuid)
+        return
+    if job.status in (EnterpriseCustomerCourseEnrollmentsJob.COMPLETED, EnterpriseCustomerCourseEnrollmentsJob.FAILED):
+        LOGGER.info("EnterpriseCustomerCourseEnrollmentsJob %s is already %s. Exiting task.", job_uuid, job.status)
+        return
+
+    job.status = EnterpriseCustomerCourseEnrollmentsJob.PROCESSING
+    job.save()
+    chunk_size = getattr(settings, 'ENTERPRISE_COURSE_ENROLLMENTS_JOB_CHUNK_SIZE', 100)
+    try:
+        requester = User.objects.get(pk=job.requester_id)
+        while job.status != EnterpriseCustomerCourseEnrollmentsJob.COMPLETED:
+            serializer = EnterpriseCustomerCourseEnrollmentsSerializer(
+                data=job.payload[job.processed_count:job.processed_count + chunk_size],
+                many=True,
+                context={
+                    'enterprise_customer': job.enterprise_customer,
+                    'request_user': requester,
+                }
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            job.add_results(serializer.data)
+    except Exception:  # pylint: disable=broad-except
+        LOGGER.exception("Failed to process EnterpriseCustomerCourseEnrollmentsJob %s.", job_uuid)
+        job.mark_failed()
+        raise
+
+    LOGGER.info(
+        "Processed EnterpriseCustomerCourseEnrollmentsJob %s: %s of %s enrollment requests succeeded.",
+        job_uuid,
+        job.succeeded_count,
+        job.total_count,
+    )
@@ -6,8 +6,10 @@ from __future__ import absolute_import, division, unicode_literals
 
 import datetime
 import logging
+import math
 import re
-from uuid import UUID
+from concurrent.futures import Future, ThreadPoolExecutor
+from uuid import UUID, uuid4
 
 import bleach
 import pytz
@@ -20,7 +22,9 @@ from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core import mail
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
 from django.http import Http404
 from django.template.loader import render_to_string
 from django.urls import reverse
@@ -540,16 +544,42 @@ def get_cache_key(**kwargs):
     return get_django_cache_key(**kwargs)
 
 
-def traverse_pagination(response, endpoint):
+def get_consent_page_cache_version(enterprise_customer_uuid):
+    """
+    Return the version of the enterprise customer's cached data sharing consent page contexts.
+
+    The version is part of their cache keys, so the contexts cached before it changes are no longer used.
+    """
+    cache_key = get_cache_key(resource='consent-page-version', enterprise_customer=str(enterprise_customer_uuid))
+    version = cache.get(cache_key)
+    if version is None:
+        version = uuid4().hex
+        cache.set(cache_key, version, None)
+    return version
+
+
+def invalidate_consent_page_cache(enterprise_customer_uuid):
+    """
+    Stop using the enterprise customer's cached data sharing consent page contexts.
+    """
+    cache.delete(get_cache_key(resource='consent-page-version', enterprise_customer=str(enterprise_customer_uuid)))
+
+
+def traverse_pagination(response, endpoint, workers=1):
     """
     Traverse a paginated API response.
 
     Extracts and concatenates "results" (list of dict) returned by DRF-powered
     APIs.
 
+    The ``next`` links are followed one page at a time, unless the caller asks for several workers: then, when the
+    response is paginated by page number and reports the total ``count`` of results, the remaining pages are known
+    up front, so they are fetched concurrently and reassembled in order.
+
     Arguments:
         response (Dict): Current response dict from service API
         endpoint (slumber Resource object): slumber Resource object from edx-rest-api-client
+        workers (int): The most pages to fetch at once; pass ``get_pagination_workers()`` to fetch them concurrently.
 
     Returns:
         list of dict.
@@ -557,6 +587,20 @@ def traverse_pagination(response, endpoint):
     """
     results = response.get('results', [])
 
+    if workers > 1:
+        remaining_page_numbers = get_remaining_page_numbers(response)
+        if remaining_page_numbers:
+            querystring = parse_qs(urlparse(response['next']).query, keep_blank_values=True)
+            responses = fetch_pages(
+                lambda page: endpoint.get(**dict(querystring, page=[str(page)])),
+                remaining_page_numbers,
+                workers,
+            )
+            for page_response in responses:
+                results += page_response.get('results', [])
+            response = responses[-1]
+
+    # Carry on from the last page fetched, in case more results were added since the first page was fetched.
     next_page = response.get('next')
     while next_page:
         querystring = parse_qs(urlparse(next_page).query, keep_blank_values=True)
@@ -567,6 +611,164 @@ def traverse_pagination(response, endpoint):
     return results
 
 
+def get_pagination_workers():
+    """
+    Return the most pages of a paginated API response to fetch at once, for callers which fetch them concurrently.
+
+    Only background jobs which traverse long paginated responses do so; web requests fetch pages one at a time.
+    """
+    return getattr(settings, 'ENTERPRISE_API_PAGINATION_WORKERS', 4)
+
+
+def get_remaining_page_numbers(response):
+    """
+    Return the numbers of the pages after the given page of a paginated API response, as far as they are known.
+
+    They are only known when the response is paginated by page number and reports the total ``count`` of results;
+    otherwise, an empty list is returned.
+    """
+    next_page = response.get('next')
+    count = response.get('count')
+    page_size = len(response.get('results') or [])
+    if not next_page or not isinstance(count, int) or not page_size:
+        return []
+    try:
+        next_page_number = int(parse_qs(urlparse(next_page).query)['page'][0])
+    except (KeyError, ValueError):
+        return []
+    last_page_number = int(math.ceil(count / page_size))
+    return list(range(next_page_number, last_page_number + 1))
+
+
+def fetch_pages(get_page, page_numbers, workers):
+    """
+    Fetch the given pages of a paginated API response concurrently, with at most the given number of workers.
+
+    Arguments:
+        get_page (callable): Fetches the response dict of the page with the given number.
+        page_numbers (list): The numbers of the pages to fetch.
+        workers (int): The most pages to fetch at once.
+
+    Returns:
+        list of dict: The response dicts of the pages, in the given order.
+
+    """
+    with ThreadPoolExecutor(max_workers=min(workers, len(page_numbers))) as executor:
+        return list(executor.map(get_page, page_numbers))
+
+
+def get_request_fetch_workers():
+    """
+    Return the most remote API calls to make at once on behalf of a single request.
+    """
+    return getattr(settings, 'ENTERPRISE_REQUEST_FETCH_WORKERS', 4)
+
+
+class ConcurrentFetcher:
+    """
+    Make the independent remote API calls needed by a single request concurrently.
+
+    Calls are started with ``start`` and run on worker threads while the request carries on; their results are
+    collected from the returned futures. Worker threads do not share the request's database connection, so API
+    clients should be created before their calls are started; calls which do touch the database close the worker's
+    connection once they are done. When the ENTERPRISE_REQUEST_FETCH_WORKERS setting is 1, calls are made inline
+    instead.
+
+    Use it as a context manager, so the worker threads are released once the calls are started::
+
+        with ConcurrentFetcher() as fetcher:
+            course_modes = fetcher.start(enrollment_client.get_course_modes, course_run_id)
+        ...
+        modes = course_modes.result()
+    """
+
+    def __init__(self, workers=None):
+        """
+        Create a fetcher making at most the given number of calls at once.
+        """
+        self.workers = get_request_fetch_workers() if workers is None else workers
+        self._executor = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+
+    def start(self, func, *args, **kwargs):
+        """
+        Start calling ``func`` with the given arguments, and return a future for its result.
+        """
+        if self._executor is not None:
+            return self._executor.submit(self._call_on_worker, func, *args, **kwargs)
+
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as exc:  # pylint: disable=broad-except
+            future.set_exception(exc)
+        return future
+
+    @staticmethod
+    def _call_on_worker(func, *args, **kwargs):
+        """
+        Call ``func`` with the given arguments on a worker thread, then close the thread's database connection.
+        """
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connection.close()
+
+    def map(self, func, *iterables):
+        """
+        Call ``func`` with each set of arguments from the given iterables concurrently.
+
+        Returns:
+            list: The results of the calls, in order. If any of the calls raised an exception, it is re-raised.
+        """
+        return [future.result() for future in [self.start(func, *args) for args in zip(*iterables)]]
+
+    def close(self):
+        """
+        Stop accepting calls, releasing the worker threads once the calls already started are done.
+
+        This does not wait for those calls, and their futures can still be used afterwards.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        """
+        Return the fetcher itself.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the fetcher; see ``close``.
+        """
+        self.close()
+
+
+def traverse_pagination_pages(get_page):
+    """
+    Traverse a paginated API response one page at a time.
+
+    Unlike ``traverse_pagination``, the "results" of each page are yielded as soon as the page is
+    fetched rather than concatenated, so callers only ever hold a single page in memory.
+
+    Arguments:
+        get_page (callable): Fetches a response dict from the service API, given the query string
+            parameters of the page to fetch; it is first called without any.
+
+    Yields:
+        list of dict.
+
+    """
+    querystring = {}
+    while True:
+        response = get_page(**querystring)
+        yield response.get('results', [])
+        next_page = response.get('next')
+        if not next_page:
+            return
+        querystring = parse_qs(urlparse(next_page).query, keep_blank_values=True)
+
+
 def ungettext_min_max(singular, plural, range_text, min_val, max_val):
     """
     Return grammatically correct, translated text based off of a minimum and maximum value.
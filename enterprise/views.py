@@ -17,6 +17,7 @@ from six.moves.urllib.parse import urlencode, urljoin  # pylint: disable=import-
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.db import IntegrityError, transaction
 from django.http import Http404, JsonResponse
@@ -24,7 +25,7 @@ from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils.decorators import method_decorator
 from django.utils.text import slugify
-from django.utils.translation import get_language_from_request
+from django.utils.translation import get_language, get_language_from_request
 from django.utils.translation import ugettext as _
 from django.utils.translation import ungettext
 from django.views.generic import View
@@ -53,6 +54,7 @@ from enterprise.models import (
     EnterpriseEnrollmentSource,
 )
 from enterprise.utils import (
+    ConcurrentFetcher,
     CourseEnrollmentDowngradeError,
     CourseEnrollmentPermissionError,
     NotConnectedToOpenEdX,
@@ -60,7 +62,9 @@ from enterprise.utils import (
     filter_audit_course_modes,
     format_price,
     get_active_course_runs,
+    get_cache_key,
     get_configuration_value,
+    get_consent_page_cache_version,
     get_current_course_run,
     get_enterprise_customer_idp,
     get_enterprise_customer_or_404,
@@ -478,6 +482,25 @@ class GrantDataSharingPermissions(View):
         """
         Return a dict of data for the language on the page.
         """
+        context_data = self.get_shared_page_language_context_data(course_id, enterprise_customer, platform_name)
+        context_data.update(self.get_request_context_data(success_url, failure_url, request))
+        return context_data
+
+    @staticmethod
+    def get_request_context_data(success_url, failure_url, request):
+        """
+        Return a dict of the data on the page which depends on the request.
+        """
+        return {
+            'redirect_url': success_url,
+            'failure_url': failure_url,
+            'defer_creation': request.GET.get('defer_creation') is not None,
+        }
+
+    def get_shared_page_language_context_data(self, course_id, enterprise_customer, platform_name):
+        """
+        Return a dict of data for the language on the page which is the same for every learner of the course or program.
+        """
         item = 'course' if course_id else 'program'
         # Translators: bold_start and bold_end are HTML tags for specifying enterprise name in bold text.
         context_data = {
@@ -499,9 +522,6 @@ class GrantDataSharingPermissions(View):
                 bold_end='</b>',
                 item=item,
             ),
-            'redirect_url': success_url,
-            'failure_url': failure_url,
-            'defer_creation': request.GET.get('defer_creation') is not None,
             'requested_permissions': [
                 _('your enrollment in this {item}').format(item=item),
                 _('your learning progress'),
@@ -520,6 +540,52 @@ class GrantDataSharingPermissions(View):
 
         return context_data
 
+    def get_shared_context_cache_key(self, enterprise_customer, course_id, program_uuid, platform_name):
+        """
+        Return the cache key of the part of the page context shared by the enterprise customer's learners.
+
+        The key changes whenever the enterprise customer, its branding or its consent page text overrides do.
+        """
+        return get_cache_key(
+            resource='consent-page-context',
+            enterprise_customer=str(enterprise_customer.uuid),
+            version=get_consent_page_cache_version(enterprise_customer.uuid),
+            course_id=course_id,
+            program_uuid=program_uuid,
+            platform_name=platform_name,
+            language=get_language(),
+        )
+
+    def get_cached_shared_context(self, enterprise_customer, course_id, program_uuid, platform_name):
+        """
+        Return the cached part of the page context shared by the enterprise customer's learners, if there is one.
+
+        It is made of the course or program context and the shared page language context, which only depend on the
+        enterprise customer, the course or program, the platform name and the active language. Nothing is cached in
+        preview mode, where unpublished text overrides are shown.
+        """
+        if self.preview_mode or not getattr(settings, 'ENTERPRISE_CONSENT_PAGE_CACHE_TIMEOUT', 300):
+            return None
+        return cache.get(
+            self.get_shared_context_cache_key(enterprise_customer, course_id, program_uuid, platform_name)
+        )
+
+    def set_cached_shared_context(self, enterprise_customer, course_id, program_uuid, platform_name, shared_context):
+        """
+        Cache the part of the page context shared by the enterprise customer's learners.
+
+        It is kept for ENTERPRISE_CONSENT_PAGE_CACHE_TIMEOUT seconds, unless the enterprise customer, its branding or
+        its consent page text overrides change first.
+        """
+        cache_timeout = getattr(settings, 'ENTERPRISE_CONSENT_PAGE_CACHE_TIMEOUT', 300)
+        if self.preview_mode or not cache_timeout:
+            return
+        cache.set(
+            self.get_shared_context_cache_key(enterprise_customer, course_id, program_uuid, platform_name),
+            shared_context,
+            cache_timeout,
+        )
+
     @staticmethod
     def create_enterprise_course_enrollment(request, consent_record, course_id):
         """Create EnterpriseCustomerUser and EnterpriseCourseEnrollment record if not already exists."""
@@ -571,9 +637,13 @@ class GrantDataSharingPermissions(View):
             raise
 
         context_data = get_global_context(request, enterprise_customer)
+        # The course or program is known to exist if the page was rendered for it recently.
+        shared_context = self.get_cached_shared_context(
+            enterprise_customer, course_id, program_uuid, context_data['platform_name']
+        )
 
         if not self.preview_mode:
-            if not self.course_or_program_exist(course_id, program_uuid):
+            if shared_context is None and not self.course_or_program_exist(course_id, program_uuid):
                 error_code = 'ENTGDS000'
                 log_message = (
                     '[Enterprise DSC API] The course or program with a given id does not exist. '
@@ -695,39 +765,42 @@ class GrantDataSharingPermissions(View):
             )
             return render_page_with_error_code_message(request, context_data, error_code, log_message)
 
-        try:
-            updated_context_dict = self.get_course_or_program_context(
-                enterprise_customer,
-                course_id=course_id,
-                program_uuid=program_uuid
-            )
-            context_data.update(updated_context_dict)
-        except Http404:
-            error_code = 'ENTGDS004'
-            log_message = (
-                '[Enterprise DSC API] Course catalog api configuration error. '
-                'Course: {course_id}, '
-                'Program: {program_uuid}, '
-                'EnterpriseCustomer: {enterprise_customer_uuid}, '
-                'User: {user_id}, '
-                'ErrorCode: {error_code}'.format(
+        if shared_context is None:
+            try:
+                shared_context = self.get_course_or_program_context(
+                    enterprise_customer,
                     course_id=course_id,
-                    program_uuid=program_uuid,
-                    enterprise_customer_uuid=enterprise_customer_uuid,
-                    user_id=request.user.id,
-                    error_code=error_code,
+                    program_uuid=program_uuid
                 )
+            except Http404:
+                error_code = 'ENTGDS004'
+                log_message = (
+                    '[Enterprise DSC API] Course catalog api configuration error. '
+                    'Course: {course_id}, '
+                    'Program: {program_uuid}, '
+                    'EnterpriseCustomer: {enterprise_customer_uuid}, '
+                    'User: {user_id}, '
+                    'ErrorCode: {error_code}'.format(
+                        course_id=course_id,
+                        program_uuid=program_uuid,
+                        enterprise_customer_uuid=enterprise_customer_uuid,
+                        user_id=request.user.id,
+                        error_code=error_code,
+                    )
+                )
+                return render_page_with_error_code_message(request, context_data, error_code, log_message)
+
+            shared_context.update(self.get_shared_page_language_context_data(
+                course_id=course_id,
+                enterprise_customer=enterprise_customer,
+                platform_name=context_data['platform_name'],
+            ))
+            self.set_cached_shared_context(
+                enterprise_customer, course_id, program_uuid, context_data['platform_name'], shared_context
             )
-            return render_page_with_error_code_message(request, context_data, error_code, log_message)
 
-        context_data.update(self.get_page_language_context_data(
-            course_id=course_id,
-            enterprise_customer=enterprise_customer,
-            success_url=success_url,
-            failure_url=failure_url,
-            request=request,
-            platform_name=context_data['platform_name'],
-        ))
+        context_data.update(shared_context)
+        context_data.update(self.get_request_context_data(success_url, failure_url, request))
 
         return render(request, 'enterprise/grant_data_sharing_permissions.html', context=context_data)
 
@@ -1096,28 +1169,33 @@ class CourseEnrollmentView(NonAtomicView):
     def set_final_prices(self, modes, request):
         """
         Set the final discounted price on each premium mode.
+
+        The premium modes are all priced at once, with a single E-Commerce API client.
         """
-        result = []
-        for mode in modes:
-            if mode['premium']:
-                mode['final_price'] = EcommerceApiClient(request.user).get_course_final_price(
-                    mode=mode,
-                    enterprise_catalog_uuid=request.GET.get(
-                        'catalog'
-                    ) if request.method == 'GET' else None,
-                )
-            result.append(mode)
-        return result
+        premium_modes = [mode for mode in modes if mode['premium']]
+        if premium_modes:
+            final_prices = EcommerceApiClient(request.user).get_course_final_prices(
+                premium_modes,
+                enterprise_catalog_uuid=request.GET.get(
+                    'catalog'
+                ) if request.method == 'GET' else None,
+            )
+            for mode, final_price in zip(premium_modes, final_prices):
+                mode['final_price'] = final_price
+        return modes
 
-    def get_available_course_modes(self, request, course_run_id, enterprise_catalog):
+    def get_available_course_modes(self, request, course_run_id, enterprise_catalog, modes=None):
         """
         Return the available course modes for the course run.
 
+        The course modes are fetched from the Enrollment API, unless they were fetched already and are given.
+
         The provided EnterpriseCustomerCatalog is used to filter and order the
         course modes returned using the EnterpriseCustomerCatalog's
         field "enabled_course_modes".
         """
-        modes = EnrollmentApiClient().get_course_modes(course_run_id)
+        if modes is None:
+            modes = EnrollmentApiClient().get_course_modes(course_run_id)
         if not modes:
             LOGGER.warning('[Enterprise Enrollment] Unable to get course modes. '
                            'CourseRun: {course_run_id}'.format(course_run_id=course_run_id))
@@ -1147,8 +1225,13 @@ class CourseEnrollmentView(NonAtomicView):
         Specifically, take an EnterpriseCustomer UUID and a course run ID, and transform those
         into an actual EnterpriseCustomer, a set of details about the course, and a list
         of the available course modes for that course run.
+
+        The course modes are fetched in the background while the course and course run are fetched, so that
+        the slower of the two bounds how long this takes.
         """
         enterprise_customer = get_enterprise_customer_or_404(enterprise_uuid)
+        with ConcurrentFetcher() as fetcher:
+            course_modes_result = fetcher.start(EnrollmentApiClient().get_course_modes, course_run_id)
 
         # If the catalog query parameter was provided, we need to scope
         # this request to the specified EnterpriseCustomerCatalog.
@@ -1223,7 +1306,9 @@ class CourseEnrollmentView(NonAtomicView):
             # display the generic error message.
             return enterprise_customer, course, course_run, course_modes
 
-        modes = self.get_available_course_modes(request, course_run_id, enterprise_catalog)
+        modes = self.get_available_course_modes(
+            request, course_run_id, enterprise_catalog, modes=course_modes_result.result()
+        )
         audit_modes = getattr(
             settings,
             'ENTERPRISE_COURSE_ENROLLMENT_AUDIT_MODES',
@@ -1553,6 +1638,12 @@ class CourseEnrollmentView(NonAtomicView):
         if embargo_url:
             return redirect(embargo_url)
 
+        # Fetch the learner's enrollment in the background while the details of the course run are fetched.
+        with ConcurrentFetcher() as fetcher:
+            enrolled_course_result = fetcher.start(
+                EnrollmentApiClient().get_course_enrollment, request.user.username, course_id
+            )
+
         enterprise_customer, course, course_run, modes = self.get_base_details(
             request, enterprise_uuid, course_id
         )
@@ -1563,8 +1654,7 @@ class CourseEnrollmentView(NonAtomicView):
             enterprise_customer=enterprise_customer
         )
 
-        enrollment_client = EnrollmentApiClient()
-        enrolled_course = enrollment_client.get_course_enrollment(request.user.username, course_id)
+        enrolled_course = enrolled_course_result.result()
         try:
             enterprise_course_enrollment = EnterpriseCourseEnrollment.objects.get(
                 enterprise_customer_user__enterprise_customer=enterprise_customer,
@@ -1601,7 +1691,7 @@ class ProgramEnrollmentView(NonAtomicView):
     """
 
     @staticmethod
-    def extend_course(course, enterprise_customer, request):
+    def extend_course(course, enterprise_customer, request, course_and_course_run=None):
         """
         Extend a course with more details needed for the program landing page.
 
@@ -1615,28 +1705,33 @@ class ProgramEnrollmentView(NonAtomicView):
         * `course_effort`
         * `expected_learning_items`
         * `staff`
+
+        The details of the course and its course run are fetched from the discovery service, unless they were
+        fetched already and are given as ``course_and_course_run``.
         """
         course_run_id = course['course_runs'][0]['key']
-        try:
-            catalog_api_client = get_course_catalog_api_service_client(enterprise_customer.site)
-        except ImproperlyConfigured:
-            error_code = 'ENTPEV000'
-            LOGGER.error(
-                '[Enterprise Enrollment] CourseCatalogApiServiceClient is improperly configured. '
-                'CourseRun: {course_run_id}, '
-                'EnterpriseCustomer: {enterprise_customer}, '
-                'ErrorCode: {error_code}, '
-                'User: {userid}'.format(
-                    error_code=error_code,
-                    userid=request.user.id,
-                    enterprise_customer=enterprise_customer.uuid,
-                    course_run_id=course_run_id,
+        if course_and_course_run is None:
+            try:
+                catalog_api_client = get_course_catalog_api_service_client(enterprise_customer.site)
+            except ImproperlyConfigured:
+                error_code = 'ENTPEV000'
+                LOGGER.error(
+                    '[Enterprise Enrollment] CourseCatalogApiServiceClient is improperly configured. '
+                    'CourseRun: {course_run_id}, '
+                    'EnterpriseCustomer: {enterprise_customer}, '
+                    'ErrorCode: {error_code}, '
+                    'User: {userid}'.format(
+                        error_code=error_code,
+                        userid=request.user.id,
+                        enterprise_customer=enterprise_customer.uuid,
+                        course_run_id=course_run_id,
+                    )
                 )
-            )
-            messages.add_generic_error_message_with_code(request, error_code)
-            return ({}, error_code)
+                messages.add_generic_error_message_with_code(request, error_code)
+                return ({}, error_code)
+            course_and_course_run = catalog_api_client.get_course_and_course_run(course_run_id)
 
-        course_details, course_run_details = catalog_api_client.get_course_and_course_run(course_run_id)
+        course_details, course_run_details = course_and_course_run
         if not course_details or not course_run_details:
             error_code = 'ENTPEV001'
             LOGGER.error(
@@ -1679,6 +1774,45 @@ class ProgramEnrollmentView(NonAtomicView):
         })
         return course, None
 
+    @staticmethod
+    def get_courses_and_course_runs(course_catalog_api_client, program_uuid, enterprise_customer, courses):
+        """
+        Return the details of the first course run of each of the given program courses, and of its course.
+
+        They are looked up in bulk, and kept in the cache per program and enterprise customer for
+        ENTERPRISE_PROGRAM_COURSES_CACHE_TIMEOUT seconds, so that rendering the program landing page again soon
+        does not wait on the discovery service.
+
+        Returns:
+            dict: The course details and course run details of each course run, keyed by course run ID.
+        """
+        course_run_ids = {course['course_runs'][0]['key'] for course in courses}
+        cache_timeout = getattr(settings, 'ENTERPRISE_PROGRAM_COURSES_CACHE_TIMEOUT', 300)
+        cache_key = get_cache_key(
+            resource='program-courses',
+            program_uuid=program_uuid,
+            enterprise_customer=enterprise_customer.uuid,
+        )
+        courses_and_course_runs = (cache.get(cache_key) or {}) if cache_timeout else {}
+
+        missing_course_run_ids = course_run_ids.difference(courses_and_course_runs)
+        if missing_course_run_ids:
+            courses_and_course_runs.update(
+                course_catalog_api_client.get_courses_and_course_runs(missing_course_run_ids)
+            )
+            if cache_timeout:
+                # Courses and course runs which were not found are left out, so they are looked up again next time.
+                cache.set(
+                    cache_key,
+                    {
+                        course_run_id: (course, course_run)
+                        for course_run_id, (course, course_run) in courses_and_course_runs.items()
+                        if course and course_run
+                    },
+                    cache_timeout,
+                )
+        return courses_and_course_runs
+
     def get_program_details(self, request, program_uuid, enterprise_customer):
         """
         Retrieve fundamental details used by both POST and GET versions of this view.
@@ -1750,12 +1884,19 @@ class ProgramEnrollmentView(NonAtomicView):
         # TODO: Upstream this additional context to the platform's `ProgramDataExtender` so we can avoid this here.
         program_details['enrolled_in_program'] = False
         enrollment_count = 0
+        courses_and_course_runs = ProgramEnrollmentView.get_courses_and_course_runs(
+            course_catalog_api_client,
+            program_uuid,
+            enterprise_customer,
+            program_details['courses'],
+        )
         for extended_course in program_details['courses']:
             # We need to extend our course data further for modals and other displays.
             extended_data, error_code = ProgramEnrollmentView.extend_course(
                 extended_course,
                 enterprise_customer,
-                request
+                request,
+                course_and_course_run=courses_and_course_runs.get(extended_course['course_runs'][0]['key']),
             )
 
             if error_code:
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cornerstone', '0007_learner_data_fetch_workers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cornerstoneenterprisecustomerconfiguration',
+            name='bulk_fetch_course_grades',
+            field=models.BooleanField(default=False, help_text='Fetch the grades of every learner in a course run with one paginated sweep of the Grades API, instead of one request per learner. Best suited to course runs where most learners belong to the enterprise customer.'),
+        ),
+        migrations.AddField(
+            model_name='historicalcornerstoneenterprisecustomerconfiguration',
+            name='bulk_fetch_course_grades',
+            field=models.BooleanField(default=False, help_text='Fetch the grades of every learner in a course run with one paginated sweep of the Grades API, instead of one request per learner. Best suited to course runs where most learners belong to the enterprise customer.'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-18 21:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cornerstone', '0008_bulk_fetch_course_grades'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cornerstoneenterprisecustomerconfiguration',
+            name='learner_data_high_water_mark',
+            field=models.DateTimeField(blank=True, help_text='When the last successful learner data transmission started. Incremental transmissions only consider the enrollments whose enrollment, grade or certificate changed since then.', null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalcornerstoneenterprisecustomerconfiguration',
+            name='learner_data_high_water_mark',
+            field=models.DateTimeField(blank=True, help_text='When the last successful learner data transmission started. Incremental transmissions only consider the enrollments whose enrollment, grade or certificate changed since then.', null=True),
+        ),
+    ]
@@ -38,7 +38,7 @@ class DegreedLearnerExporter(LearnerExporter):
         """
         # Degreed expects completion dates of the form 'yyyy-mm-dd'.
         completed_timestamp = completed_date.strftime("%F") if isinstance(completed_date, datetime) else None
-        if enterprise_enrollment.enterprise_customer_user.get_remote_id() is not None:
+        if self.get_remote_id(enterprise_enrollment.enterprise_customer_user) is not None:
             DegreedLearnerDataTransmissionAudit = apps.get_model(  # pylint: disable=invalid-name
                 'degreed',
                 'DegreedLearnerDataTransmissionAudit'
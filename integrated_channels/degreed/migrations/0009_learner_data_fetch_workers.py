@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-18 21:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('degreed', '0008_auto_20191001_0742'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='degreedenterprisecustomerconfiguration',
+            name='learner_data_fetch_workers',
+            field=models.PositiveIntegerField(default=1, help_text='The number of enrollments whose grade and certificate data is fetched from the LMS in parallel while exporting learner data. A value of 1 fetches the data one enrollment at a time.'),
+        ),
+        migrations.AddField(
+            model_name='historicaldegreedenterprisecustomerconfiguration',
+            name='learner_data_fetch_workers',
+            field=models.PositiveIntegerField(default=1, help_text='The number of enrollments whose grade and certificate data is fetched from the LMS in parallel while exporting learner data. A value of 1 fetches the data one enrollment at a time.'),
+        ),
+    ]
@@ -14,6 +14,10 @@ class DegreedContentMetadataTransmitter(ContentMetadataTransmitter):
     This transmitter transmits exported content metadata to Degreed.
     """
 
+    # Keep parallel uploads to Degreed's course content API modest.
+    MAX_CONCURRENT_CHUNKS = 2
+    MIN_CHUNK_INTERVAL = 1
+
     def __init__(self, enterprise_configuration, client=DegreedAPIClient):
         """
         Use the ``DegreedAPIClient`` for content metadata transmission to Degreed.
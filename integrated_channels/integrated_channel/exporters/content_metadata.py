@@ -106,6 +106,41 @@ class ContentMetadataExporter(Exporter):
             content_metadata_export[content_metadata_item_export.content_id] = content_metadata_item_export
         return OrderedDict(sorted(content_metadata_export.items()))
 
+    def export_pages(self):
+        """
+        Export and transform the content metadata one page at a time.
+
+        Unlike ``export``, only a single page of content metadata is held in memory at once. Items contained in
+        several catalogs are only exported the first time they are seen.
+
+        Yields:
+            OrderedDict: The content metadata items of a single page, keyed by content id.
+        """
+        if can_use_enterprise_catalog(self.enterprise_customer.uuid):
+            api_client = self.enterprise_catalog_api
+        else:
+            api_client = self.enterprise_api
+        content_metadata_pages = api_client.get_content_metadata_pages(
+            self.enterprise_customer,
+            enterprise_catalogs=self.enterprise_configuration.customer_catalogs_to_transmit
+        )
+        exported_content_ids = set()
+        for content_metadata_items in content_metadata_pages:
+            content_metadata_export = OrderedDict()
+            for item in content_metadata_items:
+                content_id = get_content_metadata_item_id(item)
+                if content_id in exported_content_ids:
+                    continue
+                exported_content_ids.add(content_id)
+                content_metadata_export[content_id] = ContentMetadataItemExport(item, self._transform_item(item))
+            LOGGER.info(
+                'Retrieved a page of [%s] new content metadata items for enterprise [%s]',
+                len(content_metadata_export),
+                self.enterprise_customer.name,
+            )
+            if content_metadata_export:
+                yield content_metadata_export
+
     def _transform_item(self, content_metadata_item):
         """
         Transform the provided content metadata item to the schema expected by the integrated channel.
@@ -9,19 +9,32 @@ enterprise customer.
 
 from __future__ import absolute_import, unicode_literals
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from logging import getLogger
 
 from slumber.exceptions import HttpNotFoundError
 
 from django.apps import apps
+from django.contrib.auth.models import User
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
 from consent.models import DataSharingConsent
-from enterprise.api_client.lms import CertificatesApiClient, CourseApiClient, GradesApiClient
-from enterprise.models import EnterpriseCourseEnrollment
+from enterprise.api_client.lms import CertificatesApiClient, CourseApiClient, EnrollmentApiClient, GradesApiClient
+from enterprise.models import EnterpriseCourseEnrollment, EnterpriseCustomerUser
 from integrated_channels.integrated_channel.exporters import Exporter
-from integrated_channels.utils import is_already_transmitted, parse_datetime_to_epoch_millis
+from integrated_channels.utils import get_transmitted_grades, is_already_transmitted, parse_datetime_to_epoch_millis
+
+try:
+    from lms.djangoapps.certificates.models import GeneratedCertificate
+    from lms.djangoapps.grades.models import PersistentCourseGrade
+    from student.models import CourseEnrollment
+except ImportError:
+    GeneratedCertificate = None
+    PersistentCourseGrade = None
+    CourseEnrollment = None
 
 LOGGER = getLogger(__name__)
 
@@ -35,6 +48,9 @@ class LearnerExporter(Exporter):
     GRADE_FAILING = 'Fail'
     GRADE_INCOMPLETE = 'In Progress'
 
+    # The number of enrollments, per fetch worker, whose LMS data is fetched ahead of exporting them.
+    FETCH_WINDOW_SIZE_PER_WORKER = 10
+
     def __init__(self, user, enterprise_configuration):
         """
         Store the data needed to export the learner data to the integrated channel.
@@ -51,6 +67,11 @@ class LearnerExporter(Exporter):
         self.certificates_api = None
         self.course_api = None
         self.course_enrollment_api = None
+        self._prefetched_lms_data = {}
+        self._course_grades = {}
+        self._bulk_fetch_course_grades = False
+        self._bulk_resolve_remote_ids = False
+        self._remote_ids = None
         super(LearnerExporter, self).__init__(user, enterprise_configuration)
 
     @property
@@ -74,7 +95,7 @@ class LearnerExporter(Exporter):
         """
         return self.GRADE_INCOMPLETE
 
-    def export(self, **kwargs):
+    def export(self, **kwargs):  # pylint: disable=too-many-statements
         """
         Collect learner data for the ``EnterpriseCustomer`` where data sharing consent is granted.
 
@@ -94,6 +115,8 @@ class LearnerExporter(Exporter):
         grade = kwargs.get('grade', None)
         skip_transmitted = kwargs.get('skip_transmitted', True)
         TransmissionAudit = kwargs.get('TransmissionAudit', None)  # pylint: disable=invalid-name
+        transmitted_grades = kwargs.get('transmitted_grades', None)
+        changed_since = kwargs.get('changed_since', None)
         # Fetch the consenting enrollment data, including the enterprise_customer_user.
         # Order by the course_id, to avoid fetching course API data more than we have to.
         LOGGER.info('[Integrated Channel] Starting Export.'
@@ -123,105 +146,397 @@ class LearnerExporter(Exporter):
                             user_id=learner_to_transmit.id))
         enrollment_queryset = enrollment_queryset.order_by('course_id')
 
+        if TransmissionAudit and skip_transmitted and transmitted_grades is None and not exporting_single_learner:
+            # Index the previously sent grades up front, rather than querying for them enrollment by enrollment.
+            transmitted_grades = get_transmitted_grades(TransmissionAudit, self.enterprise_customer)
+
+        if changed_since is not None and not exporting_single_learner:
+            enrollment_queryset = self._filter_changed_enrollments(
+                enrollment_queryset, changed_since, TransmissionAudit, transmitted_grades
+            )
+
+        # Resolve data sharing consent for every enrollment in bulk, rather than with a query (or two) apiece.
+        granted_consents = None if exporting_single_learner else self._get_granted_consents(enrollment_queryset)
+
+        # Enrollments are exported in windows. When the channel configuration allows more than one fetch worker,
+        # the LMS data for every enrollment in a window is fetched concurrently before the window is exported,
+        # in order; otherwise the window holds a single enrollment and the LMS is called inline, as before.
+        fetch_workers = 1 if exporting_single_learner else self.enterprise_configuration.learner_data_fetch_workers
+        executor = ThreadPoolExecutor(max_workers=fetch_workers) if fetch_workers > 1 else None
+        self._bulk_fetch_course_grades = (
+            not exporting_single_learner and self.enterprise_configuration.bulk_fetch_course_grades
+        )
+        self._bulk_resolve_remote_ids = not exporting_single_learner
+        window_size = fetch_workers * self.FETCH_WINDOW_SIZE_PER_WORKER if executor else 1
+
         # Fetch course details from the Course API, and cache between calls.
         course_details = None
-        for enterprise_enrollment in enrollment_queryset:
-
-            if TransmissionAudit and skip_transmitted and \
-                    is_already_transmitted(TransmissionAudit, enterprise_enrollment.id, grade):
-                # We've already sent a completion status for this enrollment
-                LOGGER.info('[Integrated Channel] Skipping export of previously sent enterprise enrollment.'
-                            '  EnterpriseEnrollment: {enterprise_enrollment_id}'.format(
-                                enterprise_enrollment_id=enterprise_enrollment.id))
-                continue
-
-            course_id = enterprise_enrollment.course_id
-
-            # Fetch course details from Courses API
-            # pylint: disable=unsubscriptable-object
-            if course_details is None or course_details['course_id'] != course_id:
-                if self.course_api is None:
-                    self.course_api = CourseApiClient()
-                course_details = self.course_api.get_course_details(course_id)
-
-            if course_details is None:
-                # Course not found, so we have nothing to report.
-                LOGGER.error('[Integrated Channel] Course run details not found.'
-                             ' EnterpriseEnrollment: {enterprise_enrollment_pk}, Course: {course_id}'.format(
-                                 enterprise_enrollment_pk=enterprise_enrollment.pk,
-                                 course_id=course_id))
-                continue
-
-            consent = DataSharingConsent.objects.proxied_get(
-                username=enterprise_enrollment.enterprise_customer_user.username,
-                course_id=enterprise_enrollment.course_id,
-                enterprise_customer=enterprise_enrollment.enterprise_customer_user.enterprise_customer
+        try:
+            for enrollment_window in self._get_enrollment_windows(enrollment_queryset, window_size):
+                exportable_enrollments = []
+                for enterprise_enrollment in enrollment_window:
+
+                    if TransmissionAudit and skip_transmitted and is_already_transmitted(
+                            TransmissionAudit, enterprise_enrollment.id, grade, transmitted_grades
+                    ):
+                        # We've already sent a completion status for this enrollment
+                        LOGGER.info('[Integrated Channel] Skipping export of previously sent enterprise enrollment.'
+                                    '  EnterpriseEnrollment: {enterprise_enrollment_id}'.format(
+                                        enterprise_enrollment_id=enterprise_enrollment.id))
+                        continue
+
+                    course_id = enterprise_enrollment.course_id
+
+                    # Fetch course details from Courses API
+                    # pylint: disable=unsubscriptable-object
+                    if course_details is None or course_details['course_id'] != course_id:
+                        if self.course_api is None:
+                            self.course_api = CourseApiClient()
+                        course_details = self.course_api.get_course_details(course_id)
+
+                    if course_details is None:
+                        # Course not found, so we have nothing to report.
+                        LOGGER.error('[Integrated Channel] Course run details not found.'
+                                     ' EnterpriseEnrollment: {enterprise_enrollment_pk}, Course: {course_id}'.format(
+                                         enterprise_enrollment_pk=enterprise_enrollment.pk,
+                                         course_id=course_id))
+                        continue
+
+                    if granted_consents is not None and enterprise_enrollment.id in granted_consents:
+                        consent_granted = granted_consents[enterprise_enrollment.id]
+                    else:
+                        consent_granted = DataSharingConsent.objects.proxied_get(
+                            username=enterprise_enrollment.enterprise_customer_user.username,
+                            course_id=enterprise_enrollment.course_id,
+                            enterprise_customer=enterprise_enrollment.enterprise_customer_user.enterprise_customer
+                        ).granted
+
+                    if not consent_granted:
+                        continue
+
+                    exportable_enrollments.append((enterprise_enrollment, course_details))
+
+                pending_lms_data = self._prefetch_lms_data(executor, exportable_enrollments)
+
+                for (enterprise_enrollment, enrollment_course_details), lms_data in zip(
+                        exportable_enrollments, pending_lms_data
+                ):
+                    if lms_data is not None:
+                        self._prefetched_lms_data = lms_data.result()
+
+                    course_id = enterprise_enrollment.course_id
+
+                    if self._audit_reporting_disabled(enterprise_enrollment):
+                        continue
+
+                    # For instructor-paced courses, let the certificate determine course completion
+                    if enrollment_course_details.get('pacing') == 'instructor':
+                        completed_date_from_api, grade_from_api, is_passing_from_api = \
+                            self._collect_certificate_data(enterprise_enrollment)
+                        LOGGER.info('[Integrated Channel] Received data from certificate api.'
+                                    '  CompletedDate: {completed_date}, Course: {course_id}, Enterprise: {enterprise},'
+                                    ' Grade: {grade}, IsPassing: {is_passing}, User: {user_id}'.format(
+                                        completed_date=completed_date_from_api,
+                                        grade=grade_from_api,
+                                        is_passing=is_passing_from_api,
+                                        course_id=course_id,
+                                        user_id=enterprise_enrollment.enterprise_customer_user.user_id,
+                                        enterprise=(
+                                            enterprise_enrollment.enterprise_customer_user.enterprise_customer.slug
+                                        )))
+                    # For self-paced courses, check the Grades API
+                    else:
+                        completed_date_from_api, grade_from_api, is_passing_from_api = \
+                            self._collect_grades_data(enterprise_enrollment, enrollment_course_details)
+                        LOGGER.info('[Integrated Channel] Received data from grades api.'
+                                    '  CompletedDate: {completed_date}, Course: {course_id}, Enterprise: {enterprise},'
+                                    ' Grade: {grade}, IsPassing: {is_passing}, User: {user_id}'.format(
+                                        completed_date=completed_date_from_api,
+                                        grade=grade_from_api,
+                                        is_passing=is_passing_from_api,
+                                        course_id=course_id,
+                                        user_id=enterprise_enrollment.enterprise_customer_user.user_id,
+                                        enterprise=(
+                                            enterprise_enrollment.enterprise_customer_user.enterprise_customer.slug
+                                        )))
+                    if exporting_single_learner and (grade != grade_from_api or is_passing != is_passing_from_api):
+                        enterprise_user = enterprise_enrollment.enterprise_customer_user
+                        LOGGER.error('[Integrated Channel] Attempt to transmit conflicting data. '
+                                     ' Course: {course_id}, Enterprise: {enterprise},'
+                                     ' EnrollmentId: {enrollment_id},'
+                                     ' Grade: {grade}, GradeAPI: {grade_api}, IsPassing: {is_passing},'
+                                     ' IsPassingAPI: {is_passing_api}, User: {user_id}'.format(
+                                         grade=grade,
+                                         is_passing=is_passing,
+                                         grade_api=grade_from_api,
+                                         is_passing_api=is_passing_from_api,
+                                         course_id=course_id,
+                                         enrollment_id=enterprise_enrollment.id,
+                                         user_id=enterprise_user.user_id,
+                                         enterprise=enterprise_user.enterprise_customer.slug))
+                    # Apply the Single Source of Truth for Grades
+                    grade = grade_from_api
+                    completed_date = completed_date_from_api
+                    is_passing = is_passing_from_api
+                    records = self.get_learner_data_records(
+                        enterprise_enrollment=enterprise_enrollment,
+                        completed_date=completed_date,
+                        grade=grade,
+                        is_passing=is_passing,
+                    )
+
+                    if records:
+                        # There are some cases where we won't receive a record from the above
+                        # method; right now, that should only happen if we have an Enterprise-linked
+                        # user for the integrated channel, and transmission of that user's
+                        # data requires an upstream user identifier that we don't have (due to a
+                        # failure of SSO or similar). In such a case, `get_learner_data_record`
+                        # would return None, and we'd simply skip yielding it here.
+                        for record in records:
+                            yield record
+        finally:
+            self._prefetched_lms_data = {}
+            self._course_grades = {}
+            self._remote_ids = None
+            if executor is not None:
+                executor.shutdown()
+
+    def _filter_changed_enrollments(self, enrollment_queryset, changed_since, TransmissionAudit, transmitted_grades):
+        # pylint: disable=invalid-name
+        """
+        Narrow the queryset down to the enrollments whose enrollment, grade or certificate changed since the given time.
+
+        Enrollments whose last transmission failed are kept as well, so that they are retried. The LMS models are
+        needed to tell which grades and certificates changed; without them, the queryset is returned as is.
+        """
+        if PersistentCourseGrade is None:
+            LOGGER.warning('[Integrated Channel] The LMS grade and certificate models are not available;'
+                           ' exporting every enrollment instead of those changed since {changed_since}.'
+                           ' Enterprise: {enterprise_slug}'.format(
+                               changed_since=changed_since,
+                               enterprise_slug=self.enterprise_customer.slug))
+            return enrollment_queryset
+
+        learner_ids = enrollment_queryset.order_by().values('enterprise_customer_user__user_id')
+        changed_learner_courses = set(PersistentCourseGrade.objects.filter(
+            user_id__in=learner_ids,
+            modified__gte=changed_since,
+        ).values_list('user_id', 'course_id'))
+        changed_learner_courses.update(GeneratedCertificate.objects.filter(
+            user_id__in=learner_ids,
+            modified_date__gte=changed_since,
+        ).values_list('user_id', 'course_id'))
+        changed_learner_courses.update(CourseEnrollment.history.filter(
+            user_id__in=learner_ids,
+            history_date__gte=changed_since,
+        ).values_list('user_id', 'course_id'))
+        changed_learner_courses = {(user_id, str(course_id)) for user_id, course_id in changed_learner_courses}
+
+        changed_enrollment_ids = set(
+            enrollment_queryset.filter(modified__gte=changed_since).values_list('id', flat=True)
+        )
+        for enrollment_id, user_id, course_id in enrollment_queryset.values_list(
+                'id', 'enterprise_customer_user__user_id', 'course_id'
+        ):
+            if (user_id, course_id) in changed_learner_courses:
+                changed_enrollment_ids.add(enrollment_id)
+
+        if TransmissionAudit:
+            failed_enrollment_ids = set(TransmissionAudit.objects.filter(
+                enterprise_course_enrollment_id__in=enrollment_queryset.order_by().values('id'),
+            ).exclude(
+                error_message='',
+            ).exclude(
+                error_message__isnull=True,
+            ).values_list('enterprise_course_enrollment_id', flat=True))
+            changed_enrollment_ids.update(failed_enrollment_ids.difference(transmitted_grades or {}))
+
+        LOGGER.info('[Integrated Channel] Exporting enrollments changed since {changed_since}.'
+                    ' Enrollments: {enrollment_count}, Enterprise: {enterprise_slug}'.format(
+                        changed_since=changed_since,
+                        enrollment_count=len(changed_enrollment_ids),
+                        enterprise_slug=self.enterprise_customer.slug))
+        return enrollment_queryset.filter(id__in=changed_enrollment_ids)
+
+    def _get_granted_consents(self, enrollment_queryset):
+        """
+        Resolve whether data sharing consent is granted for each of the enrollments in the given queryset.
+
+        Returns:
+            dict: ``{enterprise_course_enrollment_id: granted}``
+        """
+        enrollments = enrollment_queryset.values_list('id', 'enterprise_customer_user__user_id', 'course_id')
+        usernames = dict(User.objects.filter(
+            pk__in=enrollment_queryset.order_by().values('enterprise_customer_user__user_id')
+        ).values_list('id', 'username'))
+        username_course_pairs = {
+            enrollment_id: (usernames.get(user_id), course_id) for enrollment_id, user_id, course_id in enrollments
+        }
+        consents = DataSharingConsent.objects.bulk_granted(
+            self.enterprise_customer, username_course_pairs.values()
+        )
+        return {enrollment_id: consents[pair] for enrollment_id, pair in username_course_pairs.items()}
+
+    @staticmethod
+    def _get_enrollment_windows(enrollment_queryset, window_size):
+        """
+        Yield successive lists of at most ``window_size`` enrollments from the given queryset.
+        """
+        enrollments = iter(enrollment_queryset)
+        enrollment_window = list(islice(enrollments, window_size))
+        while enrollment_window:
+            yield enrollment_window
+            enrollment_window = list(islice(enrollments, window_size))
+
+    def _prefetch_lms_data(self, executor, exportable_enrollments):
+        """
+        Start fetching the LMS data needed to export each of the given enrollments on the executor's worker threads.
+
+        Arguments:
+            executor (ThreadPoolExecutor): the worker pool to fetch on; None when fetching inline.
+            exportable_enrollments (list): (EnterpriseCourseEnrollment, course details) tuples.
+
+        Returns:
+            list: a Future per enrollment, which resolves to the prefetched LMS data for that enrollment,
+            or a list of None if no executor is given.
+        """
+        if executor is None:
+            return [None] * len(exportable_enrollments)
+
+        check_enrollment_mode = not self.enterprise_customer.enables_audit_data_reporting
+        pacings = {course_details.get('pacing') == 'instructor' for __, course_details in exportable_enrollments}
+
+        # The API clients the window needs are built here, on the calling thread, since building them may hit the
+        # database. Their expired JWTs are renewed here too, for the same reason; the worker threads never renew them.
+        api_clients = []
+        if check_enrollment_mode:
+            if self.course_enrollment_api is None:
+                self.course_enrollment_api = EnrollmentApiClient()
+            api_clients.append(self.course_enrollment_api)
+        if True in pacings:
+            if self.certificates_api is None:
+                self.certificates_api = CertificatesApiClient(self.user)
+            api_clients.append(self.certificates_api)
+        if False in pacings and not self._bulk_fetch_course_grades:
+            if self.grades_api is None:
+                self.grades_api = GradesApiClient(self.user)
+            api_clients.append(self.grades_api)
+        for api_client in api_clients:
+            if api_client.token_expired():
+                api_client.connect()
+
+        return [
+            executor.submit(
+                self._fetch_lms_data,
+                enterprise_enrollment.course_id,
+                enterprise_enrollment.enterprise_customer_user.username,
+                course_details.get('pacing') == 'instructor',
+                check_enrollment_mode,
             )
+            for enterprise_enrollment, course_details in exportable_enrollments
+        ]
 
-            if not consent.granted or enterprise_enrollment.audit_reporting_disabled:
-                continue
-
-            # For instructor-paced courses, let the certificate determine course completion
-            if course_details.get('pacing') == 'instructor':
-                completed_date_from_api, grade_from_api, is_passing_from_api = \
-                    self._collect_certificate_data(enterprise_enrollment)
-                LOGGER.info('[Integrated Channel] Received data from certificate api.'
-                            '  CompletedDate: {completed_date}, Course: {course_id}, Enterprise: {enterprise},'
-                            ' Grade: {grade}, IsPassing: {is_passing}, User: {user_id}'.format(
-                                completed_date=completed_date_from_api,
-                                grade=grade_from_api,
-                                is_passing=is_passing_from_api,
-                                course_id=course_id,
-                                user_id=enterprise_enrollment.enterprise_customer_user.user_id,
-                                enterprise=enterprise_enrollment.enterprise_customer_user.enterprise_customer.slug))
-            # For self-paced courses, check the Grades API
-            else:
-                completed_date_from_api, grade_from_api, is_passing_from_api = \
-                    self._collect_grades_data(enterprise_enrollment, course_details)
-                LOGGER.info('[Integrated Channel] Received data from grades api.'
-                            '  CompletedDate: {completed_date}, Course: {course_id}, Enterprise: {enterprise},'
-                            ' Grade: {grade}, IsPassing: {is_passing}, User: {user_id}'.format(
-                                completed_date=completed_date_from_api,
-                                grade=grade_from_api,
-                                is_passing=is_passing_from_api,
-                                course_id=course_id,
-                                user_id=enterprise_enrollment.enterprise_customer_user.user_id,
-                                enterprise=enterprise_enrollment.enterprise_customer_user.enterprise_customer.slug))
-            if exporting_single_learner and (grade != grade_from_api or is_passing != is_passing_from_api):
-                enterprise_user = enterprise_enrollment.enterprise_customer_user
-                LOGGER.error('[Integrated Channel] Attempt to transmit conflicting data. '
-                             ' Course: {course_id}, Enterprise: {enterprise},'
-                             ' EnrollmentId: {enrollment_id},'
-                             ' Grade: {grade}, GradeAPI: {grade_api}, IsPassing: {is_passing},'
-                             ' IsPassingAPI: {is_passing_api}, User: {user_id}'.format(
-                                 grade=grade,
-                                 is_passing=is_passing,
-                                 grade_api=grade_from_api,
-                                 is_passing_api=is_passing_from_api,
-                                 course_id=course_id,
-                                 enrollment_id=enterprise_enrollment.id,
-                                 user_id=enterprise_user.user_id,
-                                 enterprise=enterprise_user.enterprise_customer.slug))
-            # Apply the Single Source of Truth for Grades
-            grade = grade_from_api
-            completed_date = completed_date_from_api
-            is_passing = is_passing_from_api
-            records = self.get_learner_data_records(
-                enterprise_enrollment=enterprise_enrollment,
-                completed_date=completed_date,
-                grade=grade,
-                is_passing=is_passing,
+    def _fetch_lms_data(self, course_id, username, instructor_paced, check_enrollment_mode):
+        """
+        Fetch the LMS data needed to export a single enrollment; runs on a worker thread.
+
+        This must not touch the database, so it only calls the LMS APIs, using clients built and connected ahead of
+        time, and bypasses their JWT renewal.
+
+        Returns:
+            dict: the ``(response, error)`` of each LMS request made, keyed by ``(request name, course ID, username)``.
+        """
+        lms_data = {}
+
+        def fetch(request_name, api_method, *args):
+            """
+            Call the given API method, and store its response or the error it raised.
+            """
+            try:
+                response = (self._without_token_refresh(api_method)(*args), None)
+            except Exception as exc:  # pylint: disable=broad-except
+                response = (None, exc)
+            lms_data[(request_name, course_id, username)] = response
+            return response
+
+        if check_enrollment_mode:
+            course_enrollment, error = fetch(
+                'course_enrollment', self.course_enrollment_api.get_course_enrollment, username, course_id
             )
+            if error is None and EnterpriseCourseEnrollment.is_audit_course_enrollment(course_enrollment):
+                # Audit enrollments aren't reported on, so there's no need to fetch their completion data.
+                return lms_data
+
+        if instructor_paced:
+            fetch('certificate', self.certificates_api.get_course_certificate, course_id, username)
+        elif not self._bulk_fetch_course_grades:
+            # Grades fetched in bulk are fetched once per course run, on the calling thread.
+            fetch('grade', self.grades_api.get_course_grade, course_id, username)
+        return lms_data
+
+    @staticmethod
+    def _without_token_refresh(api_method):
+        """
+        Return the given API client method without the JWT renewal added by ``JwtLmsApiClient.refresh_token``.
+        """
+        wrapped = getattr(api_method, '__wrapped__', None)
+        api_client = getattr(api_method, '__self__', None)
+        if wrapped is None or api_client is None:
+            return api_method
+        return partial(wrapped, api_client)
+
+    def _get_lms_data(self, request_name, course_id, username, fetch):
+        """
+        Return the response to an LMS request for the given course and learner.
 
-            if records:
-                # There are some cases where we won't receive a record from the above
-                # method; right now, that should only happen if we have an Enterprise-linked
-                # user for the integrated channel, and transmission of that user's
-                # data requires an upstream user identifier that we don't have (due to a
-                # failure of SSO or similar). In such a case, `get_learner_data_record`
-                # would return None, and we'd simply skip yielding it here.
-                for record in records:
-                    yield record
+        The response prefetched on a worker thread is used if there is one, re-raising any error it hit;
+        otherwise the request is made inline by calling ``fetch``.
+        """
+        prefetched = self._prefetched_lms_data.pop((request_name, course_id, username), None)
+        if prefetched is None:
+            return fetch()
+        response, error = prefetched
+        if error is not None:
+            raise error
+        return response
+
+    def _audit_reporting_disabled(self, enterprise_enrollment):
+        """
+        Return whether audit track data reporting is disabled for the given enrollment.
+
+        Uses the prefetched course enrollment if there is one, falling back to
+        ``EnterpriseCourseEnrollment.audit_reporting_disabled`` otherwise.
+        """
+        request_key = (
+            'course_enrollment',
+            enterprise_enrollment.course_id,
+            enterprise_enrollment.enterprise_customer_user.username,
+        )
+        if request_key not in self._prefetched_lms_data:
+            return enterprise_enrollment.audit_reporting_disabled
+
+        course_enrollment = self._get_lms_data(*request_key, fetch=None)
+        return bool(EnterpriseCourseEnrollment.is_audit_course_enrollment(course_enrollment))
+
+    def get_remote_id(self, enterprise_customer_user):
+        """
+        Return the SSO provider's identifier for the given learner, or None if there is none.
+
+        While exporting the data of more than one learner, the identifiers of all of the EnterpriseCustomer's
+        active learners are retrieved in bulk the first time one is needed, and kept until the export is done.
+        """
+        if not self._bulk_resolve_remote_ids:
+            return enterprise_customer_user.get_remote_id()
+
+        if self._remote_ids is None:
+            usernames = User.objects.filter(
+                pk__in=EnterpriseCustomerUser.objects.filter(
+                    enterprise_customer=self.enterprise_customer,
+                    active=True,
+                ).values('user_id')
+            ).values_list('username', flat=True)
+            self._remote_ids = self.enterprise_customer.get_remote_ids(usernames)
+        return self._remote_ids.get(enterprise_customer_user.username)
 
     def get_learner_data_records(self, enterprise_enrollment, completed_date=None, grade=None, is_passing=False):
         """
@@ -271,7 +586,12 @@ class LearnerExporter(Exporter):
         username = enterprise_enrollment.enterprise_customer_user.user.username
 
         try:
-            certificate = self.certificates_api.get_course_certificate(course_id, username)
+            certificate = self._get_lms_data(
+                'certificate',
+                course_id,
+                username,
+                fetch=lambda: self.certificates_api.get_course_certificate(course_id, username),
+            )
             completed_date = certificate.get('created_date')
             if completed_date:
                 completed_date = parse_datetime(completed_date)
@@ -295,6 +615,30 @@ class LearnerExporter(Exporter):
 
         return completed_date, grade, is_passing
 
+    def _get_course_grade(self, course_id, username):
+        """
+        Return the grade of the given learner in the given course run from the Grades API.
+
+        If the channel configuration fetches course grades in bulk, and more than a single learner is being exported,
+        the grades of every learner in the course run are fetched with one paginated sweep, and kept by username for
+        the rest of the course run's enrollments. Since enrollments are exported ordered by course run, only the
+        current course run's grades are kept.
+
+        Raises:
+            HttpNotFoundError if no grade is found for the learner in the course run.
+        """
+        if not self._bulk_fetch_course_grades:
+            return self.grades_api.get_course_grade(course_id, username)
+
+        if course_id not in self._course_grades:
+            self._course_grades = {
+                course_id: {grade['username']: grade for grade in self.grades_api.get_course_grades(course_id)}
+            }
+        try:
+            return self._course_grades[course_id][username]
+        except KeyError:
+            raise HttpNotFoundError('No grade record found for course={}, username={}'.format(course_id, username))
+
     def _collect_grades_data(self, enterprise_enrollment, course_details):
         """
         Collect the learner completion data from the Grades API.
@@ -318,7 +662,12 @@ class LearnerExporter(Exporter):
         username = enterprise_enrollment.enterprise_customer_user.user.username
 
         try:
-            grades_data = self.grades_api.get_course_grade(course_id, username)
+            grades_data = self._get_lms_data(
+                'grade',
+                course_id,
+                username,
+                fetch=lambda: self._get_course_grade(course_id, username),
+            )
 
         except HttpNotFoundError as error:
             # Grade not found, so we have nothing to report.
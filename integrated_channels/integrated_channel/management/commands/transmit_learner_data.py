@@ -27,7 +27,7 @@ class Command(IntegratedChannelCommandMixin, BaseCommand):
 
     def add_arguments(self, parser):
         """
-        Add required --api_user argument to the parser.
+        Add required --api_user and optional --incremental arguments to the parser.
         """
         parser.add_argument(
             '--api_user',
@@ -36,6 +36,14 @@ class Command(IntegratedChannelCommandMixin, BaseCommand):
             metavar='LMS_API_USERNAME',
             help=_('Username of a user authorized to fetch grades from the LMS API.'),
         )
+        parser.add_argument(
+            '--incremental',
+            dest='incremental',
+            action='store_true',
+            default=False,
+            help=_('Only consider the enrollments whose enrollment, grade or certificate changed since the last '
+                   'successful transmission, instead of every enrollment.'),
+        )
         super(Command, self).add_arguments(parser)
 
     def handle(self, *args, **options):
@@ -51,4 +59,9 @@ class Command(IntegratedChannelCommandMixin, BaseCommand):
 
         # Transmit the learner data to each integrated channel
         for integrated_channel in self.get_integrated_channels(options):
-            transmit_learner_data.delay(api_username, integrated_channel.channel_code(), integrated_channel.pk)
+            transmit_learner_data.delay(
+                api_username,
+                integrated_channel.channel_code(),
+                integrated_channel.pk,
+                incremental=options['incremental'],
+            )
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-18 21:57
+
+import hashlib
+import json
+
+from jsonfield.encoder import JSONEncoder
+
+from django.db import migrations, models
+
+
+def get_content_metadata_hash(channel_metadata):
+    """Return the SHA-256 hex digest of the canonical JSON form of the given channel metadata."""
+    # A copy of integrated_channels.utils.get_content_metadata_hash, as it was when this migration was written.
+    canonical_json = json.dumps(channel_metadata, cls=JSONEncoder, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+
+
+def populate_content_hashes(apps, schema_editor):
+    """Store the content hash of every previously transmitted content metadata item."""
+    ContentMetadataItemTransmission = apps.get_model('integrated_channel', 'ContentMetadataItemTransmission')
+    transmissions = ContentMetadataItemTransmission.objects.filter(content_hash='').only('id', 'channel_metadata')
+    for transmission in transmissions.iterator():
+        ContentMetadataItemTransmission.objects.filter(pk=transmission.pk).update(
+            content_hash=get_content_metadata_hash(transmission.channel_metadata)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrated_channel', '0007_auto_20190925_0730'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contentmetadataitemtransmission',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 hash of the canonical JSON form of the transmitted channel metadata.', max_length=64),
+        ),
+        migrations.RunPython(populate_content_hashes, migrations.RunPython.noop),
+    ]
@@ -13,6 +13,7 @@ from jsonfield.fields import JSONField
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 
@@ -23,7 +24,7 @@ from integrated_channels.integrated_channel.exporters.content_metadata import Co
 from integrated_channels.integrated_channel.exporters.learner_data import LearnerExporter
 from integrated_channels.integrated_channel.transmitters.content_metadata import ContentMetadataTransmitter
 from integrated_channels.integrated_channel.transmitters.learner_data import LearnerTransmitter
-from integrated_channels.utils import convert_comma_separated_string_to_list
+from integrated_channels.utils import convert_comma_separated_string_to_list, get_content_metadata_hash
 
 LOGGER = logging.getLogger(__name__)
 
@@ -58,6 +59,38 @@ class EnterpriseCustomerPluginConfiguration(TimeStampedModel):
         help_text=_("The maximum number of data items to transmit to the integrated channel with each request.")
     )
 
+    learner_data_fetch_workers = models.PositiveIntegerField(
+        default=1,
+        help_text=_("The number of enrollments whose grade and certificate data is fetched from the LMS in parallel "
+                    "while exporting learner data. A value of 1 fetches the data one enrollment at a time.")
+    )
+
+    bulk_fetch_course_grades = models.BooleanField(
+        default=False,
+        help_text=_("Fetch the grades of every learner in a course run with one paginated sweep of the Grades API, "
+                    "instead of one request per learner. Best suited to course runs where most learners belong to "
+                    "the enterprise customer.")
+    )
+
+    metadata_transmission_workers = models.PositiveIntegerField(
+        default=1,
+        help_text=_("The number of content metadata chunks sent to the integrated channel at the same time, up to "
+                    "the channel's own limit. A value of 1 sends the chunks one after another.")
+    )
+
+    stream_content_metadata = models.BooleanField(
+        default=False,
+        help_text=_("Export and transmit content metadata one page of catalog results at a time, instead of loading "
+                    "every catalog into memory first. Best suited to customers with large catalogs.")
+    )
+
+    learner_data_high_water_mark = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text=_("When the last successful learner data transmission started. Incremental transmissions only "
+                    "consider the enrollments whose enrollment, grade or certificate changed since then.")
+    )
+
     channel_worker_username = models.CharField(
         max_length=255,
         blank=True,
@@ -141,13 +174,23 @@ class EnterpriseCustomerPluginConfiguration(TimeStampedModel):
         """
         return ContentMetadataTransmitter(self)
 
-    def transmit_learner_data(self, user):
+    def transmit_learner_data(self, user, incremental=False):
         """
         Iterate over each learner data record and transmit it to the integrated channel.
+
+        An incremental transmission only considers the enrollments which changed since the last successful
+        transmission started; the first transmission, and any non-incremental one, considers every enrollment.
         """
         exporter = self.get_learner_data_exporter(user)
         transmitter = self.get_learner_data_transmitter()
-        transmitter.transmit(exporter)
+        transmission_start = timezone.now()
+        if incremental and self.learner_data_high_water_mark:
+            transmitter.transmit(exporter, changed_since=self.learner_data_high_water_mark)
+        else:
+            transmitter.transmit(exporter)
+        # Only move the mark forward, without overwriting any configuration changed during the transmission.
+        self.learner_data_high_water_mark = transmission_start
+        self.__class__.objects.filter(pk=self.pk).update(learner_data_high_water_mark=transmission_start)
 
     def transmit_single_learner_data(self, **kwargs):
         """
@@ -163,7 +206,10 @@ class EnterpriseCustomerPluginConfiguration(TimeStampedModel):
         """
         exporter = self.get_content_metadata_exporter(user)
         transmitter = self.get_content_metadata_transmitter()
-        transmitter.transmit(exporter.export())
+        if self.stream_content_metadata:
+            transmitter.transmit_pages(exporter.export_pages())
+        else:
+            transmitter.transmit(exporter.export())
 
 
 @python_2_unicode_compatible
@@ -252,6 +298,12 @@ class ContentMetadataItemTransmission(TimeStampedModel):
     integrated_channel_code = models.CharField(max_length=30)
     content_id = models.CharField(max_length=255)
     channel_metadata = JSONField()
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text=_("SHA-256 hash of the canonical JSON form of the transmitted channel metadata."),
+    )
 
     class Meta:
         unique_together = ('enterprise_customer', 'integrated_channel_code', 'content_id')
@@ -273,3 +325,11 @@ class ContentMetadataItemTransmission(TimeStampedModel):
         Return uniquely identifying string representation.
         """
         return self.__str__()
+
+    def save(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        """
+        Keep the content hash in step with the channel metadata whenever the metadata is saved.
+        """
+        if 'channel_metadata' not in self.get_deferred_fields():
+            self.content_hash = get_content_metadata_hash(self.channel_metadata)
+        super(ContentMetadataItemTransmission, self).save(*args, **kwargs)
@@ -57,7 +57,7 @@ def transmit_content_metadata(username, channel_code, channel_pk):
 
 
 @shared_task
-def transmit_learner_data(username, channel_code, channel_pk):
+def transmit_learner_data(username, channel_code, channel_pk, incremental=False):
     """
     Task to send learner data to each linked integrated channel.
 
@@ -65,6 +65,8 @@ def transmit_learner_data(username, channel_code, channel_pk):
         username (str): The username of the User to be used for making API requests for learner data.
         channel_code (str): Capitalized identifier for the integrated channel
         channel_pk (str): Primary key for identifying integrated channel
+        incremental (bool): Whether to only consider the enrollments changed since the last successful
+            transmission, instead of every enrollment
 
     """
     start = time.time()
@@ -75,7 +77,7 @@ def transmit_learner_data(username, channel_code, channel_pk):
 
     # Note: learner data transmission code paths don't raise any uncaught exception, so we don't need a broad
     # try-except block here.
-    integrated_channel.transmit_learner_data(api_user)
+    integrated_channel.transmit_learner_data(api_user, incremental=incremental)
 
     duration = time.time() - start
     LOGGER.info(
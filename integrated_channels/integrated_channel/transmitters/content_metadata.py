@@ -7,15 +7,20 @@ from __future__ import absolute_import, unicode_literals
 
 import json
 import logging
-
-from jsondiff import diff
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 
 from django.apps import apps
+from django.db import transaction
+from django.utils import timezone
 
 from integrated_channels.exceptions import ClientError
 from integrated_channels.integrated_channel.client import IntegratedChannelApiClient
 from integrated_channels.integrated_channel.transmitters import Transmitter
-from integrated_channels.utils import chunks
+from integrated_channels.utils import chunks, get_content_metadata_hash
 
 LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +30,11 @@ class ContentMetadataTransmitter(Transmitter):
     Used to transmit content metadata to an integrated channel.
     """
 
+    # The channel's limits for parallel transmission: the most chunks that may be sent at once, and the least
+    # number of seconds between starting to send two chunks. Subclasses lower these to suit their channel's API.
+    MAX_CONCURRENT_CHUNKS = 4
+    MIN_CHUNK_INTERVAL = 0
+
     def __init__(self, enterprise_configuration, client=IntegratedChannelApiClient):
         """
         By default, use the abstract integrated channel API client which raises an error when used if not subclassed.
@@ -33,12 +43,71 @@ class ContentMetadataTransmitter(Transmitter):
             enterprise_configuration=enterprise_configuration,
             client=client
         )
+        self._executor = None
+        self._rate_limit_lock = threading.Lock()
+        self._next_chunk_start = 0
 
     def transmit(self, payload, **kwargs):
         """
         Transmit content metadata items to the integrated channel.
         """
         items_to_create, items_to_update, items_to_delete, transmission_map = self._partition_items(payload)
+        with self._transmission_workers():
+            self._transmit_items(items_to_create, items_to_update, items_to_delete, transmission_map)
+
+    def transmit_pages(self, payload_pages):
+        """
+        Transmit content metadata items to the integrated channel, one page of exported items at a time.
+
+        Rather than the previously transmitted items, only their content hashes are held in memory. The items of
+        each page are created and updated as the page arrives, and the items which were not exported on any page
+        are deleted once every page has been transmitted.
+        """
+        content_hashes = dict(self._get_transmissions().values_list('content_id', 'content_hash'))
+        exported_content_ids = set()
+        with self._transmission_workers():
+            for channel_metadata_item_map in payload_pages:
+                exported_content_ids.update(channel_metadata_item_map.keys())
+                items_to_create, items_to_update = self._compare_items(channel_metadata_item_map, content_hashes)
+                transmission_map = {
+                    transmission.content_id: transmission
+                    for transmission in self._get_transmissions().filter(
+                        content_id__in=list(items_to_update.keys()),
+                    ).defer('channel_metadata')
+                } if items_to_update else {}
+                self._log_partition(items_to_create, items_to_update, {})
+                self._transmit_items(items_to_create, items_to_update, {}, transmission_map)
+
+            items_to_delete = self._get_items_to_delete(
+                [content_id for content_id in content_hashes if content_id not in exported_content_ids]
+            )
+            self._log_partition({}, {}, items_to_delete)
+            self._transmit_items({}, {}, items_to_delete, {})
+
+    @contextmanager
+    def _transmission_workers(self):
+        """
+        Start the worker threads which send chunks in parallel, if the configuration opts into it.
+        """
+        # When the configuration opts into parallel transmission, the chunks of each step are sent concurrently,
+        # but every step still finishes before the next one starts.
+        workers = min(
+            self.enterprise_configuration.metadata_transmission_workers,
+            self.MAX_CONCURRENT_CHUNKS,
+        )
+        if workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            yield
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _transmit_items(self, items_to_create, items_to_update, items_to_delete, transmission_map):
+        """
+        Transmit the creation, update and deletion of the given content metadata items to the integrated channel.
+        """
         self._transmit_delete(items_to_delete)
         self._transmit_create(items_to_create)
         self._transmit_update(items_to_update, transmission_map)
@@ -48,32 +117,61 @@ class ContentMetadataTransmitter(Transmitter):
         Return items that need to be created, updated, and deleted along with the
         current ContentMetadataItemTransmissions.
         """
-        items_to_create = {}
-        items_to_update = {}
-        items_to_delete = {}
         transmission_map = {}
         export_content_ids = channel_metadata_item_map.keys()
 
-        # Get the items that were previously transmitted to the integrated channel.
+        # Get the items that were previously transmitted to the integrated channel. Their content hashes are
+        # enough to tell which items changed, so their metadata is only loaded for the items to delete.
         # If we are not transmitting something that was previously transmitted,
         # we need to delete it from the integrated channel.
-        for transmission in self._get_transmissions():
+        for transmission in self._get_transmissions().defer('channel_metadata'):
             transmission_map[transmission.content_id] = transmission
-            if transmission.content_id not in export_content_ids:
-                items_to_delete[transmission.content_id] = transmission.channel_metadata
+        items_to_delete = self._get_items_to_delete(
+            [content_id for content_id in transmission_map if content_id not in export_content_ids]
+        )
 
         # Compare what is currently being transmitted to what was transmitted
         # previously, identifying items that need to be created or updated.
+        items_to_create, items_to_update = self._compare_items(
+            channel_metadata_item_map,
+            {content_id: transmission.content_hash for content_id, transmission in transmission_map.items()},
+        )
+
+        self._log_partition(items_to_create, items_to_update, items_to_delete)
+        return items_to_create, items_to_update, items_to_delete, transmission_map
+
+    @staticmethod
+    def _compare_items(channel_metadata_item_map, content_hashes):
+        """
+        Return the items that need to be created and updated, given the content hashes of the transmitted items.
+        """
+        items_to_create = {}
+        items_to_update = {}
         for item in channel_metadata_item_map.values():
             content_id = item.content_id
             channel_metadata = item.channel_metadata
-            transmitted_item = transmission_map.get(content_id, None)
-            if transmitted_item is not None:
-                if diff(channel_metadata, transmitted_item.channel_metadata):
+            content_hash = content_hashes.get(content_id, None)
+            if content_hash is not None:
+                if get_content_metadata_hash(channel_metadata) != content_hash:
                     items_to_update[content_id] = channel_metadata
             else:
                 items_to_create[content_id] = channel_metadata
+        return items_to_create, items_to_update
+
+    def _get_items_to_delete(self, content_ids):
+        """
+        Return the previously transmitted metadata of the given content metadata items, keyed by content id.
+        """
+        if not content_ids:
+            return {}
+        return dict(self._get_transmissions().filter(
+            content_id__in=content_ids,
+        ).values_list('content_id', 'channel_metadata'))
 
+    def _log_partition(self, items_to_create, items_to_update, items_to_delete):
+        """
+        Log the content metadata items which are about to be created, updated and deleted.
+        """
         LOGGER.info(
             'Preparing to transmit creation of [%s] content metadata items with plugin configuration [%s]: [%s]',
             len(items_to_create),
@@ -93,8 +191,6 @@ class ContentMetadataTransmitter(Transmitter):
             list(items_to_delete.keys()),
         )
 
-        return items_to_create, items_to_update, items_to_delete, transmission_map
-
     def _prepare_items_for_transmission(self, channel_metadata_items):
         """
         Perform any necessary modifications to content metadata item
@@ -117,10 +213,9 @@ class ContentMetadataTransmitter(Transmitter):
         """
         Transmit content metadata creation to integrated channel.
         """
-        for chunk in chunks(channel_metadata_item_map, self.enterprise_configuration.transmission_chunk_size):
-            serialized_chunk = self._serialize_items(list(chunk.values()))
+        for chunk, send_chunk in self._send_chunks(channel_metadata_item_map, self.client.create_content_metadata):
             try:
-                self.client.create_content_metadata(serialized_chunk)
+                send_chunk()
             except ClientError as exc:
                 LOGGER.error(
                     'Failed to update [%s] content metadata items for integrated channel [%s] [%s]',
@@ -136,10 +231,9 @@ class ContentMetadataTransmitter(Transmitter):
         """
         Transmit content metadata update to integrated channel.
         """
-        for chunk in chunks(channel_metadata_item_map, self.enterprise_configuration.transmission_chunk_size):
-            serialized_chunk = self._serialize_items(list(chunk.values()))
+        for chunk, send_chunk in self._send_chunks(channel_metadata_item_map, self.client.update_content_metadata):
             try:
-                self.client.update_content_metadata(serialized_chunk)
+                send_chunk()
             except ClientError as exc:
                 LOGGER.error(
                     'Failed to update [%s] content metadata items for integrated channel [%s] [%s]',
@@ -155,10 +249,9 @@ class ContentMetadataTransmitter(Transmitter):
         """
         Transmit content metadata deletion to integrated channel.
         """
-        for chunk in chunks(channel_metadata_item_map, self.enterprise_configuration.transmission_chunk_size):
-            serialized_chunk = self._serialize_items(list(chunk.values()))
+        for chunk, send_chunk in self._send_chunks(channel_metadata_item_map, self.client.delete_content_metadata):
             try:
-                self.client.delete_content_metadata(serialized_chunk)
+                send_chunk()
             except ClientError as exc:
                 LOGGER.error(
                     'Failed to delete [%s] content metadata items for integrated channel [%s] [%s]',
@@ -170,6 +263,41 @@ class ContentMetadataTransmitter(Transmitter):
             else:
                 self._delete_transmissions(chunk.keys())
 
+    def _send_chunks(self, channel_metadata_item_map, send):
+        """
+        Split the given content metadata items into chunks, and prepare to send each one with the given client method.
+
+        Yields each chunk, in order, along with a callable which returns once the chunk is sent, raising the client's
+        error if sending it failed. The callable sends the chunk there and then, unless transmitting in parallel;
+        in that case every chunk is handed to the worker threads up front, and the callable waits for its outcome.
+        """
+        serialized_chunks = (
+            (chunk, self._serialize_items(list(chunk.values())))
+            for chunk in chunks(channel_metadata_item_map, self.enterprise_configuration.transmission_chunk_size)
+        )
+        if self._executor is None:
+            for chunk, serialized_chunk in serialized_chunks:
+                yield chunk, partial(self._send_chunk, send, serialized_chunk)
+        else:
+            pending_chunks = [
+                (chunk, self._executor.submit(self._send_chunk, send, serialized_chunk))
+                for chunk, serialized_chunk in serialized_chunks
+            ]
+            for chunk, pending_chunk in pending_chunks:
+                yield chunk, pending_chunk.result
+
+    def _send_chunk(self, send, serialized_chunk):
+        """
+        Send a serialized chunk with the given client method, once the channel's rate limit allows it.
+        """
+        if self.MIN_CHUNK_INTERVAL:
+            with self._rate_limit_lock:
+                wait = self._next_chunk_start - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                self._next_chunk_start = time.monotonic() + self.MIN_CHUNK_INTERVAL
+        send(serialized_chunk)
+
     def _get_transmissions(self):
         """
         Return the ContentMetadataItemTransmission models for previously
@@ -201,19 +329,35 @@ class ContentMetadataTransmitter(Transmitter):
                     enterprise_customer=self.enterprise_configuration.enterprise_customer,
                     integrated_channel_code=self.enterprise_configuration.channel_code(),
                     content_id=content_id,
-                    channel_metadata=channel_metadata
+                    channel_metadata=channel_metadata,
+                    content_hash=get_content_metadata_hash(channel_metadata),
                 )
             )
-        ContentMetadataItemTransmission.objects.bulk_create(transmissions)
+        with transaction.atomic():
+            ContentMetadataItemTransmission.objects.bulk_create(transmissions)
 
     def _update_transmissions(self, content_metadata_item_map, transmission_map):
         """
         Update ContentMetadataItemTransmission models for the given content metadata items.
         """
+        # pylint: disable=invalid-name
+        ContentMetadataItemTransmission = apps.get_model(
+            'integrated_channel',
+            'ContentMetadataItemTransmission'
+        )
+        modified = timezone.now()
+        transmissions = []
         for content_id, channel_metadata in content_metadata_item_map.items():
             transmission = transmission_map[content_id]
             transmission.channel_metadata = channel_metadata
-            transmission.save()
+            transmission.content_hash = get_content_metadata_hash(channel_metadata)
+            transmission.modified = modified
+            transmissions.append(transmission)
+        with transaction.atomic():
+            ContentMetadataItemTransmission.objects.bulk_update(
+                transmissions,
+                ['channel_metadata', 'content_hash', 'modified'],
+            )
 
     def _delete_transmissions(self, content_metadata_item_ids):
         """
@@ -224,8 +368,9 @@ class ContentMetadataTransmitter(Transmitter):
             'integrated_channel',
             'ContentMetadataItemTransmission'
         )
-        ContentMetadataItemTransmission.objects.filter(
-            enterprise_customer=self.enterprise_configuration.enterprise_customer,
-            integrated_channel_code=self.enterprise_configuration.channel_code(),
-            content_id__in=content_metadata_item_ids
-        ).delete()
+        with transaction.atomic():
+            ContentMetadataItemTransmission.objects.filter(
+                enterprise_customer=self.enterprise_configuration.enterprise_customer,
+                integrated_channel_code=self.enterprise_configuration.channel_code(),
+                content_id__in=content_metadata_item_ids
+            ).delete()
@@ -13,11 +13,80 @@ from django.apps import apps
 
 from integrated_channels.integrated_channel.client import IntegratedChannelApiClient
 from integrated_channels.integrated_channel.transmitters import Transmitter
-from integrated_channels.utils import is_already_transmitted
+from integrated_channels.utils import get_transmitted_grades, is_already_transmitted
 
 LOGGER = logging.getLogger(__name__)
 
 
+class LearnerDataTransmissionAuditWriter:
+    """
+    Buffer learner data transmission audit records, and write them to the database in batches.
+
+    New records are inserted with ``bulk_create``; records which already exist, like Cornerstone's, which are
+    created before any completion data is sent, are written back with ``bulk_update``. Use it as a context manager,
+    so the buffered records are written when the transmission ends, including when it ends with an error.
+    """
+
+    def __init__(self, TransmissionAudit, batch_size):  # pylint: disable=invalid-name
+        """
+        Write records of the ``TransmissionAudit`` model whenever ``batch_size`` of them are buffered.
+        """
+        self.TransmissionAudit = TransmissionAudit  # pylint: disable=invalid-name
+        self.batch_size = max(batch_size, 1)
+        self._records_to_create = []
+        self._records_to_update = {}
+
+    def __enter__(self):
+        """
+        Start buffering audit records.
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Write the remaining buffered audit records, whether or not an exception was raised.
+
+        A failure to write them doesn't replace the exception which ended the transmission; it is only logged.
+        """
+        if exc_info[0] is None:
+            self.flush()
+            return
+        try:
+            self.flush()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception(
+                'Failed to write the learner data transmission audit records buffered before the transmission failed.'
+            )
+
+    def add(self, learner_data):
+        """
+        Buffer the given audit record, and write out the buffer once it is full.
+        """
+        if learner_data.pk is None:
+            self._records_to_create.append(learner_data)
+        else:
+            # Only the last state of a record should be written back.
+            self._records_to_update[learner_data.pk] = learner_data
+        if len(self._records_to_create) + len(self._records_to_update) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write all of the buffered audit records to the database.
+        """
+        records_to_create, self._records_to_create = self._records_to_create, []
+        records_to_update, self._records_to_update = list(self._records_to_update.values()), {}
+        if records_to_create:
+            self.TransmissionAudit.objects.bulk_create(records_to_create)
+        if records_to_update:
+            fields = [field for field in self.TransmissionAudit._meta.concrete_fields if not field.primary_key]
+            for learner_data in records_to_update:
+                # Apply what ``save`` would, e.g. bump ``modified`` timestamps.
+                for field in fields:
+                    setattr(learner_data, field.attname, field.pre_save(learner_data, False))
+            self.TransmissionAudit.objects.bulk_update(records_to_update, [field.name for field in fields])
+
+
 class LearnerTransmitter(Transmitter):
     """
     A generic learner data transmitter.
@@ -26,6 +95,9 @@ class LearnerTransmitter(Transmitter):
     each integrated channel's particular learner data transmission requirements and expectations.
     """
 
+    # The number of transmission audit records to buffer before writing them to the database.
+    AUDIT_WRITE_BATCH_SIZE = 100
+
     def __init__(self, enterprise_configuration, client=IntegratedChannelApiClient):
         """
         By default, use the abstract integrated channel API client which raises an error when used if not subclassed.
@@ -50,8 +122,17 @@ class LearnerTransmitter(Transmitter):
             app_label=kwargs.get('app_label', 'integrated_channel'),
             model_name=kwargs.get('model_name', 'LearnerDataTransmissionAudit'),
         )
+        # Index the previously sent grades once for the whole run, and share the index with the exporter;
+        # single learner transmissions only check one enrollment, so they query for it directly.
+        transmitted_grades = None
+        if not kwargs.get('learner_to_transmit'):
+            transmitted_grades = get_transmitted_grades(
+                TransmissionAudit,
+                self.enterprise_configuration.enterprise_customer,
+            )
         kwargs.update(
             TransmissionAudit=TransmissionAudit,
+            transmitted_grades=transmitted_grades,
         )
         # Since we have started sending courses to integrated channels instead of course runs,
         # we need to attempt to send transmissions with course keys and course run ids in order to
@@ -60,6 +141,18 @@ class LearnerTransmitter(Transmitter):
         # one by course key and one by course run id.
         # If the transmission with the course key succeeds, the next one will get skipped.
         # If it fails, the one with the course run id will be attempted and (presumably) succeed.
+        # Without an index of the transmitted grades, the skip check reads the audit records from the
+        # database, so each record has to be written as soon as it is transmitted.
+        audit_write_batch_size = self.AUDIT_WRITE_BATCH_SIZE if transmitted_grades is not None else 1
+        with LearnerDataTransmissionAuditWriter(TransmissionAudit, audit_write_batch_size) as audit_writer:
+            self._transmit_learner_data(payload, audit_writer, **kwargs)
+
+    def _transmit_learner_data(self, payload, audit_writer, **kwargs):
+        """
+        Send the completion status of each of the exported learner data records, and buffer their audit records.
+        """
+        TransmissionAudit = kwargs['TransmissionAudit']  # pylint: disable=invalid-name
+        transmitted_grades = kwargs['transmitted_grades']
         for learner_data in payload.export(**kwargs):
             serialized_payload = learner_data.serialize(enterprise_configuration=self.enterprise_configuration)
             LOGGER.debug('Attempting to transmit serialized payload: %s', serialized_payload)
@@ -71,7 +164,7 @@ class LearnerTransmitter(Transmitter):
                 continue
 
             grade = getattr(learner_data, 'grade', None)
-            if is_already_transmitted(TransmissionAudit, enterprise_enrollment_id, grade):
+            if is_already_transmitted(TransmissionAudit, enterprise_enrollment_id, grade, transmitted_grades):
                 # We've already sent a completion status for this enrollment
                 LOGGER.info('Skipping previously sent enterprise enrollment {}'.format(enterprise_enrollment_id))
                 continue
@@ -93,7 +186,9 @@ class LearnerTransmitter(Transmitter):
 
             learner_data.status = str(code)
             learner_data.error_message = body if code >= 400 else ''
-            learner_data.save()
+            audit_writer.add(learner_data)
+            if transmitted_grades is not None and not learner_data.error_message:
+                transmitted_grades[enterprise_enrollment_id] = grade
 
     def handle_transmission_error(self, learner_data, request_exception):
         """Handle the case where the transmission fails."""
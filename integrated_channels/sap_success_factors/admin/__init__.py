@@ -50,6 +50,9 @@ class SAPSuccessFactorsEnterpriseCustomerConfigurationAdmin(admin.ModelAdmin):
         'has_access_token',
         'transmit_total_hours',
         'transmission_chunk_size',
+        'learner_data_fetch_workers',
+        'bulk_fetch_course_grades',
+        'stream_content_metadata',
         'additional_locales',
         'catalogs_to_transmit',
     )
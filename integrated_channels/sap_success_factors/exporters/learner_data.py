@@ -43,7 +43,7 @@ class SapSuccessFactorsLearnerExporter(LearnerExporter):
             completed_timestamp = parse_datetime_to_epoch_millis(completed_date)
             course_completed = is_passing
 
-        sapsf_user_id = enterprise_enrollment.enterprise_customer_user.get_remote_id()
+        sapsf_user_id = self.get_remote_id(enterprise_enrollment.enterprise_customer_user)
 
         if sapsf_user_id is not None:
             SapSuccessFactorsLearnerDataTransmissionAudit = apps.get_model(  # pylint: disable=invalid-name
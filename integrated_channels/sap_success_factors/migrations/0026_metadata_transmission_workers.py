@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 22:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sap_success_factors', '0025_learner_data_high_water_mark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sapsuccessfactorsenterprisecustomerconfiguration',
+            name='metadata_transmission_workers',
+            field=models.PositiveIntegerField(default=1, help_text="The number of content metadata chunks sent to the integrated channel at the same time, up to the channel's own limit. A value of 1 sends the chunks one after another."),
+        ),
+    ]
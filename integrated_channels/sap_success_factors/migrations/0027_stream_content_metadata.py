@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 22:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sap_success_factors', '0026_metadata_transmission_workers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sapsuccessfactorsenterprisecustomerconfiguration',
+            name='stream_content_metadata',
+            field=models.BooleanField(default=False, help_text='Export and transmit content metadata one page of catalog results at a time, instead of loading every catalog into memory first. Best suited to customers with large catalogs.'),
+        ),
+    ]
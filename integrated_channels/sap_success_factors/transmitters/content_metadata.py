@@ -20,6 +20,9 @@ class SapSuccessFactorsContentMetadataTransmitter(ContentMetadataTransmitter):
     This transmitter transmits exported content metadata to SAPSF.
     """
 
+    # Chunks are sent one at a time, so that transmission stops as soon as SAPSF starts throttling.
+    MAX_CONCURRENT_CHUNKS = 1
+
     def __init__(self, enterprise_configuration, client=SAPSuccessFactorsAPIClient):
         """
         Use the ``SAPSuccessFactorsAPIClient`` for content metadata transmission to SAPSF.
@@ -28,23 +31,21 @@ class SapSuccessFactorsContentMetadataTransmitter(ContentMetadataTransmitter):
             enterprise_configuration=enterprise_configuration,
             client=client
         )
+        self._skip_metadata_transmission = False
 
-    def transmit(self, payload, **kwargs):
+    def _transmit_items(self, items_to_create, items_to_update, items_to_delete, transmission_map):
         """
-        Transmit content metadata items to the integrated channel.
+        Transmit the creation, update and deletion of the given content metadata items to SAPSF, all as updates.
         """
-        items_to_create, items_to_update, items_to_delete, transmission_map = self._partition_items(payload)
         self._prepare_items_for_delete(items_to_delete)
         prepared_items = {}
         prepared_items.update(items_to_create)
         prepared_items.update(items_to_update)
         prepared_items.update(items_to_delete)
 
-        skip_metadata_transmission = False
-
         for chunk in chunks(prepared_items, self.enterprise_configuration.transmission_chunk_size):
             chunked_items = list(chunk.values())
-            if skip_metadata_transmission:
+            if self._skip_metadata_transmission:
                 # Remove the failed items from the create/update/delete dictionaries,
                 # so ContentMetadataItemTransmission objects are not synchronized for
                 # these items below.
@@ -67,8 +68,9 @@ class SapSuccessFactorsContentMetadataTransmitter(ContentMetadataTransmitter):
                     self._remove_failed_items(chunked_items, items_to_create, items_to_update, items_to_delete)
 
                     # SAP servers throttle incoming traffic, If a request fails than the subsequent would fail too,
-                    # So, no need to keep trying and failing. We should stop here and retry later.
-                    skip_metadata_transmission = True
+                    # So, no need to keep trying and failing. We should stop here, for the rest of
+                    # this run, and retry later.
+                    self._skip_metadata_transmission = True
 
         self._create_transmissions(items_to_create)
         self._update_transmissions(items_to_update, transmission_map)
@@ -6,17 +6,23 @@ Utilities common to different integrated channels.
 from __future__ import absolute_import, unicode_literals
 
 import datetime
+import hashlib
+import json
 import math
 import re
 from itertools import islice
 from string import Formatter
 
+from jsonfield.encoder import JSONEncoder
 from six.moves import range
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Max
 from django.utils import timezone
 from django.utils.html import strip_tags
 
 from enterprise.api_client.lms import parse_lms_api_datetime
+from enterprise.models import EnterpriseCourseEnrollment
 
 UNIX_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=timezone.utc)
 UNIX_MIN_DATE_STRING = '1970-01-01T00:00:00Z'
@@ -159,7 +165,39 @@ def get_image_url(content_metadata_item):
     return image_url
 
 
-def is_already_transmitted(transmission, enterprise_enrollment_id, grade):
+def get_transmitted_grades(transmission, enterprise_customer):
+    """
+    Returns: Dictionary mapping each enrollment id to the grade of its latest successful transmission.
+
+    Builds the index with a single aggregate query, so that ``is_already_transmitted`` can check many enrollments
+    of the given enterprise customer without querying the transmission audit table for each one. Transmission
+    audit models without a ``grade`` field map every enrollment id to None.
+
+    Args:
+        transmission: TransmissionAudit model to search enrollments in
+        enterprise_customer: EnterpriseCustomer whose enrollments are indexed
+    """
+    try:
+        transmission._meta.get_field('grade')  # pylint: disable=protected-access
+        grade_field = 'grade'
+    except FieldDoesNotExist:
+        grade_field = None
+
+    latest_transmission_ids = transmission.objects.filter(
+        enterprise_course_enrollment_id__in=EnterpriseCourseEnrollment.objects.filter(
+            enterprise_customer_user__enterprise_customer=enterprise_customer,
+        ).values('id'),
+        error_message='',
+    ).values('enterprise_course_enrollment_id').annotate(latest_id=Max('id')).values('latest_id')
+    latest_transmissions = transmission.objects.filter(id__in=latest_transmission_ids)
+
+    if grade_field is None:
+        enterprise_enrollment_ids = latest_transmissions.values_list('enterprise_course_enrollment_id', flat=True)
+        return dict.fromkeys(enterprise_enrollment_ids)
+    return dict(latest_transmissions.values_list('enterprise_course_enrollment_id', grade_field))
+
+
+def is_already_transmitted(transmission, enterprise_enrollment_id, grade, transmitted_grades=None):
     """
     Returns: Boolean indicating if completion date for given enrollment is already sent of not.
 
@@ -167,7 +205,15 @@ def is_already_transmitted(transmission, enterprise_enrollment_id, grade):
         transmission: TransmissionAudit model to search enrollment in
         enterprise_enrollment_id: enrollment id
         grade: 'Pass' or 'Fail' status
+        transmitted_grades: Optional index built by ``get_transmitted_grades``, consulted instead of
+            querying the TransmissionAudit model
     """
+    if transmitted_grades is not None:
+        return (
+            enterprise_enrollment_id in transmitted_grades and
+            transmitted_grades[enterprise_enrollment_id] == grade
+        )
+
     try:
         already_transmitted = transmission.objects.filter(
             enterprise_course_enrollment_id=enterprise_enrollment_id,
@@ -193,3 +239,14 @@ def get_duration_from_estimated_hours(estimated_hours):
         return duration
 
     return None
+
+
+def get_content_metadata_hash(channel_metadata):
+    """
+    Return the SHA-256 hex digest of the canonical JSON form of the given channel metadata.
+
+    Keys are sorted and whitespace is dropped, so two metadata items get the same hash exactly when they hold the
+    same data; comparing hashes tells whether a content metadata item changed without diffing the items.
+    """
+    canonical_json = json.dumps(channel_metadata, cls=JSONEncoder, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
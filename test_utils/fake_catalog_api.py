@@ -1268,6 +1268,9 @@ def setup_course_catalog_api_client_mock(
     client.get_course_run.return_value = fake_course_run
     client.get_course_id.return_value = fake_course['key']
     client.get_course_and_course_run.return_value = (fake_course, fake_course_run)
+    client.get_courses_and_course_runs.side_effect = lambda course_run_ids: {
+        course_run_id: (fake_course, fake_course_run) for course_run_id in course_run_ids
+    }
     client.get_program_course_keys.return_value = [course['key'] for course in fake_program['courses']]
     client.get_program_by_uuid.return_value = fake_program
     client.get_program_type_by_slug.return_value = fake_program_type
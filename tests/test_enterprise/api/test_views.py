@@ -37,6 +37,7 @@ from enterprise.constants import (
 )
 from enterprise.models import (
     EnterpriseCourseEnrollment,
+    EnterpriseCustomerCourseEnrollmentsJob,
     EnterpriseCustomerUser,
     EnterpriseEnrollmentSource,
     EnterpriseFeatureRole,
@@ -70,6 +71,7 @@ ENTERPRISE_CATALOGS_CONTAINS_CONTENT_ENDPOINT = reverse(
     'enterprise-catalogs-contains-content-items',
     kwargs={'pk': FAKE_UUIDS[1]}
 )
+ENTERPRISE_CATALOGS_BULK_CONTAINS_CONTENT_ENDPOINT = reverse('enterprise-catalogs-bulk-contains-content-items')
 ENTERPRISE_CATALOGS_COURSE_ENDPOINT = reverse(
     # pylint: disable=anomalous-backslash-in-string
     r'enterprise-catalogs-courses/(?P<course-key>[^/+]+(/|\+)[^/+]+)',
@@ -1083,6 +1085,58 @@ class TestEnterpriseAPIViews(APITest):
         assert 'course_run_ids' in message
         assert response.status_code == 400
 
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    def test_enterprise_catalog_bulk_contains_content_items(self, mock_catalog_api_client):
+        """
+        Ensure bulk_contains_content_items endpoint checks the membership of each content item in its catalog.
+        """
+        enterprise_customer = factories.EnterpriseCustomerFactory(uuid=FAKE_UUIDS[0])
+        factories.EnterpriseCustomerCatalogFactory(
+            uuid=FAKE_UUIDS[1],
+            enterprise_customer=enterprise_customer,
+            content_filter={
+                'key': [fake_catalog_api.FAKE_COURSE_RUN['key']],
+                'uuid': [fake_catalog_api.FAKE_SEARCH_ALL_PROGRAM_RESULT_1['uuid']],
+            }
+        )
+        factories.EnterpriseCustomerCatalogFactory(
+            uuid=FAKE_UUIDS[2],
+            enterprise_customer=enterprise_customer,
+            content_filter={'key': [fake_catalog_api.FAKE_COURSE_RUN2['key']]},
+        )
+        mock_catalog_api_client.return_value = mock.Mock(get_course_ids=mock.Mock(return_value={}))
+        post_data = [
+            {'catalog_uuid': FAKE_UUIDS[1], 'content_id': fake_catalog_api.FAKE_COURSE_RUN['key']},
+            {'catalog_uuid': FAKE_UUIDS[1], 'content_id': fake_catalog_api.FAKE_COURSE_RUN2['key']},
+            {'catalog_uuid': FAKE_UUIDS[1], 'content_id': fake_catalog_api.FAKE_SEARCH_ALL_PROGRAM_RESULT_1['uuid']},
+            {'catalog_uuid': FAKE_UUIDS[2], 'content_id': fake_catalog_api.FAKE_COURSE_RUN2['key']},
+            {'catalog_uuid': FAKE_UUIDS[3], 'content_id': fake_catalog_api.FAKE_COURSE_RUN2['key']},
+        ]
+
+        response = self.client.post(
+            settings.TEST_SERVER + ENTERPRISE_CATALOGS_BULK_CONTAINS_CONTENT_ENDPOINT,
+            data=json.dumps(post_data),
+            content_type='application/json',
+        )
+        response_json = self.load_json(response.content)
+
+        assert response.status_code == 200
+        assert [item['contains_content_item'] for item in response_json] == [True, False, True, True, False]
+        assert [(item['catalog_uuid'], item['content_id']) for item in response_json] == [
+            (item['catalog_uuid'], item['content_id']) for item in post_data
+        ]
+
+    def test_enterprise_catalog_bulk_contains_content_items_invalid(self):
+        """
+        Ensure bulk_contains_content_items endpoint rejects items without a catalog UUID.
+        """
+        response = self.client.post(
+            settings.TEST_SERVER + ENTERPRISE_CATALOGS_BULK_CONTAINS_CONTENT_ENDPOINT,
+            data=json.dumps([{'content_id': fake_catalog_api.FAKE_COURSE_RUN['key']}]),
+            content_type='application/json',
+        )
+        assert response.status_code == 400
+
     @ddt.data(
         (False, False, False, {}, {'detail': 'Not found.'}),
         (False, True, False, {'detail': 'Not found.'}, {'detail': 'Not found.'}),
@@ -1935,10 +1989,11 @@ class TestEnterpriseAPIViews(APITest):
         mock_tpa_client.return_value.get_username_from_remote_id = mock.Mock()
         mock_tpa_client.return_value.get_username_from_remote_id.return_value = tpa_user_id
 
-        # Set up EnrollmentAPI responses
+        # Set up EnrollmentAPI responses; the enrollments are looked up concurrently, so key them by username.
+        course_enrollments = {lms_user.username: {'is_active': True, 'mode': 'verified'}}
         mock_enrollment_client.return_value = mock.Mock(
             get_course_enrollment=mock.Mock(
-                side_effect=[None, {'is_active': True, 'mode': 'verified'}]
+                side_effect=lambda username, course_id: course_enrollments.get(username)
             ),
             enroll_user_in_course=mock.Mock()
         )
@@ -1959,6 +2014,167 @@ class TestEnterpriseAPIViews(APITest):
             user__user_email=pending_email,
             course_id=course_run_id).exists())
 
+    @mock.patch('enterprise.models.EnterpriseCustomer.catalog_contains_course')
+    @mock.patch('enterprise.models.EnrollmentApiClient')
+    @mock.patch('enterprise.models.EnterpriseCustomer.notify_enrolled_learners')
+    @mock.patch('enterprise.models.EnterpriseCustomerUser.create_orders_for_enrollments')
+    @mock.patch('enterprise.models.utils.track_event', mock.MagicMock())
+    def test_enterprise_customer_course_enrollments_detail_bulk(
+            self,
+            mock_create_orders,
+            mock_notify_learners,
+            mock_enrollment_client,
+            mock_catalog_contains_course,
+    ):
+        """
+        Test the Enterprise Customer course enrollments detail route makes the enrollments of existing learners in bulk.
+        """
+        course_run_id = 'course-v1:edX+DemoX+Demo_Course'
+        enterprise_customer = factories.EnterpriseCustomerFactory(uuid=FAKE_UUIDS[0], name="test_enterprise")
+        permission = Permission.objects.get(name='Can add Enterprise Customer')
+        self.user.user_permissions.add(permission)
+
+        users = [factories.UserFactory(email='learner{}@example.com'.format(index)) for index in range(3)]
+        for user in users:
+            factories.EnterpriseCustomerUserFactory(user_id=user.id, enterprise_customer=enterprise_customer)
+        mock_enrollment_client.return_value.get_course_enrollment.return_value = None
+        mock_catalog_contains_course.return_value = True
+
+        payload = [
+            {
+                'course_mode': 'verified',
+                'course_run_id': course_run_id,
+                'user_email': user.email,
+                'email_students': True,
+            }
+            for user in users
+        ] + [
+            {
+                'course_mode': 'verified',
+                'course_run_id': course_run_id,
+                'lms_user_id': users[0].id,
+                'is_active': False,
+            },
+            {
+                'course_mode': 'audit',
+                'course_run_id': course_run_id,
+                'user_email': 'new-learner@example.com',
+            },
+        ]
+        response = self.client.post(
+            settings.TEST_SERVER + ENTERPRISE_CUSTOMER_COURSE_ENROLLMENTS_ENDPOINT,
+            data=json.dumps(payload),
+            content_type='application/json',
+        )
+
+        self.assertListEqual(self.load_json(response.content), [{'detail': 'success'}] * len(payload))
+        mock_catalog_contains_course.assert_called_once_with(course_run_id)
+        assert mock_enrollment_client.return_value.enroll_user_in_course.call_count == len(users)
+        mock_enrollment_client.return_value.unenroll_user_from_course.assert_called_once_with(
+            users[0].username, course_run_id
+        )
+        mock_create_orders.assert_called_once()
+        assert [order['lms_user_id'] for order in mock_create_orders.call_args[0][0]] == [user.id for user in users]
+        mock_notify_learners.assert_called_once()
+        assert [learner.user_id for learner in mock_notify_learners.call_args[0][2]] == [user.id for user in users]
+        assert PendingEnrollment.objects.filter(
+            user__user_email='new-learner@example.com',
+            course_id=course_run_id,
+        ).exists()
+
+    @mock.patch('enterprise.api.v1.views.process_course_enrollments_job')
+    @mock.patch('enterprise.api.v1.views.transaction.on_commit', side_effect=lambda func: func())
+    def test_enterprise_customer_course_enrollments_async(self, mock_on_commit, mock_process_job):
+        """
+        Test the Enterprise Customer course enrollments detail route stores the enrollments as a job in async mode.
+        """
+        enterprise_customer = factories.EnterpriseCustomerFactory(uuid=FAKE_UUIDS[0], name="test_enterprise")
+        permission = Permission.objects.get(name='Can add Enterprise Customer')
+        self.user.user_permissions.add(permission)
+        payload = [
+            {
+                'course_mode': 'audit',
+                'course_run_id': 'course-v1:edX+DemoX+Demo_Course',
+                'user_email': 'learner{}@example.com'.format(index),
+            }
+            for index in range(3)
+        ]
+
+        response = self.client.post(
+            settings.TEST_SERVER + ENTERPRISE_CUSTOMER_COURSE_ENROLLMENTS_ENDPOINT + '?async=true',
+            data=json.dumps(payload),
+            content_type='application/json',
+        )
+
+        assert response.status_code == 202
+        job = EnterpriseCustomerCourseEnrollmentsJob.objects.get(enterprise_customer=enterprise_customer)
+        assert job.payload == payload
+        assert job.requester_id == self.user.id
+        mock_on_commit.assert_called_once()
+        mock_process_job.delay.assert_called_once_with(str(job.uuid))
+        response = self.load_json(response.content)
+        assert response['uuid'] == str(job.uuid)
+        assert response['status'] == EnterpriseCustomerCourseEnrollmentsJob.PENDING
+        assert response['total_count'] == 3
+        assert response['processed_count'] == 0
+
+    @mock.patch('enterprise.api.v1.views.process_course_enrollments_job')
+    def test_enterprise_customer_course_enrollments_async_not_a_list(self, mock_process_job):
+        """
+        Test the Enterprise Customer course enrollments detail route rejects a single enrollment in async mode.
+        """
+        enterprise_customer = factories.EnterpriseCustomerFactory(uuid=FAKE_UUIDS[0], name="test_enterprise")
+        permission = Permission.objects.get(name='Can add Enterprise Customer')
+        self.user.user_permissions.add(permission)
+
+        response = self.client.post(
+            settings.TEST_SERVER + ENTERPRISE_CUSTOMER_COURSE_ENROLLMENTS_ENDPOINT + '?async=true',
+            data=json.dumps({
+                'course_mode': 'audit',
+                'course_run_id': 'course-v1:edX+DemoX+Demo_Course',
+                'user_email': 'learner@example.com',
+            }),
+            content_type='application/json',
+        )
+
+        assert response.status_code == 400
+        assert not EnterpriseCustomerCourseEnrollmentsJob.objects.filter(enterprise_customer=enterprise_customer)
+        mock_process_job.delay.assert_not_called()
+
+    @ddt.data(True, False)
+    def test_enterprise_customer_course_enrollments_job(self, job_exists):
+        """
+        Test the Enterprise Customer course enrollments job detail route returns the status of a job.
+        """
+        enterprise_customer = factories.EnterpriseCustomerFactory(uuid=FAKE_UUIDS[0], name="test_enterprise")
+        permission = Permission.objects.get(name='Can add Enterprise Customer')
+        self.user.user_permissions.add(permission)
+        job = EnterpriseCustomerCourseEnrollmentsJob.objects.create(
+            enterprise_customer=enterprise_customer if job_exists else factories.EnterpriseCustomerFactory(),
+            requester_id=self.user.id,
+            status=EnterpriseCustomerCourseEnrollmentsJob.COMPLETED,
+            results=[{'detail': 'success'}, {'detail': 'Auto-cohorting is not enabled for this enterprise'}],
+            total_count=2,
+            processed_count=2,
+            succeeded_count=1,
+            failed_count=1,
+        )
+
+        response = self.client.get(
+            settings.TEST_SERVER + reverse(
+                'enterprise-customer-course-enrollments-job', (FAKE_UUIDS[0], str(job.uuid))
+            )
+        )
+
+        if not job_exists:
+            assert response.status_code == 404
+            return
+        assert response.status_code == 200
+        response = self.load_json(response.content)
+        assert response['status'] == EnterpriseCustomerCourseEnrollmentsJob.COMPLETED
+        assert response['results'] == job.results
+        assert (response['processed_count'], response['succeeded_count'], response['failed_count']) == (2, 1, 1)
+
     def test_enterprise_customer_catalogs_response_formats(self):
         """
         ``enterprise_catalogs``'s xml and json responses verification.
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for enterprise.api_client.caching.py
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import unittest
+
+import mock
+from pytest import raises
+
+from django.core.cache import cache
+
+from enterprise.api_client.caching import (
+    ChunkedCacheValue,
+    LocalCache,
+    TwoTierCache,
+    encode_cache_value,
+    get_cached_value,
+    get_or_set_single_flight,
+    set_cached_value,
+)
+
+
+class TestLocalCache(unittest.TestCase):
+    """
+    Tests for the ``LocalCache`` class.
+    """
+
+    def test_evicts_least_recently_used(self):
+        local_cache = LocalCache(max_size=2, timeout=60)
+        local_cache.set('first', 1)
+        local_cache.set('second', 2)
+        assert local_cache.get('first') == 1
+        local_cache.set('third', 3)
+
+        assert local_cache.get('first') == 1
+        assert local_cache.get('second') is None
+        assert local_cache.get('third') == 3
+
+    @mock.patch('enterprise.api_client.caching.time')
+    def test_expires_entries(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        local_cache = LocalCache(max_size=2, timeout=60)
+        local_cache.set('key', 'value')
+
+        mock_time.monotonic.return_value = 159
+        assert local_cache.get('key') == 'value'
+        mock_time.monotonic.return_value = 160
+        assert local_cache.get('key', 'default') == 'default'
+
+    @mock.patch('enterprise.api_client.caching.time')
+    def test_expires_entries_with_shorter_timeout(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        local_cache = LocalCache(max_size=2, timeout=60)
+        local_cache.set('short', 'value', timeout=10)
+        local_cache.set('long', 'value', timeout=600)
+
+        mock_time.monotonic.return_value = 110
+        assert local_cache.get('short') is None
+        assert local_cache.get('long') == 'value'
+        mock_time.monotonic.return_value = 160
+        assert local_cache.get('long') is None
+
+    def test_values_are_copied(self):
+        local_cache = LocalCache(max_size=2, timeout=60)
+        value = {'courses': [{'key': 'edX+DemoX'}]}
+        local_cache.set('key', value)
+        value['courses'][0]['is_enrolled'] = True
+
+        cached_value = local_cache.get('key')
+        assert cached_value == {'courses': [{'key': 'edX+DemoX'}]}
+        cached_value['courses'][0]['is_enrolled'] = True
+        cached_value['enrolled_in_program'] = True
+        assert local_cache.get('key') == {'courses': [{'key': 'edX+DemoX'}]}
+
+    def test_zero_size_holds_nothing(self):
+        local_cache = LocalCache(max_size=0, timeout=60)
+        local_cache.set('key', 'value')
+        assert local_cache.get('key') is None
+
+
+class TestTwoTierCache(unittest.TestCase):
+    """
+    Tests for the ``TwoTierCache`` class.
+    """
+
+    def setUp(self):
+        super(TestTwoTierCache, self).setUp()
+        cache.clear()
+        self.two_tier_cache = TwoTierCache(LocalCache(max_size=10, timeout=60), timeout=60)
+
+    def test_counts_lookups(self):
+        assert self.two_tier_cache.get('key') is None
+        self.two_tier_cache.set('key', 'value')
+        assert self.two_tier_cache.get('key') == 'value'
+
+        # Once the process-local cache loses the value, it is refilled from the shared cache.
+        self.two_tier_cache.clear()
+        assert self.two_tier_cache.get('key') == 'value'
+        assert self.two_tier_cache.get('key') == 'value'
+        assert cache.get('key') == 'value'
+
+        assert self.two_tier_cache.get_stats() == {'local_hits': 2, 'shared_hits': 1, 'misses': 1}
+        self.two_tier_cache.reset_stats()
+        assert self.two_tier_cache.get_stats() == {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+
+
+class TestCachedValues(unittest.TestCase):
+    """
+    Tests for the ``get_cached_value`` and ``set_cached_value`` functions.
+    """
+
+    def setUp(self):
+        super(TestCachedValues, self).setUp()
+        cache.clear()
+        self.value = {'results': [{'key': 'course-v1:edX+DemoX+Demo_Course', 'title': 'Demo'}] * 100}
+
+    def test_compresses_values(self):
+        set_cached_value('key', self.value, 60)
+
+        assert isinstance(cache.get('key'), bytes)
+        assert len(cache.get('key')) < len(repr(self.value))
+        assert get_cached_value('key') == self.value
+
+    @mock.patch('enterprise.api_client.caching.CACHE_CHUNK_SIZE', 16)
+    def test_chunks_large_values(self):
+        set_cached_value('key', self.value, 60)
+
+        chunked_value = cache.get('key')
+        assert isinstance(chunked_value, ChunkedCacheValue)
+        assert chunked_value.count > 1
+        assert get_cached_value('key') == self.value
+
+    @mock.patch('enterprise.api_client.caching.CACHE_CHUNK_SIZE', 16)
+    def test_missing_chunk_is_a_miss(self):
+        set_cached_value('key', self.value, 60)
+        cache.delete(cache.get('key').get_chunk_keys('key')[-1])
+
+        assert get_cached_value('key') is None
+
+    def test_tells_falsy_values_from_missing_ones(self):
+        assert get_cached_value('key', default='missing') == 'missing'
+        set_cached_value('key', None, 60)
+        assert get_cached_value('key', default='missing') is None
+
+    def test_returns_values_cached_as_is(self):
+        assert get_cached_value('key') is None
+        cache.set('key', self.value)
+        assert get_cached_value('key') == self.value
+
+
+class TestGetOrSetSingleFlight(unittest.TestCase):
+    """
+    Tests for the ``get_or_set_single_flight`` function.
+    """
+
+    def setUp(self):
+        super(TestGetOrSetSingleFlight, self).setUp()
+        cache.clear()
+        self.compute = mock.Mock(return_value={'results': ['fresh']})
+
+    def test_computes_missing_value(self):
+        assert get_or_set_single_flight('key', self.compute, 60) == {'results': ['fresh']}
+        assert get_or_set_single_flight('key', self.compute, 60) == {'results': ['fresh']}
+
+        assert self.compute.call_count == 1
+        assert get_cached_value('key.stale') == {'results': ['fresh']}
+        assert cache.get('key.lock') is None
+
+    def test_empty_value_is_cached(self):
+        self.compute.return_value = {}
+        assert get_or_set_single_flight('key', self.compute, 60) == {}
+        assert get_or_set_single_flight('key', self.compute, 60) == {}
+
+        assert self.compute.call_count == 1
+        assert get_cached_value('key.stale', default='missing') == {}
+
+    def test_returns_stale_value_while_locked(self):
+        cache.set('key.lock', True)
+        cache.set('key.stale', {'results': ['stale']})
+
+        assert get_or_set_single_flight('key', self.compute, 60) == {'results': ['stale']}
+        assert not self.compute.called
+
+    @mock.patch('enterprise.api_client.caching.time')
+    def test_waits_for_value_while_locked(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        cache.set('key.lock', True)
+
+        def finish_computing(__):
+            """
+            Cache the value computed by the caller holding the lock, and release the lock.
+            """
+            cache.set('key', {'results': ['computed elsewhere']})
+            cache.set('key.stale', {'results': ['computed elsewhere']})
+            cache.delete('key.lock')
+
+        mock_time.sleep.side_effect = finish_computing
+
+        assert get_or_set_single_flight('key', self.compute, 60) == {'results': ['computed elsewhere']}
+        assert mock_time.sleep.call_count == 1
+        assert not self.compute.called
+
+    @mock.patch('enterprise.api_client.caching.CACHE_LOCK_WAIT_TIMEOUT', 5)
+    @mock.patch('enterprise.api_client.caching.time')
+    def test_stops_waiting_for_value_after_timeout(self, mock_time):
+        mock_time.monotonic.side_effect = [100, 103, 105]
+        cache.set('key.lock', True)
+
+        assert get_or_set_single_flight('key', self.compute, 60) == {'results': ['fresh']}
+        assert mock_time.sleep.call_count == 1
+        assert self.compute.call_count == 1
+        assert get_cached_value('key') == {'results': ['fresh']}
+        assert cache.get('key.lock') is True
+
+    def test_keeps_lock_taken_by_another_caller(self):
+        def compute():
+            """
+            Outlast the lock, which another caller then takes.
+            """
+            cache.set('key.lock', 'other-token')
+            return {'results': ['fresh']}
+
+        assert get_or_set_single_flight('key', compute, 60) == {'results': ['fresh']}
+        assert cache.get('key.lock') == 'other-token'
+
+    @mock.patch('enterprise.api_client.caching.encode_cache_value', wraps=encode_cache_value)
+    def test_encodes_value_once(self, mock_encode_cache_value):
+        assert get_or_set_single_flight('key', self.compute, 60) == {'results': ['fresh']}
+        assert mock_encode_cache_value.call_count == 1
+        assert get_cached_value('key') == get_cached_value('key.stale') == {'results': ['fresh']}
+
+    def test_releases_lock_on_error(self):
+        self.compute.side_effect = ValueError
+        with raises(ValueError):
+            get_or_set_single_flight('key', self.compute, 60)
+        assert cache.get('key.lock') is None
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for enterprise.api_client.connections.py
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import mock
+
+from enterprise.api_client.connections import get_cached_jwt, get_pooled_session
+
+
+def test_pooled_sessions_share_connection_pools():
+    session = get_pooled_session()
+    other_session = get_pooled_session()
+
+    assert session is not other_session
+    assert session.get_adapter('https://lms.example.com/') is other_session.get_adapter('http://other.example.com/')
+
+
+@mock.patch('enterprise.api_client.connections.time')
+def test_cached_jwt_is_reused_until_shortly_before_it_expires(mock_time):
+    create_jwt = mock.Mock(side_effect=['first-jwt', 'second-jwt'])
+    mock_time.return_value = 1000
+
+    # At most half of the lifetime of a JWT is cut off.
+    assert get_cached_jwt('user-with-cached-jwt', create_jwt, 60) == ('first-jwt', 1030)
+    mock_time.return_value = 1030
+    assert get_cached_jwt('user-with-cached-jwt', create_jwt, 60) == ('first-jwt', 1030)
+    mock_time.return_value = 1031
+    assert get_cached_jwt('user-with-cached-jwt', create_jwt, 60) == ('second-jwt', 1061)
+    assert create_jwt.call_count == 2
+
+
+@mock.patch('enterprise.api_client.connections.time', mock.Mock(return_value=1000))
+@mock.patch('enterprise.api_client.connections.JWT_EXPIRY_MARGIN', 60)
+def test_cached_jwt_is_reused_for_the_same_user():
+    create_jwt = mock.Mock(side_effect=['first-user-jwt', 'second-user-jwt'])
+    first_user = mock.Mock(username='first-user-with-cached-jwt')
+    second_user = mock.Mock(username='second-user-with-cached-jwt')
+
+    assert get_cached_jwt(first_user, create_jwt, 3600) == ('first-user-jwt', 4540)
+    assert get_cached_jwt(second_user, create_jwt, 3600) == ('second-user-jwt', 4540)
+    assert get_cached_jwt(mock.Mock(username='first-user-with-cached-jwt'), create_jwt, 3600) == (
+        'first-user-jwt', 4540
+    )
+    assert create_jwt.call_args_list == [mock.call(first_user), mock.call(second_user)]
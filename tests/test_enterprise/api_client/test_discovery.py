@@ -12,13 +12,16 @@ import unittest
 import ddt
 import mock
 import responses
+from pytest import mark
 from six.moves.urllib.parse import urljoin  # pylint: disable=import-error
 from slumber.exceptions import HttpClientError
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
 
 from enterprise.api_client.discovery import CourseCatalogApiClient, CourseCatalogApiServiceClient
+from enterprise.models import CourseRunKeyMapping
 from enterprise.utils import NotConnectedToOpenEdX
 from test_utils import MockLoggingHandler
 from test_utils.fake_catalog_api import CourseDiscoveryApiTestMixin
@@ -48,6 +51,7 @@ class TestCourseCatalogApiInitialization(unittest.TestCase):
 
 
 @ddt.ddt
+@mark.django_db
 class TestCourseCatalogApi(CourseDiscoveryApiTestMixin, unittest.TestCase):
     """
     Test course catalog API methods.
@@ -60,9 +64,16 @@ class TestCourseCatalogApi(CourseDiscoveryApiTestMixin, unittest.TestCase):
         self.user_mock = mock.Mock(spec=User)
         self.get_data_mock = self._make_patch(self._make_catalog_api_location("get_edx_api_data"))
         self.catalog_api_config_mock = self._make_patch(self._make_catalog_api_location("CatalogIntegration"))
+        self.catalog_api_config_mock.current.return_value = mock.Mock(
+            is_cache_enabled=True,
+            cache_ttl=60,
+            long_term_cache_ttl=3600,
+        )
         self.jwt_builder_mock = self._make_patch(self._make_catalog_api_location("JwtBuilder"))
 
         self.api = CourseCatalogApiClient(self.user_mock)
+        cache.clear()
+        CourseCatalogApiClient.response_cache.clear()
 
     @staticmethod
     def _make_course_run(key, *seat_types):
@@ -124,6 +135,178 @@ class TestCourseCatalogApi(CourseDiscoveryApiTestMixin, unittest.TestCase):
         assert resource_id is course_run_id
         assert actual_result == response_dict
 
+    def test_get_course_run_is_cached(self):
+        """
+        Verify get_course_run of CourseCatalogApiClient serves repeated lookups from its caches.
+        """
+        course_run_id = 'course-v1:JediAcademy+AppliedTelekinesis+T1'
+        response_dict = {'key': course_run_id, 'course': 'JediAcademy+AppliedTelekinesis'}
+        self.get_data_mock.return_value = response_dict
+        CourseCatalogApiClient.response_cache.reset_stats()
+
+        assert self.api.get_course_run(course_run_id) == response_dict
+        assert self.api.get_course_id(course_run_id) == response_dict['course']
+        CourseCatalogApiClient.response_cache.clear()
+        assert CourseCatalogApiClient(self.user_mock).get_course_run(course_run_id) == response_dict
+
+        assert self.get_data_mock.call_count == 1
+        assert CourseCatalogApiClient.response_cache.get_stats() == {'local_hits': 1, 'shared_hits': 1, 'misses': 1}
+
+    @ddt.data(
+        ('get_course_run', 'course-v1:JediAcademy+AppliedTelekinesis+T1', 3600),
+        ('get_course_details', 'JediAcademy+AppliedTelekinesis', 60),
+    )
+    @ddt.unpack
+    def test_response_cache_timeout(self, method_name, resource_id, cache_timeout):
+        """
+        Verify responses are cached for as long as the CatalogIntegration allows.
+        """
+        self.get_data_mock.return_value = {'key': resource_id}
+        with mock.patch('enterprise.api_client.caching.cache') as mock_cache:
+            mock_cache.get.return_value = None
+            getattr(self.api, method_name)(resource_id)
+
+        mock_cache.set.assert_called_once_with(mock.ANY, {'key': resource_id}, cache_timeout)
+
+    def test_response_cache_disabled(self):
+        """
+        Verify responses are not cached when the CatalogIntegration disables caching.
+        """
+        course_run_id = 'course-v1:JediAcademy+AppliedTelekinesis+T1'
+        self.catalog_api_config_mock.current.return_value.is_cache_enabled = False
+        self.get_data_mock.return_value = {'key': course_run_id}
+
+        assert self.api.get_course_run(course_run_id) == {'key': course_run_id}
+        assert self.api.get_course_run(course_run_id) == {'key': course_run_id}
+        assert self.get_data_mock.call_count == 2
+
+    def test_get_course_ids(self):
+        """
+        Verify get_course_ids of CourseCatalogApiClient only looks up the course runs which are not mapped yet.
+        """
+        CourseRunKeyMapping.objects.create(
+            course_run_id='course-v1:JediAcademy+AppliedTelekinesis+T1',
+            course_key='JediAcademy+AppliedTelekinesis',
+        )
+        course_runs = [
+            {'key': 'course-v1:JediAcademy+AppliedTelekinesis+T2', 'course': 'JediAcademy+AppliedTelekinesis'},
+        ]
+        self.get_data_mock.side_effect = lambda resource, querystring, **kwargs: [
+            course_run for course_run in course_runs if course_run['key'] in querystring['keys'].split(',')
+        ]
+
+        course_identifiers = [
+            'JediAcademy+AppliedTelekinesis',
+            'course-v1:JediAcademy+AppliedTelekinesis+T1',
+            'course-v1:JediAcademy+AppliedTelekinesis+T2',
+            'course-v1:JediAcademy+Unknown+T1',
+        ]
+        expected_course_ids = {
+            'JediAcademy+AppliedTelekinesis': 'JediAcademy+AppliedTelekinesis',
+            'course-v1:JediAcademy+AppliedTelekinesis+T1': 'JediAcademy+AppliedTelekinesis',
+            'course-v1:JediAcademy+AppliedTelekinesis+T2': 'JediAcademy+AppliedTelekinesis',
+        }
+        assert self.api.get_course_ids(course_identifiers) == expected_course_ids
+        assert [call[1]['querystring'] for call in self.get_data_mock.call_args_list] == [
+            {'keys': 'course-v1:JediAcademy+AppliedTelekinesis+T2,course-v1:JediAcademy+Unknown+T1'},
+        ]
+
+        # The course ids found in the catalog are stored, so only the unknown course run is looked up again.
+        self.get_data_mock.reset_mock()
+        CourseCatalogApiClient.response_cache.clear()
+        cache.clear()
+        assert self.api.get_course_ids(course_identifiers) == expected_course_ids
+        assert [call[1]['querystring'] for call in self.get_data_mock.call_args_list] == [
+            {'keys': 'course-v1:JediAcademy+Unknown+T1'},
+        ]
+
+    @mock.patch.object(CourseCatalogApiClient, 'COURSE_RUN_KEYS_PER_QUERY', 2)
+    def test_get_course_runs(self):
+        """
+        Verify get_course_runs of CourseCatalogApiClient looks up uncached course runs in batches, and caches them.
+        """
+        cached_course_run = {'key': 'course-v1:JediAcademy+AppliedTelekinesis+T1', 'course': 'JediAcademy+Telekinesis'}
+        self.get_data_mock.return_value = cached_course_run
+        self.api.get_course_run(cached_course_run['key'])
+        self.get_data_mock.reset_mock()
+
+        course_runs = [
+            {'key': 'course-v1:JediAcademy+AppliedTelekinesis+T{}'.format(index), 'course': 'JediAcademy+Telekinesis'}
+            for index in range(2, 5)
+        ]
+        self.get_data_mock.side_effect = lambda resource, querystring, **kwargs: [
+            course_run for course_run in course_runs if course_run['key'] in querystring['keys'].split(',')
+        ]
+        course_run_ids = [cached_course_run['key']] + [course_run['key'] for course_run in course_runs]
+
+        assert sorted(self.api.get_course_runs(course_run_ids), key=lambda course_run: course_run['key']) == [
+            cached_course_run
+        ] + course_runs
+        assert [call[1]['querystring'] for call in self.get_data_mock.call_args_list] == [
+            {'keys': 'course-v1:JediAcademy+AppliedTelekinesis+T2,course-v1:JediAcademy+AppliedTelekinesis+T3'},
+            {'keys': 'course-v1:JediAcademy+AppliedTelekinesis+T4'},
+        ]
+
+        # The course runs found are cached for single lookups too.
+        self.get_data_mock.reset_mock()
+        assert self.api.get_course_run(course_runs[0]['key']) == course_runs[0]
+        self.get_data_mock.assert_not_called()
+
+    @mock.patch.object(CourseCatalogApiClient, 'COURSE_KEYS_PER_QUERY', 2)
+    def test_get_courses(self):
+        """
+        Verify get_courses of CourseCatalogApiClient looks up uncached courses in batches, and caches them.
+        """
+        cached_course = {'key': 'JediAcademy+Telekinesis1', 'course_runs': []}
+        self.get_data_mock.return_value = cached_course
+        self.api.get_course_details(cached_course['key'])
+        self.get_data_mock.reset_mock()
+
+        courses = [{'key': 'JediAcademy+Telekinesis{}'.format(index), 'course_runs': []} for index in range(2, 5)]
+        self.get_data_mock.side_effect = lambda resource, querystring, **kwargs: [
+            course for course in courses if course['key'] in querystring['keys'].split(',')
+        ]
+        course_ids = [cached_course['key']] + [course['key'] for course in courses] + ['JediAcademy+Unknown']
+
+        assert self.api.get_courses(course_ids) == {course['key']: course for course in [cached_course] + courses}
+        assert [call[1]['querystring'] for call in self.get_data_mock.call_args_list] == [
+            {'keys': 'JediAcademy+Telekinesis2,JediAcademy+Telekinesis3'},
+            {'keys': 'JediAcademy+Telekinesis4,JediAcademy+Unknown'},
+        ]
+
+        # The courses found are cached for single lookups too.
+        self.get_data_mock.reset_mock()
+        assert self.api.get_course_details(courses[0]['key']) == courses[0]
+        self.get_data_mock.assert_not_called()
+
+    def test_get_courses_and_course_runs(self):
+        """
+        Verify get_courses_and_course_runs of CourseCatalogApiClient finds the course of each course run in bulk.
+        """
+        course_run = {'key': 'course-v1:JediAcademy+AppliedTelekinesis+T1'}
+        course = {'key': 'JediAcademy+AppliedTelekinesis', 'course_runs': [course_run]}
+        course_ids = {
+            'course-v1:JediAcademy+AppliedTelekinesis+T1': 'JediAcademy+AppliedTelekinesis',
+            'course-v1:JediAcademy+AppliedTelekinesis+T2': 'JediAcademy+AppliedTelekinesis',
+        }
+        with mock.patch.object(self.api, 'get_course_ids', return_value=course_ids), \
+                mock.patch.object(self.api, 'get_courses', return_value={course['key']: course}) as get_courses_mock:
+            assert self.api.get_courses_and_course_runs(list(course_ids) + ['course-v1:JediAcademy+Unknown+T1']) == {
+                'course-v1:JediAcademy+AppliedTelekinesis+T1': (course, course_run),
+                'course-v1:JediAcademy+AppliedTelekinesis+T2': (course, None),
+                'course-v1:JediAcademy+Unknown+T1': ({}, None),
+            }
+            get_courses_mock.assert_called_once()
+
+    def test_get_course_run_empty_response_is_not_cached(self):
+        """
+        Verify get_course_run of CourseCatalogApiClient looks up missing course runs again.
+        """
+        self.get_data_mock.return_value = {}
+        assert self.api.get_course_run('any') == {}
+        assert self.api.get_course_run('any') == {}
+        assert self.get_data_mock.call_count == 2
+
     @ddt.data(*EMPTY_RESPONSES)
     def test_get_course_run_empty_response(self, response):
         """
@@ -207,9 +390,12 @@ class TestCourseCatalogApi(CourseDiscoveryApiTestMixin, unittest.TestCase):
     @ddt.data(
         (
             "course-v1:JediAcademy+AppliedTelekinesis+T1",
-            {
-                "course": "JediAcademy+AppliedTelekinesis"
-            },
+            [
+                {
+                    "key": "course-v1:JediAcademy+AppliedTelekinesis+T1",
+                    "course": "JediAcademy+AppliedTelekinesis"
+                }
+            ],
             {
                 "course_runs": [{"key": "course-v1:JediAcademy+AppliedTelekinesis+T1"}]
             },
@@ -218,16 +404,19 @@ class TestCourseCatalogApi(CourseDiscoveryApiTestMixin, unittest.TestCase):
         ),
         (
             "course-v1:JediAcademy+AppliedTelekinesis+T1",
-            {},
+            [],
             {},
             None,
             None
         ),
         (
             "course-v1:JediAcademy+AppliedTelekinesis+T1",
-            {
-                "course": "JediAcademy+AppliedTelekinesis"
-            },
+            [
+                {
+                    "key": "course-v1:JediAcademy+AppliedTelekinesis+T1",
+                    "course": "JediAcademy+AppliedTelekinesis"
+                }
+            ],
             {
                 "course_runs": [
                     {"key": "course-v1:JediAcademy+AppliedTelekinesis+T222"},
@@ -239,9 +428,12 @@ class TestCourseCatalogApi(CourseDiscoveryApiTestMixin, unittest.TestCase):
         ),
         (
             "course-v1:JediAcademy+AppliedTelekinesis+T1",
-            {
-                "course": "JediAcademy+AppliedTelekinesis"
-            },
+            [
+                {
+                    "key": "course-v1:JediAcademy+AppliedTelekinesis+T1",
+                    "course": "JediAcademy+AppliedTelekinesis"
+                }
+            ],
             {
                 "course_runs": []
             },
@@ -383,6 +575,24 @@ class TestCourseCatalogApi(CourseDiscoveryApiTestMixin, unittest.TestCase):
 
         assert recieved_response == complete_response
 
+    def test_traverse_pagination_concurrently(self):
+        """
+        Verify `traverse_pagination` of CourseCatalogApiClient fetches the remaining pages at once when the total
+        count of results is known, and returns the results in order.
+        """
+        endpoint = mock.Mock()
+        endpoint.return_value.post.side_effect = lambda query, page, page_size: {
+            'count': 5,
+            'next': 'next' if page < 3 else None,
+            'results': [page * 10 + 1, page * 10 + 2][:5 - (page - 1) * 2],
+        }
+        first_page = {'count': 5, 'next': 'next', 'results': [11, 12]}
+
+        results = self.api.traverse_pagination(first_page, endpoint, 'query', {'page_size': 2}, workers=2)
+
+        assert results == [11, 12, 21, 22, 31]
+        assert sorted(call[1]['page'] for call in endpoint.return_value.post.call_args_list) == [2, 3]
+
     @responses.activate
     def test_get_catalog_results_with_exception(self):
         """
@@ -453,7 +663,7 @@ class TestCourseCatalogApiService(CourseDiscoveryApiTestMixin, unittest.TestCase
         self.user_mock = mock.Mock(spec=User)
         self.get_data_mock = self._make_patch(self._make_catalog_api_location("get_edx_api_data"))
         self.jwt_builder_mock = self._make_patch(self._make_catalog_api_location("JwtBuilder"))
-        self.integration_config_mock = mock.Mock(enabled=True)
+        self.integration_config_mock = mock.Mock(enabled=True, is_cache_enabled=True, cache_ttl=60)
         self.integration_config_mock.get_service_user.return_value = self.user_mock
         self.integration_mock = self._make_patch(self._make_catalog_api_location("CatalogIntegration"))
         self.integration_mock.current.return_value = self.integration_config_mock
@@ -66,3 +66,24 @@ class TestEcommerceApiClient(unittest.TestCase):
             }
         )
         assert EcommerceApiClient(self.user).get_course_final_price(mode) == '$100'
+
+    @mock.patch('enterprise.api_client.ecommerce.ecommerce_api_client')
+    def test_get_course_final_prices(self, ecommerce_api_client_mock):
+        modes = [
+            {'sku': 'verified-sku', 'min_price': 200, 'original_price': '$500'},
+            {'sku': 'professional-sku', 'min_price': 300, 'original_price': '$300'},
+        ]
+        prices = {'verified-sku': 100, 'professional-sku': 300}
+        ecommerce_api_client_mock.return_value.baskets.calculate.get.side_effect = (
+            lambda sku, **kwargs: {'total_incl_tax': prices[sku[0]]}
+        )
+        client = EcommerceApiClient(self.user)
+        assert client.get_course_final_prices(modes, enterprise_catalog_uuid='catalog-uuid') == ['$100', '$300']
+        ecommerce_api_client_mock.assert_called_once_with(self.user)
+        ecommerce_api_client_mock.return_value.baskets.calculate.get.assert_has_calls(
+            [
+                mock.call(sku=['verified-sku'], username=self.user.username, catalog='catalog-uuid'),
+                mock.call(sku=['professional-sku'], username=self.user.username, catalog='catalog-uuid'),
+            ],
+            any_order=True,
+        )
@@ -14,6 +14,7 @@ from django.conf import settings
 from django.core.cache import cache
 
 from enterprise.api_client import enterprise as enterprise_api
+from enterprise.api_client.caching import get_cached_value
 from enterprise.models import EnterpriseCustomerCatalog
 from enterprise.utils import get_cache_key, get_content_metadata_item_id
 from test_utils.factories import EnterpriseCustomerCatalogFactory, EnterpriseCustomerFactory, UserFactory
@@ -65,9 +66,10 @@ class TestEnterpriseApiClient(unittest.TestCase, EnterpriseMockMixin, CourseDisc
     @mock.patch('enterprise.api_client.lms.JwtBuilder', mock.Mock())
     @mock.patch('enterprise.api_client.discovery.get_edx_api_data', mock.Mock())
     @mock.patch('enterprise.api_client.discovery.JwtBuilder', mock.Mock())
-    def test_no_response_doesnt_get_cached(self):
+    @mock.patch('enterprise.api_client.caching.CACHE_EMPTY_TIMEOUT', 5)
+    def test_no_response_gets_cached_briefly(self):
         """
-        Response doesn't get cached when empty.
+        Response only gets cached for a short while when empty.
         """
         EnterpriseCustomerCatalogFactory(
             enterprise_customer=self.enterprise_customer,
@@ -87,15 +89,16 @@ class TestEnterpriseApiClient(unittest.TestCase, EnterpriseMockMixin, CourseDisc
 
         self.mock_empty_response('enterprise-catalogs-detail', enterprise_catalog_uuid)
         client = enterprise_api.EnterpriseApiClient(self.user)
-        response = client._load_data(  # pylint: disable=protected-access
-            resource=api_resource_name,
-            resource_id=enterprise_catalog_uuid,
-        )
+        with mock.patch('enterprise.api_client.caching.cache.set', wraps=cache.set) as mock_cache_set:
+            response = client._load_data(  # pylint: disable=protected-access
+                resource=api_resource_name,
+                resource_id=enterprise_catalog_uuid,
+            )
         assert not response
 
-        # The empty response is not cached.
-        cached_api_response = cache.get(cache_key)
-        assert not cached_api_response
+        # The empty response is only cached for a short while.
+        assert get_cached_value(cache_key, default='missing') == response
+        assert mock.call(cache_key, mock.ANY, 5) in mock_cache_set.call_args_list
 
     @mock.patch('enterprise.api_client.lms.JwtBuilder', mock.Mock())
     def test_skip_request_if_response_cached(self):
@@ -166,3 +166,30 @@ def test_enterprise_contains_content_items():
     client = enterprise_catalog.EnterpriseCatalogApiClient('staff-user-goes-here')
     actual_response = client.enterprise_contains_content_items(TEST_ENTERPRISE_ID, ['demoX'])
     assert actual_response == expected_response['contains_content_items']
+
+
+@responses.activate
+@mock.patch('enterprise.api_client.lms.JwtBuilder', mock.Mock())
+def test_get_content_metadata_pages():
+    url = _url("enterprise-catalogs/{catalog_uuid}/get_content_metadata/".format(
+        catalog_uuid=TEST_ENTERPRISE_CATALOG_UUID
+    ))
+    responses.add(
+        responses.GET,
+        url,
+        json={'next': url + '?page=2', 'results': [{'key': 'edX+DemoX', 'content_type': 'course'}]},
+        match_querystring=True,
+    )
+    responses.add(
+        responses.GET,
+        url + '?page=2',
+        json={'next': None, 'results': [{'key': 'edX+DemoY', 'content_type': 'course'}]},
+        match_querystring=True,
+    )
+    enterprise_customer_catalog = mock.Mock(uuid=TEST_ENTERPRISE_CATALOG_UUID)
+    client = enterprise_catalog.EnterpriseCatalogApiClient('staff-user-goes-here')
+    pages = client.get_content_metadata_pages(mock.Mock(), enterprise_catalogs=[enterprise_customer_catalog])
+    assert next(pages) == [{'key': 'edX+DemoX', 'content_type': 'course'}]
+    assert len(responses.calls) == 1
+    assert list(pages) == [[{'key': 'edX+DemoY', 'content_type': 'course'}]]
+    assert len(responses.calls) == 2
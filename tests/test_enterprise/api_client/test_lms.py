@@ -497,6 +497,32 @@ def test_get_remote_id():
     assert actual_response == "LukeIamYrFather"
 
 
+@responses.activate
+@mock.patch('enterprise.api_client.lms.JwtBuilder', mock.Mock())
+@mock.patch.object(lms_api.ThirdPartyAuthApiClient, 'USERNAMES_PER_REQUEST', 2)
+def test_get_remote_ids():
+    provider_id = "DeathStar"
+    for usernames, results in (
+            (
+                ['Darth', 'Hans'],
+                [{"username": "Darth", "remote_id": "Vader"}, {"username": "Hans", "remote_id": "Solo"}],
+            ),
+            (['Luke'], [{"username": "Obi-Wan", "remote_id": "Kenobi"}]),
+    ):
+        responses.add(
+            responses.GET,
+            _url("third_party_auth", "providers/{provider}/users?{querystring}".format(
+                provider=provider_id, querystring='&'.join('username=' + username for username in usernames)
+            )),
+            match_querystring=True,
+            json={"page": 1, "page_size": 200, "count": len(results), "next": None, "results": results},
+        )
+    client = lms_api.ThirdPartyAuthApiClient('staff-user-goes-here')
+    actual_response = client.get_remote_ids(provider_id, ['Luke', 'Hans', 'Darth', 'Darth'])
+    assert actual_response == {"Darth": "Vader", "Hans": "Solo"}
+    assert len(responses.calls) == 2
+
+
 @responses.activate
 @mock.patch('enterprise.api_client.lms.JwtBuilder', mock.Mock())
 def test_get_username_from_remote_id_not_found():
@@ -609,6 +635,27 @@ def test_jwt_lms_api_client_refresh_token():
     assert client.something_called == 3, "Wrapped method was called"
 
 
+@mock.patch('enterprise.api_client.lms.JwtBuilder')
+def test_jwt_lms_api_client_shares_tokens(mock_jwt_builder):
+    mock_jwt_builder.create_jwt_for_user.side_effect = 'jwt-for-{}'.format
+
+    clients = [
+        lms_api.EnrollmentApiClient('user-sharing-tokens'),
+        lms_api.GradesApiClient('user-sharing-tokens'),
+        lms_api.EnrollmentApiClient('other-user-sharing-tokens'),
+    ]
+    for client in clients:
+        client.connect()
+
+    assert [call[0][0] for call in mock_jwt_builder.create_jwt_for_user.call_args_list] == [
+        'user-sharing-tokens',
+        'other-user-sharing-tokens',
+    ]
+    assert clients[0].expires_at == clients[1].expires_at
+    assert clients[1].client._store['session'].auth.token == 'jwt-for-user-sharing-tokens'  # pylint: disable=protected-access
+    assert clients[0].client._store['session'] is not clients[1].client._store['session']  # pylint: disable=protected-access
+
+
 @responses.activate
 @mock.patch('enterprise.api_client.lms.JwtBuilder', mock.Mock())
 def test_get_course_grades_not_found():
@@ -671,6 +718,65 @@ def test_get_course_grade():
     assert actual_response == expected_response[0]
 
 
+@responses.activate
+@mock.patch('enterprise.api_client.lms.JwtBuilder', mock.Mock())
+def test_get_all_course_grades():
+    course_id = "course-v1:edX+DemoX+Demo_Course"
+    first_page = [{
+        "username": "DarthVadar",
+        "course_key": course_id,
+        "passed": True,
+        "percent": 0.75,
+        "letter_grade": 'C',
+    }]
+    second_page = [{
+        "username": "bob",
+        "course_key": course_id,
+        "passed": False,
+        "percent": 0.03,
+        "letter_grade": None,
+    }]
+    responses.add(
+        responses.GET,
+        _url("course_grades", "courses/{course}/".format(course=course_id)),
+        match_querystring=True,
+        json={
+            "next": _url("course_grades", "courses/{course}/?cursor=abc".format(course=course_id)),
+            "previous": None,
+            "results": first_page,
+        },
+    )
+    responses.add(
+        responses.GET,
+        _url("course_grades", "courses/{course}/?cursor=abc".format(course=course_id)),
+        match_querystring=True,
+        json={
+            "next": None,
+            "previous": None,
+            "results": second_page,
+        },
+    )
+    client = lms_api.GradesApiClient('staff-user-goes-here')
+    actual_response = client.get_course_grades(course_id)
+    assert actual_response == first_page + second_page
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+@mock.patch('enterprise.api_client.lms.JwtBuilder', mock.Mock())
+def test_get_all_course_grades_not_found():
+    course_id = "course-v1:edX+DemoX+Demo_Course"
+    responses.add(
+        responses.GET,
+        _url("course_grades", "courses/{course}/".format(course=course_id)),
+        match_querystring=True,
+        status=404
+    )
+    client = lms_api.GradesApiClient('staff-user-goes-here')
+    with raises(HttpNotFoundError):
+        client.get_course_grades(course_id)
+
+
 @responses.activate
 @mock.patch('enterprise.api_client.lms.JwtBuilder', mock.Mock())
 def test_get_course_certificate_not_found():
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the django management command `backfill_course_run_keys`.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import mock
+from pytest import mark, raises
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from enterprise.models import CourseRunKeyMapping
+from test_utils.factories import EnterpriseCourseEnrollmentFactory
+
+
+@mark.django_db
+class BackfillCourseRunKeysCommandTests(TestCase):
+    """
+    Test command `backfill_course_run_keys`.
+    """
+    command = 'backfill_course_run_keys'
+
+    def setUp(self):
+        super(BackfillCourseRunKeysCommandTests, self).setUp()
+        catalog_client_mock = mock.patch(
+            'enterprise.management.commands.backfill_course_run_keys.get_course_catalog_api_service_client'
+        )
+        self.catalog_client_mock = catalog_client_mock.start()
+        self.addCleanup(catalog_client_mock.stop)
+
+    def test_backfill_from_enrollments(self):
+        """
+        Test that the command looks up the enrolled course runs which are not mapped yet, in batches.
+        """
+        CourseRunKeyMapping.objects.create(course_run_id='course-v1:edX+DemoX+T1', course_key='edX+DemoX')
+        for course_run_id in ('course-v1:edX+DemoX+T1', 'course-v1:edX+DemoX+T2', 'course-v1:edX+DemoY+T1'):
+            EnterpriseCourseEnrollmentFactory(course_id=course_run_id)
+            EnterpriseCourseEnrollmentFactory(course_id=course_run_id)
+
+        call_command(self.command, '--batch_size', '1')
+
+        get_course_ids = self.catalog_client_mock.return_value.get_course_ids
+        assert sorted(call[0][0] for call in get_course_ids.call_args_list) == [
+            ['course-v1:edX+DemoX+T2'],
+            ['course-v1:edX+DemoY+T1'],
+        ]
+
+    def test_backfill_from_discovery(self):
+        """
+        Test that the command stores the course keys of every course run listed by the course catalog.
+        """
+        CourseRunKeyMapping.objects.create(course_run_id='course-v1:edX+DemoX+T1', course_key='edX+DemoX')
+        self.catalog_client_mock.return_value.get_course_run_pages.return_value = iter([
+            [
+                {'key': 'course-v1:edX+DemoX+T1', 'course': 'edX+DemoX'},
+                {'key': 'course-v1:edX+DemoX+T2', 'course': 'edX+DemoX'},
+            ],
+            [
+                {'key': 'course-v1:edX+DemoY+T1', 'course': 'edX+DemoY'},
+                {'key': 'course-v1:edX+Orphan+T1', 'course': None},
+            ],
+        ])
+
+        call_command(self.command, '--source', 'discovery', '--batch_size', '2')
+
+        self.catalog_client_mock.return_value.get_course_run_pages.assert_called_once_with(page_size=2)
+        assert dict(CourseRunKeyMapping.objects.values_list('course_run_id', 'course_key')) == {
+            'course-v1:edX+DemoX+T1': 'edX+DemoX',
+            'course-v1:edX+DemoX+T2': 'edX+DemoX',
+            'course-v1:edX+DemoY+T1': 'edX+DemoY',
+        }
+
+    def test_catalog_improperly_configured(self):
+        """
+        Test that the command fails when the course catalog client is unavailable.
+        """
+        self.catalog_client_mock.side_effect = ImproperlyConfigured('There is no active CatalogIntegration.')
+        with raises(CommandError) as excinfo:
+            call_command(self.command)
+        assert str(excinfo.value) == 'There is no active CatalogIntegration.'
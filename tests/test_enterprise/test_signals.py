@@ -25,7 +25,10 @@ from enterprise.models import (
     SystemWideEnterpriseUserRoleAssignment,
 )
 from enterprise.signals import create_enterprise_enrollment_receiver, handle_user_post_save
+from enterprise.utils import get_consent_page_cache_version
 from test_utils.factories import (
+    DataSharingConsentTextOverridesFactory,
+    EnterpriseCustomerBrandingConfigurationFactory,
     EnterpriseCustomerCatalogFactory,
     EnterpriseCustomerFactory,
     EnterpriseCustomerUserFactory,
@@ -625,3 +628,41 @@ class TestEnterpriseCatalogSignals(unittest.TestCase):
             enabled_course_modes=enterprise_catalog.enabled_course_modes,
             publish_audit_enrollment_urls=enterprise_catalog.publish_audit_enrollment_urls
         )
+
+
+@mark.django_db
+@ddt.ddt
+class TestConsentPageCacheSignals(unittest.TestCase):
+    """
+    Tests the signals which drop the cached data sharing consent page contexts of an enterprise customer.
+    """
+
+    @ddt.data(
+        (EnterpriseCustomerBrandingConfigurationFactory, False),
+        (EnterpriseCustomerBrandingConfigurationFactory, True),
+        (DataSharingConsentTextOverridesFactory, False),
+        (DataSharingConsentTextOverridesFactory, True),
+    )
+    @ddt.unpack
+    def test_related_object_changes(self, factory, delete):
+        enterprise_customer = EnterpriseCustomerFactory()
+        related_object = factory(enterprise_customer=enterprise_customer)
+        version = get_consent_page_cache_version(enterprise_customer.uuid)
+        assert get_consent_page_cache_version(enterprise_customer.uuid) == version
+
+        if delete:
+            related_object.delete()
+        else:
+            related_object.save()
+        assert get_consent_page_cache_version(enterprise_customer.uuid) != version
+
+    def test_enterprise_customer_changes(self):
+        enterprise_customer = EnterpriseCustomerFactory()
+        version = get_consent_page_cache_version(enterprise_customer.uuid)
+        other_enterprise_customer = EnterpriseCustomerFactory()
+        other_version = get_consent_page_cache_version(other_enterprise_customer.uuid)
+
+        enterprise_customer.name = 'New name'
+        enterprise_customer.save()
+        assert get_consent_page_cache_version(enterprise_customer.uuid) != version
+        assert get_consent_page_cache_version(other_enterprise_customer.uuid) == other_version
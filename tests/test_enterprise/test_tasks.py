@@ -6,15 +6,33 @@ from __future__ import absolute_import, unicode_literals, with_statement
 
 import unittest
 
+import ddt
 import mock
-from pytest import mark
+from pytest import mark, raises
 
-from enterprise.models import EnterpriseCourseEnrollment, EnterpriseEnrollmentSource
-from enterprise.tasks import create_enterprise_enrollment
-from test_utils.factories import EnterpriseCustomerFactory, EnterpriseCustomerUserFactory, UserFactory
+from django.test import override_settings
+
+from enterprise.models import (
+    EnterpriseCourseEnrollment,
+    EnterpriseCustomerCourseEnrollmentsJob,
+    EnterpriseEnrollmentSource,
+    PendingEnrollment,
+)
+from enterprise.tasks import (
+    create_enterprise_enrollment,
+    process_course_enrollments_job,
+    refresh_catalog_membership_index,
+)
+from test_utils.factories import (
+    EnterpriseCustomerCatalogFactory,
+    EnterpriseCustomerFactory,
+    EnterpriseCustomerUserFactory,
+    UserFactory,
+)
 
 
 @mark.django_db
+@ddt.ddt
 class TestEnterpriseTasks(unittest.TestCase):
     """
     Tests tasks associated with Enterprise.
@@ -98,3 +116,100 @@ class TestEnterpriseTasks(unittest.TestCase):
             self.enterprise_customer_user.id
         )
         assert EnterpriseCourseEnrollment.objects.count() == 1
+
+    @mock.patch('enterprise.models.EnterpriseCustomerCatalog.refresh_membership_index')
+    def test_refresh_catalog_membership_index(self, mock_refresh_membership_index):
+        """
+        Task should rebuild the membership index of the given catalog.
+        """
+        mock_refresh_membership_index.return_value = ['edX+DemoX']
+        catalog = EnterpriseCustomerCatalogFactory(enterprise_customer=self.enterprise_customer)
+
+        refresh_catalog_membership_index(str(catalog.uuid))
+        mock_refresh_membership_index.assert_called_once_with()
+
+    @mock.patch('enterprise.models.EnterpriseCustomerCatalog.refresh_membership_index')
+    def test_refresh_catalog_membership_index_missing_catalog(self, mock_refresh_membership_index):
+        """
+        Task should return without doing anything if the catalog no longer exists.
+        """
+        refresh_catalog_membership_index('ee5e6b3a-069a-4947-bb8d-d2dbc323396c')
+        mock_refresh_membership_index.assert_not_called()
+
+    @override_settings(ENTERPRISE_COURSE_ENROLLMENTS_JOB_CHUNK_SIZE=2)
+    @mock.patch('enterprise.models.EnterpriseCustomer.catalog_contains_course', mock.Mock(return_value=True))
+    @mock.patch('enterprise.models.utils.track_event', mock.Mock())
+    @mock.patch('enterprise.models.EnrollmentApiClient')
+    def test_process_course_enrollments_job(self, mock_enrollment_client):
+        """
+        Task should process the enrollment requests of the job in chunks, recording the outcome of each of them.
+        """
+        mock_enrollment_client.return_value.get_course_enrollment.return_value = None
+        payload = [
+            {'course_mode': 'audit', 'course_run_id': self.FAKE_COURSE_ID, 'lms_user_id': self.user.id},
+            {'course_mode': 'audit', 'course_run_id': self.FAKE_COURSE_ID},
+            {'course_mode': 'audit', 'course_run_id': self.FAKE_COURSE_ID, 'user_email': 'new@example.com'},
+        ]
+        job = EnterpriseCustomerCourseEnrollmentsJob.objects.create(
+            enterprise_customer=self.enterprise_customer,
+            requester_id=self.user.id,
+            payload=payload,
+            total_count=len(payload),
+        )
+
+        process_course_enrollments_job(str(job.uuid))
+
+        job.refresh_from_db()
+        assert job.status == EnterpriseCustomerCourseEnrollmentsJob.COMPLETED
+        assert (job.processed_count, job.succeeded_count, job.failed_count) == (3, 2, 1)
+        assert job.results[0] == {'detail': 'success'}
+        assert 'non_field_errors' in job.results[1]
+        assert job.results[2] == {'detail': 'success'}
+        assert job.payload == []
+        mock_enrollment_client.return_value.enroll_user_in_course.assert_called_once_with(
+            self.user.username, self.FAKE_COURSE_ID, 'audit', cohort=None
+        )
+        assert EnterpriseCourseEnrollment.objects.filter(
+            enterprise_customer_user=self.enterprise_customer_user,
+            course_id=self.FAKE_COURSE_ID,
+        ).exists()
+        assert PendingEnrollment.objects.filter(
+            user__user_email='new@example.com',
+            course_id=self.FAKE_COURSE_ID,
+        ).exists()
+
+    @mock.patch('enterprise.api.v1.serializers.EnterpriseCustomerCourseEnrollmentsSerializer')
+    def test_process_course_enrollments_job_failed(self, mock_serializer):
+        """
+        Task should mark the job as failed and clear its payload if processing it raises an error.
+        """
+        mock_serializer.return_value.save.side_effect = ValueError('Unexpected error')
+        job = EnterpriseCustomerCourseEnrollmentsJob.objects.create(
+            enterprise_customer=self.enterprise_customer,
+            requester_id=self.user.id,
+            payload=[{'course_mode': 'audit', 'course_run_id': self.FAKE_COURSE_ID, 'lms_user_id': self.user.id}],
+            total_count=1,
+        )
+
+        with raises(ValueError):
+            process_course_enrollments_job(str(job.uuid))
+
+        job.refresh_from_db()
+        assert job.status == EnterpriseCustomerCourseEnrollmentsJob.FAILED
+        assert job.payload == []
+        assert job.processed_count == 0
+
+    @ddt.data(EnterpriseCustomerCourseEnrollmentsJob.COMPLETED, EnterpriseCustomerCourseEnrollmentsJob.FAILED)
+    @mock.patch('enterprise.api.v1.serializers.EnterpriseCustomerCourseEnrollmentsSerializer')
+    def test_process_course_enrollments_job_finished(self, status, mock_serializer):
+        """
+        Task should return without doing anything if the job is completed or has failed already.
+        """
+        job = EnterpriseCustomerCourseEnrollmentsJob.objects.create(
+            enterprise_customer=self.enterprise_customer,
+            requester_id=self.user.id,
+            status=status,
+        )
+
+        process_course_enrollments_job(str(job.uuid))
+        mock_serializer.assert_not_called()
@@ -989,6 +989,51 @@ class TestGrantDataSharingPermissionsWithDB(TestCase):
         for key, value in expected_context.items():
             assert response.context[key] == value  # pylint:disable=no-member
 
+    @mock.patch('enterprise.views.render', side_effect=fake_render)
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    @mock.patch('enterprise.views.CourseApiClient')
+    @mock.patch('enterprise.views.get_data_sharing_consent')
+    def test_db_data_sharing_consent_page_data_cached(
+            self,
+            get_data_sharing_consent_mock,
+            course_api_client_mock,
+            course_catalog_api_client_view_mock,
+            *args
+    ):  # pylint: disable=unused-argument,invalid-name
+        """
+        The context shared by the learners of a course is cached until the consent page text overrides change.
+        """
+        get_data_sharing_consent_mock.return_value.consent_required.return_value = True
+        get_data_sharing_consent_mock.return_value.enterprise_customer = self.enterprise_customer
+        course_api_client_mock.return_value.get_course_details.return_value = {'name': 'edX Demo Course'}
+        course_catalog_api_client_view_mock.return_value.get_course_run.return_value = self.course_run_details
+        self._login()
+        params = {
+            'enterprise_customer_uuid': str(self.enterprise_customer.uuid),
+            'course_id': self.course_id,
+            'next': self.next_url,
+            'failure_url': self.failure_url,
+        }
+
+        for defer_creation in (False, True):
+            if defer_creation:
+                params['defer_creation'] = True
+            response = self.client.get(self.url, data=params)
+            assert response.status_code == 200
+            assert response.context['policy_paragraph'] == 'Policy paragraph'  # pylint:disable=no-member
+            assert response.context['course_title'] == 'Demo Course'  # pylint:disable=no-member
+            # The request-specific part of the context is not cached.
+            assert response.context['defer_creation'] == defer_creation  # pylint:disable=no-member
+        course_api_client_mock.return_value.get_course_details.assert_called_once_with(self.course_id)
+        course_catalog_api_client_view_mock.return_value.get_course_run.assert_called_once_with(self.course_id)
+        assert get_data_sharing_consent_mock.call_count == 2
+
+        self.dsc_page.policy_paragraph = 'Updated policy paragraph'
+        self.dsc_page.save()
+        response = self.client.get(self.url, data=params)
+        assert response.context['policy_paragraph'] == 'Updated policy paragraph'  # pylint:disable=no-member
+        assert course_catalog_api_client_view_mock.return_value.get_course_run.call_count == 2
+
     @mock.patch('enterprise.views.render', side_effect=fake_render)
     @ddt.data(True, False)
     def test_db_data_sharing_consent_page_preview_mode_non_staff(
@@ -404,6 +404,43 @@ class TestProgramEnrollmentView(EmbargoAPIMixin, MessagesMixin, TestCase):
         response = self.client.get(program_enrollment_page_url)
         self._check_expected_enrollment_page(response, expected_context)
 
+    @mock.patch('enterprise.views.render', side_effect=fake_render)
+    @mock.patch('enterprise.api_client.lms.embargo_api')
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    @mock.patch('enterprise.views.ProgramDataExtender')
+    def test_get_program_enrollment_page_courses_looked_up_in_bulk(
+            self,
+            program_data_extender_mock,
+            course_catalog_api_client_mock,
+            embargo_api_mock,
+            *args
+    ):  # pylint: disable=unused-argument,invalid-name
+        """
+        The courses of the program are looked up in bulk, and cached for the next time the page is rendered.
+        """
+        self._setup_embargo_api(embargo_api_mock)
+        self._setup_program_data_extender(program_data_extender_mock)
+        setup_course_catalog_api_client_mock(course_catalog_api_client_mock)
+        course_catalog_api_client = course_catalog_api_client_mock.return_value
+        enterprise_customer = EnterpriseCustomerFactory(name='Starfleet Academy')
+        program_enrollment_page_url = reverse(
+            'enterprise_program_enrollment_page',
+            args=[enterprise_customer.uuid, self.dummy_program_uuid],
+        )
+
+        self._login()
+        for __ in range(2):
+            response = self.client.get(program_enrollment_page_url)
+            assert response.status_code == 200
+            assert [course['course_title'] for course in response.context['courses']] == [  # pylint: disable=no-member
+                'edX Demonstration Course', 'edX Demonstration Course',
+            ]
+
+        course_catalog_api_client.get_courses_and_course_runs.assert_called_once_with({
+            course['course_runs'][0]['key'] for course in self.dummy_program['courses']
+        })
+        course_catalog_api_client.get_course_and_course_run.assert_not_called()
+
     @mock.patch('enterprise.views.render', side_effect=fake_render)
     @mock.patch('enterprise.api_client.lms.embargo_api')
     @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
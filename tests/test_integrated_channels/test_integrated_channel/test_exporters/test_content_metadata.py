@@ -88,3 +88,28 @@ class TestContentMetadataExporter(unittest.TestCase, EnterpriseMockMixin):
                 self.enterprise_customer_catalog.enterprise_customer.name
             )
             assert expected_message in log_capture.records[0].getMessage()
+
+    @responses.activate
+    @mock.patch('enterprise.api_client.enterprise.EnterpriseApiClient.get_content_metadata_pages')
+    def test_export_pages(self, mock_get_content_metadata_pages):
+        """
+        ``ContentMetadataExporter``'s ``export_pages`` exports each page of content metadata, skipping the items
+        which were already exported on an earlier page.
+        """
+        mock_get_content_metadata_pages.return_value = iter([
+            [
+                {'key': 'edX+DemoX', 'content_type': 'course'},
+                {'key': 'edX+DemoY', 'content_type': 'course'},
+            ],
+            [
+                {'key': 'edX+DemoY', 'content_type': 'course'},
+            ],
+            [
+                {'key': 'edX+DemoY', 'content_type': 'course'},
+                {'key': 'edX+DemoZ', 'content_type': 'course'},
+            ],
+        ])
+        exporter = ContentMetadataExporter('fake-user', self.config)
+        pages = [list(page.keys()) for page in exporter.export_pages()]
+        assert pages == [['edX+DemoX', 'edX+DemoY'], ['edX+DemoZ']]
+        assert mock_get_content_metadata_pages.call_args[0][0] == self.enterprise_customer_catalog.enterprise_customer
@@ -11,11 +11,14 @@ import unittest
 import ddt
 import mock
 from freezegun import freeze_time
+from opaque_keys.edx.keys import CourseKey
 from pytest import mark
 from slumber.exceptions import HttpNotFoundError
 
 from django.utils import timezone
 
+from enterprise.api_client.lms import JwtLmsApiClient
+from enterprise.models import EnterpriseCourseEnrollment
 from integrated_channels.integrated_channel.exporters.learner_data import LearnerExporter
 from integrated_channels.integrated_channel.models import LearnerDataTransmissionAudit
 from test_utils import factories
@@ -64,11 +67,21 @@ class TestLearnerExporter(unittest.TestCase):
         self.tpa_client = tpa_client_mock.start().return_value
         # Default remote ID
         self.tpa_client.get_remote_id.return_value = 'fake-remote-id'
+        self.tpa_client.get_remote_ids.return_value = {self.user.username: 'fake-remote-id'}
         self.addCleanup(tpa_client_mock.stop)
         self.exporter = self.config.get_learner_data_exporter('dummy-user')
         assert isinstance(self.exporter, LearnerExporter)
         super(TestLearnerExporter, self).setUp()
 
+    def _mock_remote_ids(self, learners_without_remote_id=()):
+        """
+        Mock the bulk remote id lookup, giving a remote id to every learner but the given ones.
+        """
+        self.tpa_client.get_remote_ids.side_effect = lambda identity_provider, usernames: {
+            username: 'remote-id-{}'.format(username)
+            for username in usernames if username not in learners_without_remote_id
+        }
+
     def test_collect_learner_data_no_enrollments(self):
         learner_data = list(self.exporter.export())
         assert not learner_data
@@ -193,6 +206,7 @@ class TestLearnerExporter(unittest.TestCase):
         )
         # No SSO user attached
         self.tpa_client.get_remote_id.return_value = None
+        self.tpa_client.get_remote_ids.return_value = {}
 
         # Raise 404 - no certificate found
         mock_certificate_api.return_value.get_course_certificate.side_effect = HttpNotFoundError
@@ -420,6 +434,7 @@ class TestLearnerExporter(unittest.TestCase):
             enterprise_customer=self.enterprise_customer,
             granted=True
         )
+        self.tpa_client.get_remote_ids.return_value = {'C3PO': 'fake-remote-id', 'R2D2': 'other-fake-remote-id'}
 
         def get_course_details(course_id):
             """
@@ -465,6 +480,13 @@ class TestLearnerExporter(unittest.TestCase):
             learner_data = list(self.exporter.export())
 
         assert len(learner_data) == 6
+        # The remote ids of the learners are looked up once, in bulk.
+        self.tpa_client.get_remote_ids.assert_called_once_with(self.idp.provider_id, {'C3PO', 'R2D2'})
+        self.tpa_client.get_remote_id.assert_not_called()
+        assert [record.sapsf_user_id for record in learner_data] == [
+            'fake-remote-id', 'fake-remote-id', 'other-fake-remote-id', 'other-fake-remote-id',
+            'fake-remote-id', 'fake-remote-id',
+        ]
 
         assert learner_data[0].course_id == self.course_key
         assert learner_data[1].course_id == self.course_id
@@ -586,3 +608,383 @@ class TestLearnerExporter(unittest.TestCase):
         assert mock_enrollment_api.call_count == 0
         assert mock_course_api.call_count == 0
         assert mock_grades_api.call_count == 0
+
+    @ddt.data('self', 'instructor')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.EnrollmentApiClient')
+    @mock.patch('enterprise.models.EnrollmentApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.CertificatesApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.GradesApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.CourseApiClient')
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    def test_learner_data_concurrent_fetch(
+            self,
+            pacing,
+            mock_course_catalog_api,
+            mock_course_api,
+            mock_grades_api,
+            mock_certificate_api,
+            mock_enrollment_api,
+            mock_exporter_enrollment_api,
+    ):
+        """
+        Fetching LMS data on several workers yields the same records, in the same order, as fetching serially.
+        """
+        mock_course_catalog_api.return_value.get_course_id.return_value = self.course_key
+        self._mock_remote_ids()
+        course_ids = [self.course_id, 'course-v1:edX+DemoX+DemoCourse2']
+        for index in range(12):
+            user = factories.UserFactory(username='learner{}'.format(index), id=index + 10)
+            enterprise_customer_user = factories.EnterpriseCustomerUserFactory(
+                user_id=user.id,
+                enterprise_customer=self.enterprise_customer,
+            )
+            for course_id in course_ids:
+                factories.EnterpriseCourseEnrollmentFactory(
+                    enterprise_customer_user=enterprise_customer_user,
+                    course_id=course_id,
+                )
+                factories.DataSharingConsentFactory(
+                    username=user.username,
+                    course_id=course_id,
+                    enterprise_customer=self.enterprise_customer,
+                    granted=True,
+                )
+
+        mock_course_api.return_value.get_course_details.side_effect = lambda course_id: dict(
+            pacing=pacing,
+            course_id=course_id,
+        )
+
+        def get_course_certificate(course_id, username):  # pylint: disable=unused-argument
+            """
+            Mock certificate data - only even-numbered learners have a certificate.
+            """
+            if int(username[len('learner'):]) % 2:
+                raise HttpNotFoundError
+            return dict(username=username, is_passing=True)
+        mock_certificate_api.return_value.get_course_certificate.side_effect = get_course_certificate
+
+        mock_grades_api.return_value.get_course_grade.side_effect = lambda course_id, username: dict(
+            passed=int(username[len('learner'):]) % 2 == 0,
+            course_key=course_id,
+            username=username,
+        )
+
+        def get_course_enrollment(username, course_id):  # pylint: disable=unused-argument
+            """
+            Mock enrollment data - every third learner is enrolled in audit mode.
+            """
+            return dict(mode='audit' if int(username[len('learner'):]) % 3 == 0 else 'verified')
+        mock_enrollment_api.return_value.get_course_enrollment.side_effect = get_course_enrollment
+        mock_exporter_enrollment_api.return_value.get_course_enrollment.side_effect = get_course_enrollment
+
+        def export_summary():
+            """
+            Export the learner data and summarize the exported records.
+            """
+            with freeze_time(self.NOW):
+                return [
+                    (report.enterprise_course_enrollment_id, report.course_id, report.grade, report.course_completed)
+                    for report in self.exporter.export()
+                ]
+
+        serial_learner_data = export_summary()
+        assert mock_exporter_enrollment_api.call_count == 0
+
+        self.config.learner_data_fetch_workers = 4
+        self.config.save()
+        self.exporter = self.config.get_learner_data_exporter('dummy-user')
+        concurrent_learner_data = export_summary()
+
+        # 8 of the 12 learners aren't in audit mode, with 2 records for each of their 2 enrollments.
+        assert len(serial_learner_data) == 32
+        assert concurrent_learner_data == serial_learner_data
+        mock_exporter_enrollment_api.return_value.get_course_enrollment.assert_called()
+
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.EnrollmentApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.GradesApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.CourseApiClient')
+    def test_learner_data_concurrent_fetch_skips_audit_grades(
+            self,
+            mock_course_api,
+            mock_grades_api,
+            mock_enrollment_api,
+    ):
+        """
+        Grades aren't fetched for audit enrollments when the customer doesn't report on audit enrollments.
+        """
+        factories.EnterpriseCourseEnrollmentFactory(
+            enterprise_customer_user=self.enterprise_customer_user,
+            course_id=self.course_id,
+        )
+        self.config.learner_data_fetch_workers = 2
+        self.config.save()
+        mock_course_api.return_value.get_course_details.return_value = dict(
+            pacing='self',
+            course_id=self.course_id,
+        )
+        mock_enrollment_api.return_value.get_course_enrollment.return_value = dict(mode='audit')
+
+        learner_data = list(self.config.get_learner_data_exporter('dummy-user').export())
+
+        assert not learner_data
+        mock_enrollment_api.return_value.get_course_enrollment.assert_called_once_with(
+            self.user.username, self.course_id
+        )
+        assert mock_grades_api.return_value.get_course_grade.call_count == 0
+
+    @ddt.data(1, 3)
+    @mock.patch('enterprise.models.EnrollmentApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.EnrollmentApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.GradesApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.CourseApiClient')
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    def test_learner_data_bulk_fetch_course_grades(
+            self,
+            fetch_workers,
+            mock_course_catalog_api,
+            mock_course_api,
+            mock_grades_api,
+            mock_exporter_enrollment_api,
+            mock_enrollment_api,
+    ):
+        """
+        The grades of a course run are fetched once for all of its learners when fetching course grades in bulk.
+        """
+        mock_course_catalog_api.return_value.get_course_id.return_value = self.course_key
+        self._mock_remote_ids()
+        self.config.bulk_fetch_course_grades = True
+        self.config.learner_data_fetch_workers = fetch_workers
+        self.config.save()
+
+        course_id2 = 'course-v1:edX+DemoX+DemoCourse2'
+        enrollment_ids = []
+        for username in ('learner1', 'learner2', 'learner3'):
+            enterprise_customer_user = factories.EnterpriseCustomerUserFactory(
+                user_id=factories.UserFactory(username=username).id,
+                enterprise_customer=self.enterprise_customer,
+            )
+            for course_id in (self.course_id, course_id2):
+                enrollment_ids.append(factories.EnterpriseCourseEnrollmentFactory(
+                    enterprise_customer_user=enterprise_customer_user,
+                    course_id=course_id,
+                ).id)
+                factories.DataSharingConsentFactory(
+                    username=username,
+                    course_id=course_id,
+                    enterprise_customer=self.enterprise_customer,
+                    granted=True,
+                )
+
+        mock_course_api.return_value.get_course_details.side_effect = lambda course_id: dict(
+            pacing='self',
+            course_id=course_id,
+        )
+        # learner3 has no grade in either course run.
+        mock_grades_api.return_value.get_course_grades.side_effect = lambda course_id: [
+            dict(username='learner1', course_key=course_id, passed=True),
+            dict(username='learner2', course_key=course_id, passed=False),
+            dict(username='someone-else', course_key=course_id, passed=True),
+        ]
+        for enrollment_api in (mock_enrollment_api, mock_exporter_enrollment_api):
+            enrollment_api.return_value.get_course_enrollment.return_value = dict(mode='verified')
+
+        with freeze_time(self.NOW):
+            learner_data = list(self.config.get_learner_data_exporter('dummy-user').export())
+
+        assert mock_grades_api.return_value.get_course_grades.call_args_list == [
+            mock.call(self.course_id),
+            mock.call(course_id2),
+        ]
+        assert mock_grades_api.return_value.get_course_grade.call_count == 0
+
+        # Every enrollment has 2 records; learner3's have no grade.
+        assert len(learner_data) == 12
+        grades_by_enrollment = {report.enterprise_course_enrollment_id: report.grade for report in learner_data}
+        assert sorted(grades_by_enrollment) == sorted(enrollment_ids)
+        assert [grades_by_enrollment[enrollment_id] for enrollment_id in enrollment_ids] == [
+            LearnerExporter.GRADE_PASSING,
+            LearnerExporter.GRADE_PASSING,
+            LearnerExporter.GRADE_INCOMPLETE,
+            LearnerExporter.GRADE_INCOMPLETE,
+            None,
+            None,
+        ]
+
+    def _create_unchanged_enrollment(self, username):
+        """
+        Create a consenting enrollment for a new learner, last modified a week ago.
+        """
+        enrollment = factories.EnterpriseCourseEnrollmentFactory(
+            enterprise_customer_user=factories.EnterpriseCustomerUserFactory(
+                user_id=factories.UserFactory(username=username).id,
+                enterprise_customer=self.enterprise_customer,
+            ),
+            course_id=self.course_id,
+        )
+        factories.DataSharingConsentFactory(
+            username=username,
+            course_id=self.course_id,
+            enterprise_customer=self.enterprise_customer,
+            granted=True,
+        )
+        EnterpriseCourseEnrollment.objects.filter(pk=enrollment.pk).update(
+            modified=self.NOW - datetime.timedelta(days=7)
+        )
+        return enrollment
+
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.CourseEnrollment')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.GeneratedCertificate')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.PersistentCourseGrade')
+    @mock.patch('enterprise.models.EnrollmentApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.GradesApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.CourseApiClient')
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    def test_learner_data_changed_since(
+            self,
+            mock_course_catalog_api,
+            mock_course_api,
+            mock_grades_api,
+            mock_enrollment_api,
+            mock_persistent_course_grade,
+            mock_generated_certificate,
+            mock_course_enrollment,
+    ):
+        """
+        Only the enrollments which changed since the given time, or whose last transmission failed, are exported.
+        """
+        mock_course_catalog_api.return_value.get_course_id.return_value = self.course_key
+        self._mock_remote_ids()
+        mock_course_api.return_value.get_course_details.return_value = dict(pacing='self', course_id=self.course_id)
+        mock_grades_api.return_value.get_course_grade.return_value = dict(passed=True)
+        mock_enrollment_api.return_value.get_course_enrollment.return_value = dict(mode='verified')
+
+        graded, certified, failed = [
+            self._create_unchanged_enrollment(username) for username in ('learner1', 'learner2', 'learner3')
+        ]
+        # This learner's enrollment, grade and certificate did not change.
+        self._create_unchanged_enrollment('learner4')
+        new_enrollment = factories.EnterpriseCourseEnrollmentFactory(
+            enterprise_customer_user=self.enterprise_customer_user,
+            course_id=self.course_id,
+        )
+        LearnerDataTransmissionAudit.objects.create(
+            enterprise_course_enrollment_id=failed.id,
+            course_id=self.course_id,
+            completed_timestamp=self.NOW_TIMESTAMP,
+            grade=LearnerExporter.GRADE_PASSING,
+            status='500',
+            error_message='Failed to send',
+        )
+        mock_persistent_course_grade.objects.filter.return_value.values_list.return_value = [
+            (graded.enterprise_customer_user.user_id, CourseKey.from_string(self.course_id)),
+        ]
+        mock_generated_certificate.objects.filter.return_value.values_list.return_value = [
+            (certified.enterprise_customer_user.user_id, CourseKey.from_string(self.course_id)),
+        ]
+        mock_course_enrollment.history.filter.return_value.values_list.return_value = []
+
+        with freeze_time(self.NOW):
+            learner_data = list(self.exporter.export(
+                changed_since=self.YESTERDAY,
+                TransmissionAudit=LearnerDataTransmissionAudit,
+            ))
+
+        assert {report.enterprise_course_enrollment_id for report in learner_data} == {
+            graded.id, certified.id, failed.id, new_enrollment.id,
+        }
+        mock_persistent_course_grade.objects.filter.assert_called_once_with(
+            user_id__in=mock.ANY,
+            modified__gte=self.YESTERDAY,
+        )
+        mock_generated_certificate.objects.filter.assert_called_once_with(
+            user_id__in=mock.ANY,
+            modified_date__gte=self.YESTERDAY,
+        )
+
+    @mock.patch('enterprise.models.EnrollmentApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.GradesApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.CourseApiClient')
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    def test_learner_data_changed_since_without_lms_models(
+            self,
+            mock_course_catalog_api,
+            mock_course_api,
+            mock_grades_api,
+            mock_enrollment_api,
+    ):
+        """
+        Every enrollment is exported when the LMS models needed to tell what changed are not available.
+        """
+        mock_course_catalog_api.return_value.get_course_id.return_value = self.course_key
+        self._mock_remote_ids()
+        mock_course_api.return_value.get_course_details.return_value = dict(pacing='self', course_id=self.course_id)
+        mock_grades_api.return_value.get_course_grade.return_value = dict(passed=True)
+        mock_enrollment_api.return_value.get_course_enrollment.return_value = dict(mode='verified')
+        enrollments = [self._create_unchanged_enrollment(username) for username in ('learner1', 'learner2')]
+
+        with freeze_time(self.NOW):
+            learner_data = list(self.exporter.export(changed_since=self.YESTERDAY))
+
+        assert {report.enterprise_course_enrollment_id for report in learner_data} == {
+            enrollment.id for enrollment in enrollments
+        }
+
+    @mock.patch('enterprise.models.EnrollmentApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.GradesApiClient')
+    @mock.patch('integrated_channels.integrated_channel.exporters.learner_data.CourseApiClient')
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    def test_learner_data_bulk_remote_ids_missing(
+            self,
+            mock_course_catalog_api,
+            mock_course_api,
+            mock_grades_api,
+            mock_enrollment_api,
+    ):
+        """
+        The enrollments of learners without a remote id are skipped, without looking their remote ids up one by one.
+        """
+        mock_course_catalog_api.return_value.get_course_id.return_value = self.course_key
+        mock_course_api.return_value.get_course_details.return_value = dict(pacing='self', course_id=self.course_id)
+        mock_grades_api.return_value.get_course_grade.return_value = dict(passed=True)
+        mock_enrollment_api.return_value.get_course_enrollment.return_value = dict(mode='verified')
+        self._mock_remote_ids(learners_without_remote_id={'learner2'})
+        enrollment, _ = [self._create_unchanged_enrollment(username) for username in ('learner1', 'learner2')]
+
+        with freeze_time(self.NOW):
+            learner_data = list(self.exporter.export())
+
+        assert [(report.enterprise_course_enrollment_id, report.sapsf_user_id) for report in learner_data] == [
+            (enrollment.id, 'remote-id-learner1'),
+            (enrollment.id, 'remote-id-learner1'),
+        ]
+        self.tpa_client.get_remote_ids.assert_called_once_with(
+            self.idp.provider_id, {self.user.username, 'learner1', 'learner2'},
+        )
+        self.tpa_client.get_remote_id.assert_not_called()
+
+    def test_fetch_skips_token_refresh(self):
+        """
+        LMS API client methods are called without renewing the client's JWT, which must be done ahead of time.
+        """
+        class DummyApiClient:
+            """
+            Dummy LMS API client with an expired JWT.
+            """
+            token_expired = mock.Mock(return_value=True)
+            connect = mock.Mock()
+
+            @JwtLmsApiClient.refresh_token
+            def get_data(self, username):
+                """
+                Return some data about the learner.
+                """
+                return dict(username=username)
+
+        api_client = DummyApiClient()
+        api_method = LearnerExporter._without_token_refresh(api_client.get_data)  # pylint: disable=protected-access
+
+        assert api_method('learner1') == dict(username='learner1')
+        assert api_client.connect.call_count == 0
+        assert api_client.get_data('learner1') == dict(username='learner1')
+        assert api_client.connect.call_count == 1
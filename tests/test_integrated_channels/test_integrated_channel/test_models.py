@@ -5,14 +5,79 @@ Tests for the integrated channel models.
 
 from __future__ import absolute_import, unicode_literals
 
+import datetime
 import unittest
 
+import mock
+from freezegun import freeze_time
 from pytest import mark
 
+from django.utils import timezone
+
+from integrated_channels.degreed.models import DegreedEnterpriseCustomerConfiguration
 from integrated_channels.integrated_channel.models import ContentMetadataItemTransmission
+from integrated_channels.utils import get_content_metadata_hash
 from test_utils import factories
 
 
+@mark.django_db
+class TestEnterpriseCustomerPluginConfiguration(unittest.TestCase):
+    """
+    Tests for the ``EnterpriseCustomerPluginConfiguration`` model, through one of its concrete configurations.
+    """
+
+    def setUp(self):
+        super(TestEnterpriseCustomerPluginConfiguration, self).setUp()
+        self.config = factories.DegreedEnterpriseCustomerConfigurationFactory(
+            enterprise_customer=factories.EnterpriseCustomerFactory(),
+        )
+        self.user = factories.UserFactory()
+        transmitter_mock = mock.patch.object(DegreedEnterpriseCustomerConfiguration, 'get_learner_data_transmitter')
+        self.transmitter = transmitter_mock.start().return_value
+        self.addCleanup(transmitter_mock.stop)
+        exporter_mock = mock.patch.object(DegreedEnterpriseCustomerConfiguration, 'get_learner_data_exporter')
+        self.exporter = exporter_mock.start().return_value
+        self.addCleanup(exporter_mock.stop)
+
+    def _transmit_learner_data(self, now, incremental):
+        """
+        Transmit the learner data at the given time, and return the stored high-water mark afterwards.
+        """
+        with freeze_time(now):
+            self.config.transmit_learner_data(self.user, incremental=incremental)
+        return DegreedEnterpriseCustomerConfiguration.objects.get(pk=self.config.pk).learner_data_high_water_mark
+
+    def test_transmit_learner_data_incremental(self):
+        first_run = timezone.now() - datetime.timedelta(days=1)
+        second_run = timezone.now()
+
+        # The first transmission has no high-water mark to start from, so it considers every enrollment.
+        assert self._transmit_learner_data(first_run, incremental=True) == first_run
+        self.transmitter.transmit.assert_called_once_with(self.exporter)
+
+        self.transmitter.reset_mock()
+        assert self._transmit_learner_data(second_run, incremental=True) == second_run
+        self.transmitter.transmit.assert_called_once_with(self.exporter, changed_since=first_run)
+
+    def test_transmit_learner_data_full_sweep(self):
+        self.config.learner_data_high_water_mark = timezone.now() - datetime.timedelta(days=1)
+        self.config.save()
+        now = timezone.now()
+
+        assert self._transmit_learner_data(now, incremental=False) == now
+        self.transmitter.transmit.assert_called_once_with(self.exporter)
+
+    def test_transmit_learner_data_failure_keeps_high_water_mark(self):
+        self.transmitter.transmit.side_effect = Exception('Transmission failed')
+
+        with self.assertRaises(Exception):
+            self._transmit_learner_data(timezone.now(), incremental=True)
+
+        assert DegreedEnterpriseCustomerConfiguration.objects.get(
+            pk=self.config.pk
+        ).learner_data_high_water_mark is None
+
+
 @mark.django_db
 class TestContentMetadataItemTransmission(unittest.TestCase):
     """
@@ -40,3 +105,23 @@ class TestContentMetadataItemTransmission(unittest.TestCase):
             content_id=content_id
         )
         assert expected_string == transmission.__repr__()
+
+    def test_save_sets_content_hash(self):
+        """
+        Test that saving the channel metadata stores its content hash, and saving without it leaves the hash alone.
+        """
+        transmission = ContentMetadataItemTransmission(
+            enterprise_customer=self.enterprise_customer,
+            integrated_channel_code='test-channel-code',
+            content_id='test-course',
+            channel_metadata={'title': 'Test Course'},
+        )
+        transmission.save()
+        assert transmission.content_hash == get_content_metadata_hash({'title': 'Test Course'})
+
+        transmission = ContentMetadataItemTransmission.objects.defer('channel_metadata').get(pk=transmission.pk)
+        transmission.integrated_channel_code = 'other-channel-code'
+        transmission.save()
+        transmission = ContentMetadataItemTransmission.objects.get(pk=transmission.pk)
+        assert transmission.content_hash == get_content_metadata_hash({'title': 'Test Course'})
+        assert transmission.channel_metadata == {'title': 'Test Course'}
@@ -5,7 +5,10 @@ Tests for the base content metadata transmitter.
 
 from __future__ import absolute_import, unicode_literals
 
+import json
+import threading
 import unittest
+from functools import partial
 
 import ddt
 import mock
@@ -15,6 +18,7 @@ from integrated_channels.exceptions import ClientError
 from integrated_channels.integrated_channel.exporters.content_metadata import ContentMetadataItemExport
 from integrated_channels.integrated_channel.models import ContentMetadataItemTransmission
 from integrated_channels.integrated_channel.transmitters.content_metadata import ContentMetadataTransmitter
+from integrated_channels.utils import get_content_metadata_hash
 from test_utils import factories
 
 
@@ -138,6 +142,44 @@ class TestContentMetadataTransmitter(unittest.TestCase):
 
         assert updated_transmission.channel_metadata == channel_metadata
 
+    def test_transmit_update_in_bulk(self):
+        """
+        Test that the transmissions of each successfully updated chunk are saved with a single bulk update.
+        """
+        self.enterprise_config.transmission_chunk_size = 2
+        self.enterprise_config.save()
+        content_ids = ['course:DemoX', 'course:DemoY', 'course:DemoZ']
+        for content_id in content_ids:
+            ContentMetadataItemTransmission(
+                enterprise_customer=self.enterprise_config.enterprise_customer,
+                integrated_channel_code=self.enterprise_config.channel_code(),
+                content_id=content_id,
+                channel_metadata={}
+            ).save()
+        previously_modified = ContentMetadataItemTransmission.objects.values_list('modified', flat=True).first()
+        payload = {
+            content_id: ContentMetadataItemExport(
+                {'key': content_id, 'content_type': 'course'},
+                {'title': content_id},
+            )
+            for content_id in content_ids
+        }
+        self.update_content_metadata_mock.return_value = (200, '{"success":"true"}')
+        transmitter = ContentMetadataTransmitter(self.enterprise_config)
+        bulk_update = ContentMetadataItemTransmission.objects.bulk_update
+        bulk_update_mock = mock.patch.object(
+            ContentMetadataItemTransmission.objects, 'bulk_update', side_effect=bulk_update
+        )
+        with bulk_update_mock as mock_bulk_update:
+            transmitter.transmit(payload)
+
+        assert self.update_content_metadata_mock.call_count == 2
+        assert [len(call[0][0]) for call in mock_bulk_update.call_args_list] == [2, 1]
+        for transmission in ContentMetadataItemTransmission.objects.all():
+            assert transmission.channel_metadata == {'title': transmission.content_id}
+            assert transmission.content_hash == get_content_metadata_hash({'title': transmission.content_id})
+            assert transmission.modified > previously_modified
+
     def test_transmit_update_not_needed(self):
         """
         Test successful update of content metadata during transmission.
@@ -160,6 +202,42 @@ class TestContentMetadataTransmitter(unittest.TestCase):
         self.update_content_metadata_mock.assert_not_called()
         self.delete_content_metadata_mock.assert_not_called()
 
+    def test_transmit_compares_content_hashes(self):
+        """
+        Test that items are compared by their content hash, without loading the previously transmitted metadata.
+        """
+        unchanged_content_id = 'course:DemoX'
+        changed_content_id = 'course:DemoY'
+        for content_id in (unchanged_content_id, changed_content_id):
+            ContentMetadataItemTransmission(
+                enterprise_customer=self.enterprise_config.enterprise_customer,
+                integrated_channel_code=self.enterprise_config.channel_code(),
+                content_id=content_id,
+                channel_metadata={'title': content_id, 'tags': ['a', 'b']},
+            ).save()
+        payload = {
+            unchanged_content_id: ContentMetadataItemExport(
+                {'key': unchanged_content_id, 'content_type': 'course'},
+                {'tags': ['a', 'b'], 'title': unchanged_content_id},
+            ),
+            changed_content_id: ContentMetadataItemExport(
+                {'key': changed_content_id, 'content_type': 'course'},
+                {'tags': ['b', 'a'], 'title': changed_content_id},
+            ),
+        }
+        transmitter = ContentMetadataTransmitter(self.enterprise_config)
+        # Accessing a deferred field loads it with ``refresh_from_db``.
+        refresh_from_db_mock = mock.patch.object(
+            ContentMetadataItemTransmission, 'refresh_from_db', side_effect=AssertionError('Metadata was loaded')
+        )
+        with refresh_from_db_mock:
+            # pylint: disable=protected-access
+            items_to_create, items_to_update, items_to_delete, __ = transmitter._partition_items(payload)
+
+        assert items_to_create == {}
+        assert items_to_update == {changed_content_id: {'tags': ['b', 'a'], 'title': changed_content_id}}
+        assert items_to_delete == {}
+
     def test_transmit_update_failure(self):
         """
         Test unsuccessful update of content metadata during transmission.
@@ -244,3 +322,144 @@ class TestContentMetadataTransmitter(unittest.TestCase):
             integrated_channel_code=self.enterprise_config.channel_code(),
             content_id=content_id,
         )
+
+    def test_transmit_in_parallel(self):
+        """
+        Test that chunks are sent concurrently, one step after another, and failed chunks are not persisted.
+        """
+        self.enterprise_config.transmission_chunk_size = 1
+        self.enterprise_config.metadata_transmission_workers = 3
+        self.enterprise_config.save()
+        for content_id in ('course:Deleted1', 'course:Deleted2', 'course:Updated'):
+            ContentMetadataItemTransmission(
+                enterprise_customer=self.enterprise_config.enterprise_customer,
+                integrated_channel_code=self.enterprise_config.channel_code(),
+                content_id=content_id,
+                channel_metadata={'title': content_id},
+            ).save()
+        payload = {
+            content_id: ContentMetadataItemExport(
+                {'key': content_id, 'content_type': 'course'},
+                {'title': content_id, 'new': True},
+            )
+            for content_id in ('course:Created1', 'course:Created2', 'course:Failed', 'course:Updated')
+        }
+
+        sent_chunks = []
+        sending_lock = threading.Lock()
+
+        def send_chunk(step, serialized_chunk):
+            """
+            Record the sent chunk, and fail to send one of the chunks.
+            """
+            title = json.loads(serialized_chunk.decode('utf-8'))[0]['title']
+            with sending_lock:
+                sent_chunks.append((step, title, threading.current_thread().name))
+            if title == 'course:Failed':
+                raise ClientError('Failed to send')
+
+        for step, client_mock in (
+                ('delete', self.delete_content_metadata_mock),
+                ('create', self.create_content_metadata_mock),
+                ('update', self.update_content_metadata_mock),
+        ):
+            client_mock.side_effect = partial(send_chunk, step)
+
+        transmitter = ContentMetadataTransmitter(self.enterprise_config)
+        transmitter.transmit(payload)
+
+        assert [step for step, __, __ in sent_chunks] == ['delete'] * 2 + ['create'] * 3 + ['update']
+        assert {title for __, title, __ in sent_chunks} == {
+            'course:Deleted1', 'course:Deleted2', 'course:Created1', 'course:Created2', 'course:Failed',
+            'course:Updated',
+        }
+        assert threading.current_thread().name not in {thread for __, __, thread in sent_chunks}
+        transmissions = {
+            transmission.content_id: transmission.channel_metadata
+            for transmission in ContentMetadataItemTransmission.objects.all()
+        }
+        assert transmissions == {
+            content_id: {'title': content_id, 'new': True}
+            for content_id in ('course:Created1', 'course:Created2', 'course:Updated')
+        }
+
+    @mock.patch('integrated_channels.integrated_channel.transmitters.content_metadata.time')
+    def test_transmit_rate_limit(self, mock_time):
+        """
+        Test that chunks are started no closer together than the channel's minimum chunk interval.
+        """
+        self.enterprise_config.transmission_chunk_size = 1
+        self.enterprise_config.save()
+        mock_time.monotonic.side_effect = [100, 100, 101, 105]
+        payload = {
+            content_id: ContentMetadataItemExport({'key': content_id, 'content_type': 'course'}, {'title': content_id})
+            for content_id in ('course:DemoX', 'course:DemoY')
+        }
+        transmitter = ContentMetadataTransmitter(self.enterprise_config)
+        transmitter.MIN_CHUNK_INTERVAL = 5
+        transmitter.transmit(payload)
+
+        assert self.create_content_metadata_mock.call_count == 2
+        mock_time.sleep.assert_called_once_with(4)
+
+    def test_transmit_pages(self):
+        """
+        Test that pages of content metadata are created and updated as they arrive, and that the items which were
+        not exported on any page are deleted after the last page.
+        """
+        for content_id, channel_metadata in (
+                ('course:Deleted', {'title': 'Deleted'}),
+                ('course:Unchanged', {'title': 'Unchanged'}),
+                ('course:Updated', {'title': 'Updated'}),
+        ):
+            ContentMetadataItemTransmission(
+                enterprise_customer=self.enterprise_config.enterprise_customer,
+                integrated_channel_code=self.enterprise_config.channel_code(),
+                content_id=content_id,
+                channel_metadata=channel_metadata,
+            ).save()
+
+        sent_steps = []
+        for step, client_mock in (
+                ('delete', self.delete_content_metadata_mock),
+                ('create', self.create_content_metadata_mock),
+                ('update', self.update_content_metadata_mock),
+        ):
+            client_mock.side_effect = partial(lambda step, __: sent_steps.append(step), step)
+
+        def payload_pages():
+            """
+            Yield the exported pages, checking that each one is transmitted before the next is exported.
+            """
+            yield {
+                'course:Created': ContentMetadataItemExport(
+                    {'key': 'course:Created', 'content_type': 'course'}, {'title': 'Created'},
+                ),
+                'course:Unchanged': ContentMetadataItemExport(
+                    {'key': 'course:Unchanged', 'content_type': 'course'}, {'title': 'Unchanged'},
+                ),
+            }
+            assert sent_steps == ['create']
+            yield {
+                'course:Updated': ContentMetadataItemExport(
+                    {'key': 'course:Updated', 'content_type': 'course'}, {'title': 'Updated', 'new': True},
+                ),
+            }
+            assert sent_steps == ['create', 'update']
+
+        transmitter = ContentMetadataTransmitter(self.enterprise_config)
+        transmitter.transmit_pages(payload_pages())
+
+        assert sent_steps == ['create', 'update', 'delete']
+        assert json.loads(self.delete_content_metadata_mock.call_args[0][0].decode('utf-8')) == [
+            {'title': 'Deleted'}
+        ]
+        transmissions = {
+            transmission.content_id: transmission.channel_metadata
+            for transmission in ContentMetadataItemTransmission.objects.all()
+        }
+        assert transmissions == {
+            'course:Created': {'title': 'Created'},
+            'course:Unchanged': {'title': 'Unchanged'},
+            'course:Updated': {'title': 'Updated', 'new': True},
+        }
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the base learner data transmitter.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import unittest
+
+import mock
+from pytest import mark, raises
+
+from integrated_channels.integrated_channel.models import LearnerDataTransmissionAudit
+from integrated_channels.integrated_channel.transmitters.learner_data import LearnerDataTransmissionAuditWriter
+
+
+@mark.django_db
+class TestLearnerDataTransmissionAuditWriter(unittest.TestCase):
+    """
+    Tests for the class ``LearnerDataTransmissionAuditWriter``.
+    """
+
+    @staticmethod
+    def _build_audit_record(enterprise_course_enrollment_id, grade='Pass'):
+        """
+        Return an unsaved LearnerDataTransmissionAudit record for the given enrollment.
+        """
+        return LearnerDataTransmissionAudit(
+            enterprise_course_enrollment_id=enterprise_course_enrollment_id,
+            course_id='course-v1:edX+DemoX+DemoCourse',
+            completed_timestamp=1568877047181,
+            grade=grade,
+            status='200',
+        )
+
+    def test_writes_in_batches(self):
+        bulk_create = LearnerDataTransmissionAudit.objects.bulk_create
+        patch_bulk_create = mock.patch.object(
+            LearnerDataTransmissionAudit.objects, 'bulk_create', side_effect=bulk_create
+        )
+        with patch_bulk_create as mock_bulk_create:
+            with LearnerDataTransmissionAuditWriter(LearnerDataTransmissionAudit, 2) as audit_writer:
+                for enrollment_id in range(5):
+                    audit_writer.add(self._build_audit_record(enrollment_id))
+                    assert LearnerDataTransmissionAudit.objects.count() == (enrollment_id + 1) // 2 * 2
+
+        assert [len(call[0][0]) for call in mock_bulk_create.call_args_list] == [2, 2, 1]
+        assert sorted(
+            LearnerDataTransmissionAudit.objects.values_list('enterprise_course_enrollment_id', flat=True)
+        ) == list(range(5))
+
+    def test_updates_existing_records(self):
+        learner_data = self._build_audit_record(1, grade='Fail')
+        learner_data.save()
+
+        with LearnerDataTransmissionAuditWriter(LearnerDataTransmissionAudit, 10) as audit_writer:
+            learner_data.grade = 'In Progress'
+            audit_writer.add(learner_data)
+            learner_data = LearnerDataTransmissionAudit.objects.get(pk=learner_data.pk)
+            learner_data.grade = 'Pass'
+            learner_data.status = '201'
+            audit_writer.add(learner_data)
+            assert LearnerDataTransmissionAudit.objects.get().grade == 'Fail'
+
+        learner_data = LearnerDataTransmissionAudit.objects.get()
+        assert learner_data.grade == 'Pass'
+        assert learner_data.status == '201'
+
+    def test_flushes_on_error(self):
+        with raises(ValueError):
+            with LearnerDataTransmissionAuditWriter(LearnerDataTransmissionAudit, 10) as audit_writer:
+                audit_writer.add(self._build_audit_record(1))
+                raise ValueError('Transmission interrupted')
+
+        assert LearnerDataTransmissionAudit.objects.count() == 1
+
+    def test_flush_error_does_not_mask_error(self):
+        patch_bulk_create = mock.patch.object(
+            LearnerDataTransmissionAudit.objects, 'bulk_create', side_effect=RuntimeError('Database unavailable')
+        )
+        with patch_bulk_create, mock.patch(
+                'integrated_channels.integrated_channel.transmitters.learner_data.LOGGER'
+        ) as mock_logger:
+            with raises(ValueError):
+                with LearnerDataTransmissionAuditWriter(LearnerDataTransmissionAudit, 10) as audit_writer:
+                    audit_writer.add(self._build_audit_record(1))
+                    raise ValueError('Transmission interrupted')
+
+        assert mock_logger.exception.call_count == 1
+        assert LearnerDataTransmissionAudit.objects.count() == 0
@@ -103,6 +103,27 @@ class TestSapSuccessFactorsLearnerDataTransmitter(unittest.TestCase):
         assert payload.status == '200'
         assert payload.error_message == ''
 
+    def test_transmit_skips_records_sent_earlier_in_run(self):
+        """
+        Once a record for an enrollment is sent successfully, later records for that enrollment and grade are skipped.
+        """
+        self.create_course_completion_mock.return_value = 200, '{"success":"true"}'
+        payloads = [
+            SapSuccessFactorsLearnerDataTransmissionAudit(
+                enterprise_course_enrollment_id=self.enterprise_course_enrollment.id,
+                sapsf_user_id='sap_user',
+                course_id=course_id,
+                course_completed=True,
+                completed_timestamp=1486755998,
+                grade='Pass',
+            )
+            for course_id in ('edX+DemoX', 'course-v1:edX+DemoX+DemoCourse')
+        ]
+        transmitter = learner_data.SapSuccessFactorsLearnerTransmitter(self.enterprise_config)
+        transmitter.transmit(self.exporter(payloads))
+        self.create_course_completion_mock.assert_called_once_with('sap_user', payloads[0].serialize())
+        assert SapSuccessFactorsLearnerDataTransmissionAudit.objects.count() == 1
+
     def test_transmit_failure(self):
         """
         Learner data transmission fails for some reason and the payload is saved with the appropriate data.
@@ -10,10 +10,13 @@ from datetime import timedelta
 
 import ddt
 import mock
-from pytest import raises
+from pytest import mark, raises
 
 from enterprise.api_client.lms import parse_lms_api_datetime
 from integrated_channels import utils
+from integrated_channels.degreed.models import DegreedLearnerDataTransmissionAudit
+from integrated_channels.integrated_channel.models import LearnerDataTransmissionAudit
+from test_utils import factories
 
 
 @ddt.ddt
@@ -93,3 +96,94 @@ class TestIntegratedChannelsUtils(unittest.TestCase):
     def test_strfdelta_value_error(self):
         with raises(ValueError):
             utils.strfdelta(timedelta(days=1), input_type='invalid_type')
+
+    @ddt.data(
+        ({'title': 'Demo', 'price': 10}, {'price': 10, 'title': 'Demo'}, True),
+        ({'title': 'Demo', 'tags': ['a', 'b']}, {'title': 'Demo', 'tags': ['b', 'a']}, False),
+        ({'title': 'Demo', 'price': 10}, {'title': 'Demo', 'price': 20}, False),
+    )
+    @ddt.unpack
+    def test_get_content_metadata_hash(self, channel_metadata, other_channel_metadata, same_hash):
+        content_hash = utils.get_content_metadata_hash(channel_metadata)
+        assert len(content_hash) == 64
+        assert (content_hash == utils.get_content_metadata_hash(other_channel_metadata)) is same_hash
+
+
+@mark.django_db
+@ddt.ddt
+class TestTransmittedGrades(unittest.TestCase):
+    """
+    Test the index of previously transmitted grades used to skip already transmitted enrollments.
+    """
+
+    def setUp(self):
+        super(TestTransmittedGrades, self).setUp()
+        self.enterprise_customer = factories.EnterpriseCustomerFactory()
+        self.enrollments = [
+            factories.EnterpriseCourseEnrollmentFactory(
+                enterprise_customer_user=factories.EnterpriseCustomerUserFactory(
+                    enterprise_customer=self.enterprise_customer,
+                ),
+            )
+            for __ in range(3)
+        ]
+        self.other_customer_enrollment = factories.EnterpriseCourseEnrollmentFactory()
+
+    def _create_transmission(self, enrollment, grade, error_message=''):
+        """
+        Create a LearnerDataTransmissionAudit record for the given enrollment.
+        """
+        LearnerDataTransmissionAudit.objects.create(
+            enterprise_course_enrollment_id=enrollment.id,
+            course_id=enrollment.course_id,
+            completed_timestamp=1568877047181,
+            grade=grade,
+            status='400' if error_message else '200',
+            error_message=error_message,
+        )
+
+    def test_get_transmitted_grades(self):
+        first, second, third = self.enrollments
+        self._create_transmission(first, 'Fail')
+        self._create_transmission(first, 'Pass')
+        self._create_transmission(second, 'Pass')
+        self._create_transmission(second, 'Fail', error_message='Failed to send')
+        self._create_transmission(third, 'Pass', error_message='Failed to send')
+        self._create_transmission(self.other_customer_enrollment, 'Pass')
+
+        transmitted_grades = utils.get_transmitted_grades(LearnerDataTransmissionAudit, self.enterprise_customer)
+
+        assert transmitted_grades == {first.id: 'Pass', second.id: 'Pass'}
+
+    def test_get_transmitted_grades_without_grade_field(self):
+        enrollment = self.enrollments[0]
+        DegreedLearnerDataTransmissionAudit.objects.create(
+            degreed_user_email='learner@example.com',
+            enterprise_course_enrollment_id=enrollment.id,
+            course_id=enrollment.course_id,
+            completed_timestamp='2019-09-19',
+            status='200',
+        )
+
+        transmitted_grades = utils.get_transmitted_grades(DegreedLearnerDataTransmissionAudit, self.enterprise_customer)
+
+        assert transmitted_grades == {enrollment.id: None}
+
+    @ddt.data(
+        ('Pass', True, True),
+        ('Fail', True, False),
+        ('Pass', False, False),
+    )
+    @ddt.unpack
+    def test_is_already_transmitted(self, grade, use_index, expected):
+        first, second, __ = self.enrollments
+        self._create_transmission(first, 'Pass')
+        transmitted_grades = None
+        if use_index:
+            transmitted_grades = utils.get_transmitted_grades(LearnerDataTransmissionAudit, self.enterprise_customer)
+        else:
+            first = second
+
+        assert utils.is_already_transmitted(
+            LearnerDataTransmissionAudit, first.id, grade, transmitted_grades
+        ) is expected
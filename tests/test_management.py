@@ -327,6 +327,7 @@ CERTIFICATE_FAILING_COMPLETION = dict(
 
 
 @mark.django_db
+@ddt.ddt
 class TestTransmitLearnerData(unittest.TestCase):
     """
     Test the transmit_learner_data management command.
@@ -420,6 +421,23 @@ class TestTransmitLearnerData(unittest.TestCase):
                          enterprise_customer=self.enterprise_customer.uuid,
                          channel=channel_code)
 
+    @ddt.data(
+        ([], False),
+        (['--incremental'], True),
+    )
+    @ddt.unpack
+    @mock.patch(
+        'integrated_channels.integrated_channel.models.EnterpriseCustomerPluginConfiguration.transmit_learner_data'
+    )
+    def test_incremental(self, extra_args, incremental, mock_transmit_learner_data):
+        call_command(
+            'transmit_learner_data',
+            '--api_user', self.api_user.username,
+            '--channel', 'DEGREED',
+            *extra_args
+        )
+        mock_transmit_learner_data.assert_called_once_with(self.api_user, incremental=incremental)
+
 
 # Helper methods used for the transmit_learner_data integration tests below.
 @contextmanager
@@ -461,6 +479,21 @@ def stub_transmit_learner_data_apis(testcase, certificate, self_paced, end_date,
     """
     Stub out all of the API calls made during transmit_learner_data
     """
+    # Third Party API bulk remote_id response
+    responses.add(
+        responses.GET,
+        urljoin(lms_api.ThirdPartyAuthApiClient.API_BASE_URL,
+                "providers/{provider}/users?{querystring}".format(
+                    provider=testcase.identity_provider,
+                    querystring='&'.join(sorted(
+                        'username=' + user.username for user in [testcase.user1, testcase.user2]
+                    )),
+                )),
+        match_querystring=True,
+        json=dict(results=[
+            dict(username=user.username, remote_id='remote-user-id') for user in [testcase.user1, testcase.user2]
+        ]),
+    )
     for user in [testcase.user1, testcase.user2]:
         # Third Party API remote_id response
         responses.add(
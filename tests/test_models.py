@@ -15,22 +15,27 @@ from edx_rest_api_client.exceptions import HttpClientError
 from faker import Factory as FakerFactory
 from opaque_keys.edx.keys import CourseKey
 from pytest import mark, raises
+from requests.exceptions import ConnectionError, Timeout  # pylint: disable=redefined-builtin
 from testfixtures import LogCapture
 from waffle.testutils import override_sample
 
 from django.conf import settings
-from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.core.files import File
 from django.core.files.storage import Storage
+from django.db import connection
 from django.db.utils import IntegrityError
 from django.http import QueryDict
 from django.test import override_settings
 from django.test.testcases import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from consent.errors import InvalidProxyConsent
 from consent.helpers import get_data_sharing_consent
 from consent.models import DataSharingConsent, ProxyDataSharingConsent
+from enterprise.api_client.caching import LocalCache
 from enterprise.constants import ENTERPRISE_LEARNER_ROLE, ENTERPRISE_OPERATOR_ROLE, USE_ENTERPRISE_CATALOG
 from enterprise.models import (
     EnrollmentNotificationEmailTemplate,
@@ -45,7 +50,7 @@ from enterprise.models import (
     SystemWideEnterpriseUserRoleAssignment,
     logo_path,
 )
-from enterprise.utils import CourseEnrollmentDowngradeError
+from enterprise.utils import CourseEnrollmentDowngradeError, CourseEnrollmentPermissionError
 from integrated_channels.integrated_channel.models import EnterpriseCustomerPluginConfiguration
 from test_utils import assert_url, assert_url_contains_query_parameters, factories, fake_catalog_api
 
@@ -173,6 +178,43 @@ class TestEnterpriseCustomer(unittest.TestCase):
         """
         assert factories.EnterpriseCustomerFactory().identity_provider is None
 
+    @mock.patch('enterprise.models.ThirdPartyAuthApiClient')
+    def test_get_remote_ids(self, mock_tpa_client_class):
+        """
+        Test EnterpriseCustomer.get_remote_ids looks up the remote ids of learners in bulk.
+        """
+        mock_tpa_client = mock_tpa_client_class.return_value
+        mock_tpa_client.get_remote_ids.return_value = {'Han': 'han-solo'}
+        customer = factories.EnterpriseCustomerFactory()
+
+        # Without an identity provider there is nothing to look up.
+        assert customer.get_remote_ids(['Han', 'Leia']) == {}
+        mock_tpa_client.get_remote_ids.assert_not_called()
+
+        ent_idp = factories.EnterpriseCustomerIdentityProviderFactory(enterprise_customer=customer)
+        assert customer.get_remote_ids(['Han', 'Leia']) == {'Han': 'han-solo'}
+        mock_tpa_client.get_remote_ids.assert_called_once_with(ent_idp.provider_id, {'Han', 'Leia'})
+
+    @override_settings(ENTERPRISE_REMOTE_ID_CACHE_TIMEOUT=60)
+    @mock.patch('enterprise.models.ThirdPartyAuthApiClient')
+    def test_get_remote_ids_cached(self, mock_tpa_client_class):
+        """
+        Test EnterpriseCustomer.get_remote_ids only looks up learners missing from the cache.
+        """
+        self.addCleanup(cache.clear)
+        mock_tpa_client = mock_tpa_client_class.return_value
+        mock_tpa_client.get_remote_ids.return_value = {'Han': 'han-solo'}
+        customer = factories.EnterpriseCustomerFactory()
+        ent_idp = factories.EnterpriseCustomerIdentityProviderFactory(enterprise_customer=customer)
+
+        assert customer.get_remote_ids(['Han']) == {'Han': 'han-solo'}
+        mock_tpa_client.get_remote_ids.assert_called_once_with(ent_idp.provider_id, {'Han'})
+
+        mock_tpa_client.get_remote_ids.reset_mock()
+        mock_tpa_client.get_remote_ids.return_value = {'Leia': 'leia-organa'}
+        assert customer.get_remote_ids(['Han', 'Leia']) == {'Han': 'han-solo', 'Leia': 'leia-organa'}
+        mock_tpa_client.get_remote_ids.assert_called_once_with(ent_idp.provider_id, {'Leia'})
+
     @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
     def test_catalog_contains_course_with_enterprise_customer_catalog(self, mock_catalog_api_class):
         """
@@ -181,6 +223,9 @@ class TestEnterpriseCustomer(unittest.TestCase):
         mock_catalog_api = mock_catalog_api_class.return_value
         mock_catalog_api.is_course_in_catalog.return_value = False
         mock_catalog_api.get_catalog_results.return_value = {'results': [fake_catalog_api.FAKE_COURSE_RUN]}
+        mock_catalog_api.get_course_ids.return_value = {
+            fake_catalog_api.FAKE_COURSE_RUN['key']: fake_catalog_api.FAKE_COURSE['key'],
+        }
 
         # Test with no discovery service catalog.
         enterprise_customer = factories.EnterpriseCustomerFactory()
@@ -196,10 +241,16 @@ class TestEnterpriseCustomer(unittest.TestCase):
         mock_catalog_api.get_catalog_results.return_value = {}
         assert enterprise_customer.catalog_contains_course(fake_catalog_api.FAKE_COURSE_RUN['key']) is False
 
-        # When a key doesn't exist in discovery then get_course_id returns None.
+        # When a key doesn't exist in discovery then get_course_ids leaves it out.
         mock_catalog_api.get_catalog_results.return_value = {'results': [fake_catalog_api.FAKE_COURSE_RUN]}
-        mock_catalog_api.get_course_id.return_value = None
+        mock_catalog_api.get_course_ids.return_value = {}
+        assert enterprise_customer.catalog_contains_course(fake_catalog_api.FAKE_COURSE_RUN['key']) is False
+
+        # The course keys are looked up once for all of the catalogs.
+        factories.EnterpriseCustomerCatalogFactory(enterprise_customer=enterprise_customer)
+        mock_catalog_api.get_course_ids.reset_mock()
         assert enterprise_customer.catalog_contains_course(fake_catalog_api.FAKE_COURSE_RUN['key']) is False
+        mock_catalog_api.get_course_ids.assert_called_once_with([fake_catalog_api.FAKE_COURSE_RUN['key']])
 
     @mock.patch('enterprise.models.EnterpriseCatalogApiClient', return_value=mock.MagicMock())
     def test_catalog_contains_course_with_enterprise_customer_catalog_waffle_sample(self, api_client_mock):
@@ -576,6 +627,120 @@ class TestEnterpriseCustomerUser(unittest.TestCase):
 
         enrollment_api_client_mock.return_value.enroll_user_in_course.assert_not_called()
 
+    @mock.patch('enterprise.utils.segment')
+    @mock.patch('enterprise.models.EnrollmentApiClient')
+    @mock.patch('enterprise.models.EnterpriseCustomerUser.create_orders_for_enrollments')
+    def test_enroll_in_bulk(self, create_orders_mock, enrollment_api_client_mock, analytics_mock):
+        """
+        ``enroll_in_bulk`` enrolls the learners, reports the errors of each enrollment, and creates a single order.
+        """
+        course_run_id = 'course-v1:edX+DemoX+Demo_Course'
+        enterprise_customer = factories.EnterpriseCustomerFactory()
+        users = [factories.UserFactory() for __ in range(4)]
+        enterprise_customer_users = [
+            factories.EnterpriseCustomerUserFactory(user_id=user.id, enterprise_customer=enterprise_customer)
+            for user in users
+        ]
+        course_enrollments = {
+            users[1].username: {'is_active': True, 'mode': 'verified'},
+            users[2].username: {'is_active': True, 'mode': 'audit'},
+        }
+        enrollment_api_client_mock.return_value.get_course_enrollment.side_effect = (
+            lambda username, course_id: course_enrollments.get(username)
+        )
+        enrollment_api_client_mock.return_value.enroll_user_in_course.side_effect = (
+            lambda username, course_id, mode, cohort=None: {}
+        )
+
+        errors = EnterpriseCustomerUser.enroll_in_bulk(
+            [
+                (enterprise_customer_users[0], course_run_id, 'verified', None),
+                (enterprise_customer_users[1], course_run_id, 'audit', None),
+                (enterprise_customer_users[2], course_run_id, 'verified', None),
+                (enterprise_customer_users[3], course_run_id, 'audit', 'cohort'),
+            ],
+            discount_percentage=10.0,
+        )
+
+        assert errors[0] is None
+        assert isinstance(errors[1], CourseEnrollmentDowngradeError)
+        assert errors[2] is None
+        assert isinstance(errors[3], CourseEnrollmentPermissionError)
+        enrollment_api_client_mock.return_value.enroll_user_in_course.assert_has_calls(
+            [
+                mock.call(users[0].username, course_run_id, 'verified', cohort=None),
+                mock.call(users[2].username, course_run_id, 'verified', cohort=None),
+            ],
+            any_order=True,
+        )
+        assert enrollment_api_client_mock.return_value.enroll_user_in_course.call_count == 2
+        assert analytics_mock.track.call_count == 2
+        assert set(
+            EnterpriseCourseEnrollment.objects.filter(course_id=course_run_id).values_list(
+                'enterprise_customer_user__user_id', flat=True
+            )
+        ) == {users[0].id, users[2].id}
+        create_orders_mock.assert_called_once_with([
+            {
+                'lms_user_id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'course_run_key': course_run_id,
+                'enterprise_customer_name': enterprise_customer.name,
+                'enterprise_customer_uuid': str(enterprise_customer.uuid),
+                'discount_percentage': 10.0,
+                'sales_force_id': None,
+            }
+            for user in (users[0], users[2])
+        ])
+
+    @mock.patch('enterprise.utils.segment')
+    @mock.patch('enterprise.models.EnrollmentApiClient')
+    @mock.patch('enterprise.models.EnterpriseCustomerUser.create_orders_for_enrollments')
+    def test_enroll_in_bulk_connection_errors(self, create_orders_mock, enrollment_api_client_mock, analytics_mock):
+        """
+        ``enroll_in_bulk`` reports the Enrollment API connection errors of each enrollment and enrolls the others.
+        """
+        course_run_id = 'course-v1:edX+DemoX+Demo_Course'
+        enterprise_customer = factories.EnterpriseCustomerFactory()
+        users = [factories.UserFactory() for __ in range(3)]
+        enterprise_customer_users = [
+            factories.EnterpriseCustomerUserFactory(user_id=user.id, enterprise_customer=enterprise_customer)
+            for user in users
+        ]
+        lookup_error = ConnectionError('Connection refused')
+        enroll_error = Timeout('Read timed out')
+
+        def get_course_enrollment(username, course_id):  # pylint: disable=unused-argument
+            """
+            Fail to look up the enrollment of the first learner; the others are not enrolled yet.
+            """
+            if username == users[0].username:
+                raise lookup_error
+
+        def enroll_user_in_course(username, course_id, mode, cohort=None):  # pylint: disable=unused-argument
+            """
+            Fail to enroll the second learner.
+            """
+            if username == users[1].username:
+                raise enroll_error
+            return {}
+
+        enrollment_api_client_mock.return_value.get_course_enrollment.side_effect = get_course_enrollment
+        enrollment_api_client_mock.return_value.enroll_user_in_course.side_effect = enroll_user_in_course
+
+        errors = EnterpriseCustomerUser.enroll_in_bulk(
+            [(enterprise_customer_user, course_run_id, 'verified', None)
+             for enterprise_customer_user in enterprise_customer_users],
+        )
+
+        assert errors == [lookup_error, enroll_error, None]
+        assert analytics_mock.track.call_count == 1
+        assert create_orders_mock.call_count == 1
+        assert [
+            order_enrollment['lms_user_id'] for order_enrollment in create_orders_mock.call_args[0][0]
+        ] == [users[2].id]
+
     @mock.patch('enterprise.models.get_ecommerce_worker_user')
     @mock.patch('enterprise.api_client.ecommerce.ecommerce_api_client')
     @mock.patch('enterprise.api_client.ecommerce.EcommerceApiClient.create_manual_enrollment_orders')
@@ -1293,6 +1458,92 @@ class TestEnterpriseCustomerCatalog(unittest.TestCase):
         mock_catalog_api.get_catalog_results.return_value = {}
         assert catalog.contains_programs([fake_catalog_api.FAKE_PROGRAM_RESPONSE1['uuid']]) is False
 
+    @override_settings(ENTERPRISE_CATALOG_MEMBERSHIP_INDEX_ENABLED=True)
+    @mock.patch('enterprise.models.CATALOG_MEMBERSHIP_INDEX_LOCAL_CACHE', LocalCache(max_size=0, timeout=60))
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    def test_membership_index(self, mock_catalog_api_class):
+        """
+        Test that the membership index of EnterpriseCustomerCatalog is built in the background when missing, and
+        answers membership checks without a catalog search once built.
+        """
+        cache.clear()
+        mock_catalog_api = mock_catalog_api_class.return_value
+        mock_catalog_api.get_catalog_results_from_discovery.return_value = {
+            'results': [fake_catalog_api.FAKE_COURSE, fake_catalog_api.FAKE_SEARCH_ALL_PROGRAM_RESULT_1]
+        }
+        mock_catalog_api.get_catalog_results.return_value = {'results': [fake_catalog_api.FAKE_COURSE]}
+        catalog = factories.EnterpriseCustomerCatalogFactory()
+
+        # The first check falls back to a catalog search, while the index is built.
+        assert catalog.get_membership_index() is None
+        assert mock_catalog_api.get_catalog_results_from_discovery.call_count == 1
+        assert catalog.get_membership_index() == {
+            fake_catalog_api.FAKE_COURSE['key'],
+            fake_catalog_api.FAKE_SEARCH_ALL_PROGRAM_RESULT_1['uuid'],
+        }
+
+        mock_catalog_api.get_catalog_results.reset_mock()
+        assert catalog.contains_courses([fake_catalog_api.FAKE_COURSE['key']]) is True
+        assert catalog.contains_programs([fake_catalog_api.FAKE_SEARCH_ALL_PROGRAM_RESULT_1['uuid']]) is True
+        assert catalog.contains_programs([fake_catalog_api.FAKE_SEARCH_ALL_PROGRAM_RESULT_2['uuid']]) is False
+        mock_catalog_api.get_catalog_results.assert_not_called()
+        assert mock_catalog_api.get_catalog_results_from_discovery.call_count == 1
+
+        # Changing the content filter invalidates the index.
+        catalog.content_filter = {'content_type': 'program'}
+        catalog.save()
+        assert catalog.get_membership_index() is None
+        assert mock_catalog_api.get_catalog_results_from_discovery.call_count == 2
+
+    @override_settings(ENTERPRISE_CATALOG_MEMBERSHIP_INDEX_ENABLED=True)
+    @mock.patch('enterprise.models.CATALOG_MEMBERSHIP_INDEX_LOCAL_CACHE', LocalCache(max_size=0, timeout=60))
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    def test_membership_index_failed_refresh(self, mock_catalog_api_class):
+        """
+        Test that a failed refresh of the membership index of EnterpriseCustomerCatalog doesn't hold off the next one.
+        """
+        cache.clear()
+        mock_catalog_api = mock_catalog_api_class.return_value
+        mock_catalog_api.get_catalog_results_from_discovery.side_effect = [
+            HttpClientError,
+            {'results': [fake_catalog_api.FAKE_COURSE]},
+        ]
+        catalog = factories.EnterpriseCustomerCatalogFactory()
+        refresh_marker_key = catalog.membership_index_cache_key + '.refresh'
+
+        assert catalog.get_membership_index() is None
+        assert cache.get(refresh_marker_key) is None
+        assert catalog.get_membership_index() is None
+        assert mock_catalog_api.get_catalog_results_from_discovery.call_count == 2
+        assert catalog.get_membership_index() == {fake_catalog_api.FAKE_COURSE['key']}
+
+        # The marker is removed when the refresh can't be queued either.
+        catalog.content_filter = {'content_type': 'program'}
+        catalog.save()
+        with mock.patch('enterprise.tasks.refresh_catalog_membership_index.delay', side_effect=IOError):
+            with raises(IOError):
+                catalog.get_membership_index()
+        assert cache.get(catalog.membership_index_cache_key + '.refresh') is None
+
+    @mock.patch('enterprise.api_client.discovery.CourseCatalogApiServiceClient')
+    def test_get_content_members(self, mock_catalog_api_class):
+        """
+        Test that EnterpriseCustomerCatalog.get_content_members counts course runs as members of the catalog when
+        their course is.
+        """
+        course_run_key = fake_catalog_api.FAKE_COURSE_RUN['key']
+        mock_catalog_api = mock_catalog_api_class.return_value
+        mock_catalog_api.get_course_ids.return_value = {
+            course_run_key: fake_catalog_api.FAKE_COURSE['key'],
+            'fake-course-v1:edX+Fake+Run': None,
+        }
+        catalog = factories.EnterpriseCustomerCatalogFactory(
+            content_filter={'key': [fake_catalog_api.FAKE_COURSE['key']]}
+        )
+
+        assert catalog.get_content_members([course_run_key, 'fake-course-v1:edX+Fake+Run']) == {course_run_key}
+        mock_catalog_api.get_catalog_results.assert_not_called()
+
     def test_get_content_filter(self):
         """
         Test `get_content_filter` method of `EnterpriseCustomerCatalog` model should return content filter
@@ -1387,6 +1638,92 @@ class TestDataSharingConsentManager(unittest.TestCase):
         assert isinstance(same_dsc, DataSharingConsent)
         assert dsc == same_dsc
 
+    @mock.patch('consent.models.get_course_catalog_api_service_client')
+    def test_bulk_granted(self, mock_catalog_api_client):
+        """
+        Test that ``bulk_granted`` resolves consent for each pair, falling back from course runs to their course.
+        """
+        enterprise_customer = factories.EnterpriseCustomerFactory()
+        course_run_id = 'course-v1:edX+DemoX+Demo_Course'
+        other_course_run_id = 'course-v1:edX+Other+Run'
+        course_key = 'edX+DemoX'
+        course_keys = {course_run_id: course_key}
+        mock_catalog_api_client.return_value.get_course_id.side_effect = (
+            lambda course_identifier: course_keys.get(course_identifier)  # pylint: disable=unnecessary-lambda
+        )
+        mock_catalog_api_client.return_value.get_course_ids.side_effect = lambda course_identifiers: {
+            course_identifier: course_keys[course_identifier]
+            for course_identifier in course_identifiers if course_identifier in course_keys
+        }
+        for username, course_id, granted in (
+                ('granted_on_run', course_run_id, True),
+                ('revoked_on_run', course_run_id, False),
+                ('revoked_on_run', course_key, True),
+                ('granted_on_course', course_key, True),
+                ('revoked_on_course', course_key, False),
+        ):
+            factories.DataSharingConsentFactory(
+                enterprise_customer=enterprise_customer,
+                username=username,
+                course_id=course_id,
+                granted=granted,
+            )
+        factories.DataSharingConsentFactory(username='no_consent', course_id=course_run_id, granted=True)
+
+        pairs = [
+            ('granted_on_run', course_run_id),
+            ('revoked_on_run', course_run_id),
+            ('granted_on_course', course_run_id),
+            ('granted_on_course', course_key),
+            ('granted_on_course', other_course_run_id),
+            ('revoked_on_course', course_run_id),
+            ('no_consent', course_run_id),
+            (None, course_run_id),
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            consents = DataSharingConsent.objects.bulk_granted(enterprise_customer, pairs)
+        assert len(queries) == 2
+
+        assert consents == {
+            ('granted_on_run', course_run_id): True,
+            ('revoked_on_run', course_run_id): False,
+            ('granted_on_course', course_run_id): True,
+            ('granted_on_course', course_key): True,
+            ('granted_on_course', other_course_run_id): False,
+            ('revoked_on_course', course_run_id): False,
+            ('no_consent', course_run_id): False,
+            (None, course_run_id): False,
+        }
+        mock_get_course_ids = mock_catalog_api_client.return_value.get_course_ids
+        mock_get_course_ids.assert_called_once()
+        assert sorted(mock_get_course_ids.call_args[0][0]) == [course_run_id, other_course_run_id]
+        for username, course_id in pairs:
+            assert consents[(username, course_id)] == bool(DataSharingConsent.objects.proxied_get(
+                enterprise_customer=enterprise_customer,
+                username=username,
+                course_id=course_id,
+            ).granted)
+
+    @mock.patch('consent.models.get_course_catalog_api_service_client')
+    def test_bulk_granted_catalog_improperly_configured(self, mock_catalog_api_client):
+        """
+        Test that ``bulk_granted`` only uses the course run records when the course catalog client is unavailable.
+        """
+        enterprise_customer = factories.EnterpriseCustomerFactory()
+        mock_catalog_api_client.side_effect = ImproperlyConfigured
+        factories.DataSharingConsentFactory(
+            enterprise_customer=enterprise_customer,
+            username='bob',
+            course_id='edX+DemoX',
+            granted=True,
+        )
+
+        consents = DataSharingConsent.objects.bulk_granted(
+            enterprise_customer, [('bob', 'course-v1:edX+DemoX+Demo_Course'), ('bob', 'edX+DemoX')]
+        )
+
+        assert consents == {('bob', 'course-v1:edX+DemoX+Demo_Course'): False, ('bob', 'edX+DemoX'): True}
+
 
 @ddt.ddt
 class TestProxyDataSharingConsent(TransactionTestCase):
@@ -81,6 +81,7 @@ class TestEnterpriseUtils(unittest.TestCase):
                 "pendingenterprisecustomeruser",
                 "branding_configuration",
                 "enterprise_customer_identity_provider",
+                "course_enrollments_jobs",
                 "enterprise_customer_catalogs",
                 "enterprise_enrollment_template",
                 "reporting_configurations",
@@ -1556,6 +1557,114 @@ class TestEnterpriseUtils(unittest.TestCase):
         """
         assert utils.get_active_course_runs(course, users_all_enrolled_courses) == expected_course_run
 
+    @ddt.data(1, 4)
+    def test_traverse_pagination(self, workers):
+        """
+        ``traverse_pagination`` returns the results of every page in order, however many pages it fetches at once.
+        """
+        pages = {
+            page: {
+                'count': 7,
+                'next': 'http://example.com/?page={}&page_size=2'.format(page + 1) if page < 4 else None,
+                'results': [page * 10 + 1, page * 10 + 2][:7 - (page - 1) * 2],
+            }
+            for page in range(1, 5)
+        }
+        endpoint = mock.Mock()
+        endpoint.get.side_effect = lambda **querystring: pages[int(querystring['page'][0])]
+
+        assert utils.traverse_pagination(pages[1], endpoint, workers=workers) == [11, 12, 21, 22, 31, 32, 41]
+        assert sorted(call[1]['page'] for call in endpoint.get.call_args_list) == [['2'], ['3'], ['4']]
+        for call in endpoint.get.call_args_list:
+            assert call[1]['page_size'] == ['2']
+
+    @override_settings(ENTERPRISE_API_PAGINATION_WORKERS=4)
+    @mock.patch('enterprise.utils.fetch_pages')
+    def test_traverse_pagination_is_serial_by_default(self, mock_fetch_pages):
+        """
+        ``traverse_pagination`` fetches one page at a time unless the caller asks for several workers.
+        """
+        first_page = {'count': 4, 'next': 'http://example.com/?page=2', 'results': [1, 2]}
+        endpoint = mock.Mock()
+        endpoint.get.return_value = {'count': 4, 'next': None, 'results': [3, 4]}
+
+        assert utils.traverse_pagination(first_page, endpoint) == [1, 2, 3, 4]
+        endpoint.get.assert_called_once_with(page=['2'])
+        assert not mock_fetch_pages.called
+
+    @ddt.data(
+        {'next': 'http://example.com/?page=2', 'results': [1]},
+        {'next': 'http://example.com/?cursor=abc', 'count': 2, 'results': [1]},
+    )
+    def test_get_remaining_page_numbers_unknown(self, response):
+        """
+        ``get_remaining_page_numbers`` returns no pages unless the response is paginated by page number and reports
+        the total count of results.
+        """
+        assert utils.get_remaining_page_numbers(response) == []
+
+    def test_traverse_pagination_follows_pages_added_during_traversal(self):
+        """
+        ``traverse_pagination`` follows the ``next`` link of the last page it fetched concurrently.
+        """
+        first_page = {'count': 4, 'next': 'http://example.com/?page=2', 'results': [1, 2]}
+        pages = {
+            '2': {'count': 6, 'next': 'http://example.com/?page=3', 'results': [3, 4]},
+            '3': {'count': 6, 'next': None, 'results': [5, 6]},
+        }
+        endpoint = mock.Mock()
+        endpoint.get.side_effect = lambda **querystring: pages[querystring['page'][0]]
+
+        assert utils.traverse_pagination(first_page, endpoint, workers=4) == [1, 2, 3, 4, 5, 6]
+
+    @ddt.data(1, 4)
+    def test_concurrent_fetcher(self, workers):
+        """
+        ``ConcurrentFetcher`` returns the results of the calls it starts, inline or on worker threads alike.
+        """
+        def divide(dividend, divisor):
+            """
+            Divide two numbers.
+            """
+            return dividend // divisor
+
+        with utils.ConcurrentFetcher(workers=workers) as fetcher:
+            quotient = fetcher.start(divide, 10, divisor=5)
+            failure = fetcher.start(divide, 10, 0)
+            quotients = fetcher.map(divide, [10, 20, 30], [2, 2, 2])
+
+        # Results started within the context manager can still be collected once it has exited.
+        assert quotient.result() == 2
+        assert quotients == [5, 10, 15]
+        with raises(ZeroDivisionError):
+            failure.result()
+
+    @ddt.data(1, 4)
+    @mock.patch('enterprise.utils.connection')
+    def test_concurrent_fetcher_closes_worker_connections(self, workers, mock_connection):
+        """
+        ``ConcurrentFetcher`` closes the database connection of a worker thread after each call, but not the request's.
+        """
+        with utils.ConcurrentFetcher(workers=workers) as fetcher:
+            result = fetcher.start(mock.Mock(return_value='result'))
+            failure = fetcher.start(mock.Mock(side_effect=ValueError))
+
+        assert result.result() == 'result'
+        with raises(ValueError):
+            failure.result()
+        assert mock_connection.close.call_count == (2 if workers > 1 else 0)
+
+    @override_settings(ENTERPRISE_REQUEST_FETCH_WORKERS=1)
+    def test_concurrent_fetcher_inline(self):
+        """
+        ``ConcurrentFetcher`` makes its calls inline when ENTERPRISE_REQUEST_FETCH_WORKERS is 1.
+        """
+        func = mock.Mock(return_value='result')
+        with utils.ConcurrentFetcher() as fetcher:
+            result = fetcher.start(func, 'argument')
+            func.assert_called_once_with('argument')
+        assert result.result() == 'result'
+
 
 @mark.django_db
 @ddt.ddt